@@ -1 +1,10 @@
+import os
+import sys
+
+# agent.py imports its sibling modules directly (`from connection import ...`), as it
+# does when example_usage.py runs it from this directory
+CLIENT_DIR = os.path.dirname(os.path.abspath(__file__))
+if CLIENT_DIR not in sys.path:
+    sys.path.insert(0, CLIENT_DIR)
+
 from . import agent
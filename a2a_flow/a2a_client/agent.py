@@ -1,21 +1,82 @@
+import time
+
+from a2a.client.client import ClientConfig
+from a2a.client.client_factory import ClientFactory
+from a2a.types import AgentCard, TaskState, TaskStatusUpdateEvent, TransportProtocol
 from google.adk.agents import LlmAgent
 from google.adk.agents.remote_a2a_agent import RemoteA2aAgent, AGENT_CARD_WELL_KNOWN_PATH
 from google.adk.models.google_llm import Gemini
 from google.genai import types
 
-# Retry configuration for robust API calls
+from connection import fetch_card, keepalive_client, record
+
+# Retry configuration for robust API calls: doubling from 0.5 s, capped at 4 s
+# and jittered (exp_base=7 waited 1, 7, 49 and 60 s)
 retry_config = types.HttpRetryOptions(
-    attempts=5,
-    exp_base=7,
-    initial_delay=1,
+    attempts=4,
+    exp_base=2,
+    initial_delay=0.5,
+    max_delay=4,
+    jitter=0.5,
     http_status_codes=[429, 500, 503, 504],
 )
 
-# Connect to the Eric tutor server (a2a_tutor_serv)
-eric_tutor = RemoteA2aAgent(
+# Status updates the Eric server marks as chunks of its answer (tutor_agent/streaming.py)
+PARTIAL_METADATA_KEY = "adk_partial"
+
+
+class StreamingRemoteA2aAgent(RemoteA2aAgent):
+    """
+    RemoteA2aAgent that passes the server's streamed answer on as it arrives.
+
+    The server's "working" status updates (chunks of the answer, tool calls,
+    the complete answer) become partial events: shown to the user while the
+    task runs, but not stored in the session. The completed task's answer
+    is stored as before.
+
+    The agent card comes from connection.py's disk cache, and every call is
+    timed (connection.TIMING_STATS).
+    """
+
+    async def _resolve_agent_card_from_url(self, url: str) -> AgentCard:
+        card, _ = await fetch_card(url, await self._ensure_httpx_client())
+        return AgentCard.model_validate(card)
+
+    async def _run_async_impl(self, ctx):
+        start = time.perf_counter()
+        first_event = True
+        async for event in super()._run_async_impl(ctx):
+            if first_event:
+                record("call_first_event", time.perf_counter() - start)
+                first_event = False
+            yield event
+        record("call", time.perf_counter() - start)
+
+    async def _handle_a2a_response(self, a2a_response, ctx):
+        event = await super()._handle_a2a_response(a2a_response, ctx)
+        update = a2a_response[1] if isinstance(a2a_response, tuple) else None
+        if (event is not None and isinstance(update, TaskStatusUpdateEvent)
+                and update.status.state == TaskState.working):
+            event.partial = True
+            if (update.metadata or {}).get(PARTIAL_METADATA_KEY) and event.content:
+                # Answer text, not the remote agent's "thoughts"
+                for part in event.content.parts or []:
+                    part.thought = None
+        return event
+
+
+# Connect to the Eric tutor server (a2a_tutor_serv), over message/stream if the server streams,
+# with one keep-alive connection for the agent card and all turns
+eric_tutor = StreamingRemoteA2aAgent(
     name="eric_tutor",
     description="Remote Eric tutor agent that provides math tutoring services.",
     agent_card=f"http://localhost:8001{AGENT_CARD_WELL_KNOWN_PATH}",
+    a2a_client_factory=ClientFactory(config=ClientConfig(
+        httpx_client=keepalive_client(),
+        streaming=True,
+        polling=False,
+        supported_transports=[TransportProtocol.jsonrpc],
+    )),
 )
 
 # Client agent that interfaces with Eric
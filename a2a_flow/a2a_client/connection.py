@@ -0,0 +1,156 @@
+"""
+Agent-card cache and keep-alive connection of the A2A client.
+
+Without them every client start fetched Eric's agent card again, and httpx's
+default 5 s keep-alive closed the connection between two questions of a
+conversation, so most turns paid a new TCP (and TLS) handshake.
+
+    fetch_card()         the agent card, kept on disk in A2A_CARD_CACHE_DIR;
+                         used without a request for A2A_CARD_MAX_AGE seconds,
+                         then revalidated with If-None-Match / If-Modified-Since
+                         (304 Not Modified costs one round-trip and no body);
+                         if the server cannot be reached the cached card is used
+    keepalive_client()   the httpx client for the card and all A2A calls; idle
+                         connections are kept for A2A_KEEPALIVE_SECONDS, less
+                         than the server keeps them (a2a_server_launch.py)
+    record()             counts and totals TIMING_STATS per phase (card
+                         resolution by source, time to the first event and to
+                         the complete answer of a remote call) and logs it
+"""
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import Counter
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------
+# Configuration
+#------------------------------------------------------------------
+CARD_CACHE_DIR = os.getenv("A2A_CARD_CACHE_DIR", os.path.join(
+    os.getenv("ERIK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "erik")), "a2a_cards"))
+CARD_MAX_AGE_SECONDS = float(os.getenv("A2A_CARD_MAX_AGE", 300))
+KEEPALIVE_SECONDS = float(os.getenv("A2A_KEEPALIVE_SECONDS", 60))
+# A streamed answer can take minutes (ADK's RemoteA2aAgent default)
+TIMEOUT_SECONDS = float(os.getenv("A2A_CLIENT_TIMEOUT", 600))
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("A2A_CLIENT_CONNECT_TIMEOUT", 5))
+MAX_CONNECTIONS = int(os.getenv("A2A_CLIENT_MAX_CONNECTIONS", 10))
+
+# "<phase>_count" and "<phase>_seconds" for every recorded phase
+TIMING_STATS = Counter()
+
+
+def record(phase: str, seconds: float) -> None:
+    """Adds one timing of `phase` to TIMING_STATS and logs it."""
+    TIMING_STATS[f"{phase}_count"] += 1
+    TIMING_STATS[f"{phase}_seconds"] += seconds
+    logger.info("%s %.1f ms", phase, seconds * 1000)
+
+
+def mean_ms(phase: str) -> float:
+    """Mean duration of `phase` in milliseconds (0 if never recorded)."""
+    count = TIMING_STATS[f"{phase}_count"]
+    return TIMING_STATS[f"{phase}_seconds"] / count * 1000 if count else 0.0
+
+#------------------------------------------------------------------
+# Connection
+#------------------------------------------------------------------
+def keepalive_client() -> httpx.AsyncClient:
+    """
+    A new httpx client that keeps idle connections to the server open between turns.
+
+    Share it for the whole client (card and calls); like any httpx.AsyncClient it
+    is bound to the event loop it is first used on.
+    """
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+        limits=httpx.Limits(
+            max_connections=MAX_CONNECTIONS,
+            max_keepalive_connections=MAX_CONNECTIONS,
+            keepalive_expiry=KEEPALIVE_SECONDS,
+        ),
+    )
+
+#------------------------------------------------------------------
+# Agent-card cache
+#------------------------------------------------------------------
+def _cache_path(url: str) -> str:
+    return os.path.join(CARD_CACHE_DIR, hashlib.sha256(url.encode()).hexdigest()[:16] + ".json")
+
+
+def _load(url: str) -> Optional[dict]:
+    try:
+        with open(_cache_path(url), encoding="utf-8") as f:
+            entry = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return entry if entry.get("url") == url else None
+
+
+def _store(entry: dict) -> None:
+    path = _cache_path(entry["url"])
+    os.makedirs(CARD_CACHE_DIR, exist_ok=True)
+    # Written aside and renamed, so a concurrent client never reads half a card
+    temporary = f"{path}.{os.getpid()}.tmp"
+    with open(temporary, "w", encoding="utf-8") as f:
+        json.dump(entry, f)
+    os.replace(temporary, path)
+
+
+async def fetch_card(url: str, client: httpx.AsyncClient,
+                     max_age: Optional[float] = None) -> tuple[dict, str]:
+    """
+    Returns the agent card at `url`, from the disk cache when it is still valid.
+
+    Args:
+        url: The agent card URL (".../.well-known/agent-card.json").
+        client: The client to fetch or revalidate it with.
+        max_age: Seconds a cached card is used without revalidation
+            (default CARD_MAX_AGE_SECONDS; 0 always asks the server).
+
+    Returns:
+        The card as a dict and where it came from: "cache" (within
+        max_age), "revalidated" (304), "network" (new or
+        changed card) or "stale" (server unreachable, cached copy).
+
+    Raises:
+        httpx.HTTPError: If the card can neither be fetched nor taken from the cache.
+    """
+    start = time.perf_counter()
+    max_age = CARD_MAX_AGE_SECONDS if max_age is None else max_age
+    entry = _load(url)
+    if entry and time.time() - entry["validated_at"] < max_age:
+        source = "cache"
+    else:
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        try:
+            response = await client.get(url, headers=headers)
+            if response.status_code == 304 and entry:
+                source = "revalidated"
+            else:
+                response.raise_for_status()
+                entry = {
+                    "url": url,
+                    "card": response.json(),
+                    "etag": response.headers.get("etag"),
+                    "last_modified": response.headers.get("last-modified"),
+                }
+                source = "network"
+            entry["validated_at"] = time.time()
+            _store(entry)
+        except httpx.HTTPError as e:
+            if entry is None:
+                raise
+            logger.warning("Could not revalidate the agent card at %s (%s), using the cached copy", url, e)
+            source = "stale"
+    record(f"card_{source}", time.perf_counter() - start)
+    return entry["card"], source
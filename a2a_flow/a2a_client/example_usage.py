@@ -1,95 +1,127 @@
-"""
-Example usage of the a2a_client agent that connects to Eric tutor server.
-
-This script demonstrates how to:
-1. Import the client agent
-2. Create a runner
-3. Send questions to Eric via the client
-4. Display responses
-"""
-
-from agent import root_agent
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
-import uuid
-
-def main():
-    # Create a session service and runner
-    session_service = InMemorySessionService()
-    runner = Runner(
-        agent=root_agent,
-        session_service=session_service,
-    )
-    
-    # Create a session ID
-    session_id = str(uuid.uuid4())
-    
-    print("=" * 60)
-    print("Math Student Client - Connected to Eric Tutor")
-    print("=" * 60)
-    print("\nThis client connects to Eric, a math tutor with access to:")
-    print("  • Wolfram Alpha (complex math)")
-    print("  • MaRDI Knowledge Graph (definitions)")
-    print("  • Calculator (basic arithmetic)")
-    print("  • Web Search (current information)")
-    print("\n" + "=" * 60)
-    
-    # Example questions to test
-    example_questions = [
-        "What is 22 * 100?",
-        "Solve x^2 + 5x + 6 = 0",
-        "What is the definition of the Gamma function?",
-        "Integrate sin(x) from 0 to pi",
-    ]
-    
-    print("\n🎓 Example Questions:\n")
-    for i, question in enumerate(example_questions, 1):
-        print(f"{i}. {question}")
-    
-    print("\n" + "=" * 60)
-    print("\n💬 Interactive Mode - Type 'quit' to exit\n")
-    
-    while True:
-        try:
-            # Get user input
-            user_input = input("You: ").strip()
-            
-            if user_input.lower() in ['quit', 'exit', 'q']:
-                print("\n👋 Goodbye!")
-                break
-            
-            if not user_input:
-                continue
-            
-            # Send to the client agent
-            print("\n🤖 Client: Consulting Eric...\n")
-            
-            response = runner.run(
-                session_id=session_id,
-                user_message=user_input,
-            )
-            
-            # Display response
-            print(f"Eric: {response.content}\n")
-            print("-" * 60 + "\n")
-            
-        except KeyboardInterrupt:
-            print("\n\n👋 Goodbye!")
-            break
-        except Exception as e:
-            print(f"\n❌ Error: {e}\n")
-            print("Make sure the Eric tutor server is running on port 8001!")
-            print("Start it with: cd ../a2a_tutor_serv && python agent.py\n")
-
-if __name__ == "__main__":
-    print("\n🚀 Starting Math Student Client...")
-    print("📡 Connecting to Eric Tutor Server (http://localhost:8001)...\n")
-    
-    try:
-        main()
-    except Exception as e:
-        print(f"\n❌ Failed to start client: {e}")
-        print("\nTroubleshooting:")
-        print("1. Make sure Eric server is running: cd ../a2a_tutor_serv && python agent.py")
-        print("2. Check that port 8001 is available")
-        print("3. Verify your .env file has the correct API keys")
+"""
+Example usage of the a2a_client agent that connects to Eric tutor server.
+
+This script demonstrates how to:
+1. Import the client agent
+2. Create a runner
+3. Send questions to Eric via the client
+4. Display responses as they stream in
+"""
+
+from agent import root_agent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import Runner
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+import asyncio
+
+APP_NAME = "math_student_client"
+USER_ID = "student"
+
+
+def answer_text(event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+
+async def ask(runner, session_id, question):
+    """Sends one question and prints the answer as it arrives (Eric's server streams it)."""
+    message = types.Content(role="user", parts=[types.Part.from_text(text=question)])
+    streamed = False
+    async for event in runner.run_async(
+        user_id=USER_ID,
+        session_id=session_id,
+        new_message=message,
+        run_config=RunConfig(streaming_mode=StreamingMode.SSE),
+    ):
+        text = answer_text(event)
+        if event.partial:
+            # A chunk of the answer
+            if text:
+                print(text, end="", flush=True)
+                streamed = True
+            continue
+        if event.is_final_response() and text:
+            # The complete answer: already on screen if it was streamed
+            print("\n" if streamed else f"{text}\n")
+        streamed = False
+
+
+async def main():
+    # Create a session service and runner
+    session_service = InMemorySessionService()
+    runner = Runner(
+        app_name=APP_NAME,
+        agent=root_agent,
+        session_service=session_service,
+    )
+
+    # Create a session
+    session = await session_service.create_session(app_name=APP_NAME, user_id=USER_ID)
+
+    print("=" * 60)
+    print("Math Student Client - Connected to Eric Tutor")
+    print("=" * 60)
+    print("\nThis client connects to Eric, a math tutor with access to:")
+    print("  • Wolfram Alpha (complex math)")
+    print("  • MaRDI Knowledge Graph (definitions)")
+    print("  • Calculator (basic arithmetic)")
+    print("  • Web Search (current information)")
+    print("\n" + "=" * 60)
+
+    # Example questions to test
+    example_questions = [
+        "What is 22 * 100?",
+        "Solve x^2 + 5x + 6 = 0",
+        "What is the definition of the Gamma function?",
+        "Integrate sin(x) from 0 to pi",
+    ]
+
+    print("\n🎓 Example Questions:\n")
+    for i, question in enumerate(example_questions, 1):
+        print(f"{i}. {question}")
+
+    print("\n" + "=" * 60)
+    print("\n💬 Interactive Mode - Type 'quit' to exit\n")
+
+    while True:
+        try:
+            # Get user input
+            user_input = (await asyncio.to_thread(input, "You: ")).strip()
+
+            if user_input.lower() in ['quit', 'exit', 'q']:
+                print("\n👋 Goodbye!")
+                break
+
+            if not user_input:
+                continue
+
+            # Send to the client agent
+            print("\n🤖 Client: Consulting Eric...\n")
+            print("Eric: ", end="", flush=True)
+            await ask(runner, session.id, user_input)
+            print("-" * 60 + "\n")
+
+        except (KeyboardInterrupt, EOFError):
+            print("\n\n👋 Goodbye!")
+            break
+        except Exception as e:
+            print(f"\n❌ Error: {e}\n")
+            print("Make sure the Eric tutor server is running on port 8001!")
+            print("Start it with: cd .. && python a2a_server_launch.py\n")
+
+if __name__ == "__main__":
+    print("\n🚀 Starting Math Student Client...")
+    print("📡 Connecting to Eric Tutor Server (http://localhost:8001)...\n")
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        print("\n\n👋 Goodbye!")
+    except Exception as e:
+        print(f"\n❌ Failed to start client: {e}")
+        print("\nTroubleshooting:")
+        print("1. Make sure Eric server is running: cd .. && python a2a_server_launch.py")
+        print("2. Check that port 8001 is available")
+        print("3. Verify your .env file has the correct API keys")
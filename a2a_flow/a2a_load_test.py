@@ -0,0 +1,317 @@
+"""
+Load generator for the Eric tutor A2A server.
+
+Simulated students send questions to the server's JSON-RPC endpoint
+(`message/send`) as an open-loop Poisson process: arrivals do not wait for
+earlier answers, so a server that falls behind shows up as growing latency
+and in-flight requests instead of a lower send rate.
+
+- Arrival rate: questions per second, stepped through --rates to find the
+  point where the server saturates.
+- Session reuse: with probability --session-reuse a question continues the
+  conversation of an idle student (same A2A contextId, i.e. the same ADK
+  session); otherwise a new student starts one.
+- Question mix: a weighted list of questions (default: the README examples),
+  or a JSON file of {"category", "question", "weight"} objects.
+
+Each step reports sent/ok/failed requests, error rate by kind (HTTP status,
+JSON-RPC error, failed task, timeout, connection), achieved throughput,
+p50/p95/p99 latency, peak in-flight questions (= concurrently active
+sessions), the number of sessions used, and a latency histogram. A step is
+saturated when throughput falls below 90% of the offered rate, the error
+rate exceeds --max-error-rate or p95 exceeds --slo; the ramp stops at the
+first saturated step.
+
+Usage (server running, e.g. python a2a_server_launch.py):
+    python a2a_load_test.py [--url http://localhost:8001] [--rates 0.5,1,2,4,8] [--duration 60]
+        [--session-reuse 0.5] [--questions mix.json] [--json results.json]
+"""
+import argparse
+import asyncio
+import json
+import math
+import random
+import statistics
+import time
+import uuid
+from collections import Counter
+from typing import Optional
+
+import httpx
+
+#------------------------------------------------------------------
+# Configuration
+#------------------------------------------------------------------
+DEFAULT_URL = "http://localhost:8001"
+AGENT_CARD_PATH = "/.well-known/agent-card.json"
+
+DEFAULT_MIX = [
+    {"category": "arithmetic", "question": "What is 22 * 100?", "weight": 3},
+    {"category": "solve", "question": "Solve x^2 + 5x + 6 = 0", "weight": 2},
+    {"category": "definition", "question": "What is the definition of the Gamma function?", "weight": 2},
+    {"category": "calculus", "question": "Integrate sin(x) from 0 to pi", "weight": 2},
+    {"category": "current", "question": "What time is it in Tokyo?", "weight": 1},
+]
+
+# Latency histogram bucket upper bounds (seconds)
+HISTOGRAM_BUCKETS = [0.1, 0.25, 0.5, 1, 2, 4, 8, 15, 30, 60, 120, math.inf]
+
+#------------------------------------------------------------------
+# Simulated students
+#------------------------------------------------------------------
+class Students:
+    """
+    The A2A contexts (one per simulated student) questions are sent in.
+
+    Args:
+        session_reuse: Probability that a question continues the
+            conversation of an idle student instead of starting a new one.
+        rng: Random source, for reproducible runs.
+    """
+
+    def __init__(self, session_reuse: float, rng: random.Random):
+        self.session_reuse = session_reuse
+        self.rng = rng
+        self.idle: list[str] = []
+        self.busy: set[str] = set()
+        self.started = 0
+        self.peak_busy = 0
+
+    def checkout(self) -> str:
+        if self.idle and self.rng.random() < self.session_reuse:
+            context_id = self.idle.pop(self.rng.randrange(len(self.idle)))
+        else:
+            context_id = str(uuid.uuid4())
+            self.started += 1
+        self.busy.add(context_id)
+        self.peak_busy = max(self.peak_busy, len(self.busy))
+        return context_id
+
+    def checkin(self, context_id: str) -> None:
+        self.busy.discard(context_id)
+        self.idle.append(context_id)
+
+#------------------------------------------------------------------
+# One request
+#------------------------------------------------------------------
+def send_message_request(question: str, context_id: str) -> dict:
+    return {
+        "jsonrpc": "2.0",
+        "id": str(uuid.uuid4()),
+        "method": "message/send",
+        "params": {
+            "message": {
+                "kind": "message",
+                "messageId": str(uuid.uuid4()),
+                "role": "user",
+                "contextId": context_id,
+                "parts": [{"kind": "text", "text": question}],
+            },
+        },
+    }
+
+
+def classify(response: httpx.Response) -> Optional[str]:
+    """The kind of error in an A2A response, or None if the task completed."""
+    if response.status_code != 200:
+        return f"http {response.status_code}"
+    body = response.json()
+    if "error" in body:
+        return f"jsonrpc {body['error'].get('code')}"
+    result = body.get("result") or {}
+    # A task (with a final state), or a direct message reply
+    state = (result.get("status") or {}).get("state") if result.get("kind") == "task" else "completed"
+    return None if state == "completed" else f"task {state}"
+
+
+async def ask(client: httpx.AsyncClient, rpc_url: str, question: str, context_id: str,
+              timeout: float) -> tuple[float, Optional[str]]:
+    """Sends one question; returns (seconds, error kind or None)."""
+    start = time.perf_counter()
+    try:
+        response = await client.post(rpc_url, json=send_message_request(question, context_id), timeout=timeout)
+        error = classify(response)
+    except httpx.TimeoutException:
+        error = "timeout"
+    except httpx.TransportError as e:
+        error = f"connection {type(e).__name__}"
+    except ValueError:
+        error = "invalid response"
+    return time.perf_counter() - start, error
+
+#------------------------------------------------------------------
+# One load step
+#------------------------------------------------------------------
+def percentile(values: list[float], q: float) -> float:
+    """Nearest-rank percentile (q in 0..100)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def histogram(latencies: list[float]) -> list[tuple[float, int]]:
+    counts = Counter(next(bound for bound in HISTOGRAM_BUCKETS if t <= bound) for t in latencies)
+    return [(bound, counts.get(bound, 0)) for bound in HISTOGRAM_BUCKETS]
+
+
+async def run_step(client: httpx.AsyncClient, rpc_url: str, rate: float, args, mix: list[dict],
+                   rng: random.Random) -> dict:
+    """Sends Poisson arrivals at `rate` for args.duration seconds and waits for all answers."""
+    students = Students(args.session_reuse, rng)
+    weights = [entry.get("weight", 1) for entry in mix]
+    latencies: list[float] = []
+    errors = Counter()
+    in_flight = peak_in_flight = 0
+    tasks = []
+
+    async def one(entry):
+        nonlocal in_flight
+        context_id = students.checkout()
+        in_flight += 1
+        try:
+            seconds, error = await ask(client, rpc_url, entry["question"], context_id, args.timeout)
+        finally:
+            in_flight -= 1
+            students.checkin(context_id)
+        if error:
+            errors[error] += 1
+        else:
+            latencies.append(seconds)
+
+    start = time.perf_counter()
+    next_arrival = start
+    while next_arrival < start + args.duration:
+        await asyncio.sleep(max(0.0, next_arrival - time.perf_counter()))
+        tasks.append(asyncio.create_task(one(rng.choices(mix, weights=weights)[0])))
+        peak_in_flight = max(peak_in_flight, in_flight + 1)
+        next_arrival += rng.expovariate(rate)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    sent = len(tasks)
+    failed = sum(errors.values())
+    step = {
+        "rate": rate,
+        "sent": sent,
+        "ok": len(latencies),
+        "failed": failed,
+        "error_rate": failed / sent if sent else 0.0,
+        "errors": dict(errors),
+        # The last answers arrive about one latency after the last arrival; that tail is not lost throughput
+        "throughput": len(latencies) / max(elapsed - statistics.median(latencies), args.duration) if latencies else 0.0,
+        "peak_in_flight": peak_in_flight,
+        "peak_sessions": students.peak_busy,
+        "sessions_started": students.started,
+        "histogram": histogram(latencies),
+    }
+    if latencies:
+        step.update({"p50": percentile(latencies, 50), "p95": percentile(latencies, 95),
+                     "p99": percentile(latencies, 99), "mean": statistics.mean(latencies)})
+    step["saturated"] = (step["throughput"] < 0.9 * rate or step["error_rate"] > args.max_error_rate
+                         or step.get("p95", math.inf) > args.slo)
+    return step
+
+#------------------------------------------------------------------
+# Report
+#------------------------------------------------------------------
+def format_histogram(buckets: list[tuple[float, int]], width: int = 40) -> str:
+    top = max((count for _, count in buckets), default=0) or 1
+    used = [i for i, (_, count) in enumerate(buckets) if count]
+    if not used:
+        return "    (no answers)"
+    lines = []
+    previous = buckets[used[0] - 1][0] if used[0] else 0.0
+    for bound, count in buckets[used[0]:used[-1] + 1]:
+        label = f"{previous:g}-{bound:g} s" if bound != math.inf else f">{previous:g} s"
+        lines.append(f"    {label:<12}{count:>6}  {'#' * round(count / top * width)}")
+        previous = bound
+    return "\n".join(lines)
+
+
+def format_step(step: dict) -> str:
+    latency = (f"{step['p50']:>8.2f}{step['p95']:>8.2f}{step['p99']:>8.2f}" if "p50" in step
+               else f"{'-':>8}" * 3)
+    return (f"{step['rate']:>7g}{step['sent']:>7}{step['ok']:>7}{step['error_rate']:>8.1%}"
+            f"{step['throughput']:>9.2f}{latency}{step['peak_in_flight']:>10}{step['sessions_started']:>10}"
+            f"{'  SATURATED' if step['saturated'] else ''}")
+
+
+HEADER = (f"{'rate/s':>7}{'sent':>7}{'ok':>7}{'errors':>8}{'done/s':>9}{'p50 s':>8}{'p95 s':>8}{'p99 s':>8}"
+          f"{'in-flight':>10}{'sessions':>10}")
+# in-flight: peak concurrent questions, i.e. concurrent active sessions; sessions: distinct sessions used
+
+
+def load_mix(path: Optional[str]) -> list[dict]:
+    if path is None:
+        return DEFAULT_MIX
+    with open(path) as f:
+        mix = json.load(f)
+    if not mix or any("question" not in entry for entry in mix):
+        raise ValueError(f"{path} must be a non-empty JSON list of objects with a 'question'")
+    return mix
+
+
+async def run(args) -> list[dict]:
+    mix = load_mix(args.questions)
+    rng = random.Random(args.seed)
+    limits = httpx.Limits(max_connections=None, max_keepalive_connections=args.max_connections)
+    async with httpx.AsyncClient(limits=limits) as client:
+        card = (await client.get(args.url.rstrip("/") + AGENT_CARD_PATH, timeout=10)).raise_for_status().json()
+        rpc_url = args.rpc_url or card.get("url") or args.url
+        print(f"{card.get('name')} at {rpc_url}: {len(mix)} questions in the mix, "
+              f"session reuse {args.session_reuse:.0%}, {args.duration:g} s per step\n")
+        print(HEADER)
+        steps = []
+        for rate in args.rates:
+            step = await run_step(client, rpc_url, rate, args, mix, rng)
+            steps.append(step)
+            print(format_step(step), flush=True)
+            if step["saturated"] and not args.full_ramp:
+                break
+
+    for step in steps:
+        print(f"\nlatency histogram at {step['rate']:g}/s\n{format_histogram(step['histogram'])}")
+        if step["errors"]:
+            print("    errors: " + ", ".join(f"{kind} x{n}" for kind, n in sorted(step["errors"].items())))
+
+    sustained = [step for step in steps if not step["saturated"]]
+    if sustained:
+        best = sustained[-1]
+        print(f"\nsustained {best['rate']:g} questions/s with up to {best['peak_sessions']} concurrent sessions "
+              f"(p95 {best.get('p95', 0):.2f} s)")
+    if steps and steps[-1]["saturated"]:
+        print(f"saturated at {steps[-1]['rate']:g} questions/s")
+    return steps
+
+
+def parse_rates(text: str) -> list[float]:
+    return [float(rate) for rate in text.split(",") if rate.strip()]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default=DEFAULT_URL, help="server base URL (agent card location)")
+    parser.add_argument("--rpc-url", help="JSON-RPC endpoint (default: the url in the agent card)")
+    parser.add_argument("--rates", type=parse_rates, default=[0.5, 1, 2, 4, 8],
+                        help="comma-separated arrival rates to step through (questions/s)")
+    parser.add_argument("--duration", type=float, default=60, help="seconds of arrivals per step")
+    parser.add_argument("--session-reuse", type=float, default=0.5,
+                        help="probability that a question continues an idle student's session")
+    parser.add_argument("--questions", help="JSON file with the question mix")
+    parser.add_argument("--timeout", type=float, default=120, help="seconds before a request counts as timed out")
+    parser.add_argument("--slo", type=float, default=30, help="p95 latency (s) above which a step is saturated")
+    parser.add_argument("--max-error-rate", type=float, default=0.01,
+                        help="error rate above which a step is saturated")
+    parser.add_argument("--max-connections", type=int, default=100, help="pooled keep-alive connections")
+    parser.add_argument("--full-ramp", action="store_true", help="keep stepping after the server saturates")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", help="also write the per-step results to this file")
+    args = parser.parse_args(argv)
+
+    steps = asyncio.run(run(args))
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(steps, f, indent=2, default=str)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,142 +1,309 @@
-import subprocess
-import os
-import requests
-import json
-import time
-import signal
-from dotenv import load_dotenv
-
-#------------------------------------------------------------------
-# Load .env variables from the specified server directory
-# NOTE: The path for load_dotenv needs to point to the file itself, 
-#       not just the directory.
-#------------------------------------------------------------------
-load_dotenv(dotenv_path="./.env")
-
-#------------------------------------------------------------------
-# --- Configuration ---
-A2A_SERVER_PATH = f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov/a2a_flow/a2a_tutor_serv"
-SERVER_HOST = "localhost"
-SERVER_PORT = "8001"
-AGENT_CARD_URL = f"http://{SERVER_HOST}:{SERVER_PORT}/.well-known/agent-card.json"
-MAX_ATTEMPTS = 30
-POLL_INTERVAL_SECONDS = 2
-# --- End Configuration ---
-
-#------------------------------------------------------------------
-# 1. Start A2A server
-#------------------------------------------------------------------
-
-print(f"🚀 Starting Eric Tutor A2A server in directory: {A2A_SERVER_PATH}")
-
-server_process = subprocess.Popen(
-    [
-        "uvicorn",
-        "agent:app",  # Module:app format (agent.py has the app)
-        "--host",
-        SERVER_HOST,
-        "--port",
-        SERVER_PORT,
-        "--log-level", # Add log-level info to see Uvicorn startup messages in stdout
-        "info",
-    ],
-    cwd=A2A_SERVER_PATH,  # Run from /server where the file is
-    # Using PIPE for STDOUT/STDERR lets us capture and print them on failure
-    stdout=subprocess.PIPE,
-    stderr=subprocess.PIPE,
-    env={**os.environ},  # Pass environment variables
-    preexec_fn=os.setsid # Required for clean process group termination
-)
-globals()["eric_tutor_server_process"] = server_process
-
-
-#------------------------------------------------------------------
-# 2. Wait for server to start (poll until it responds)
-#------------------------------------------------------------------
-print("Polling for server readiness", end="", flush=True)
-
-for attempt in range(MAX_ATTEMPTS):
-    # Check if the process died *before* attempting the request
-    if server_process.poll() is not None:
-        print("\n\n❌ Subprocess died unexpectedly!")
-        break
-        
-    try:
-        response = requests.get(AGENT_CARD_URL, timeout=1)
-        if response.status_code == 200:
-            print(f"\n✅ Eric Tutor A2A server is running!")
-            print(f"   Server URL: http://{SERVER_HOST}:{SERVER_PORT}")
-            print(f"   Agent card: {AGENT_CARD_URL}")
-            break
-    except requests.exceptions.RequestException:
-        time.sleep(POLL_INTERVAL_SECONDS)
-        print(".", end="", flush=True)
-else:
-    # This block executes if the loop completed without 'break' (i.e., it timed out)
-    print("\n\n⚠️  Server failed to become ready after maximum attempts.")
-
-
-#------------------------------------------------------------------
-# 3. Debugging and Cleanup
-#------------------------------------------------------------------
-
-# Read and print output for debugging, regardless of success/failure
-try:
-    # Use readlines() with a timeout if available, or just read the buffer now.
-    # We use communicate() to get whatever is left in the buffer up to this point.
-    stdout_output, stderr_output = server_process.communicate(timeout=1)
-except subprocess.TimeoutExpired:
-    # If the server is successfully running, communicate() will timeout
-    # We still want to kill the process and print its initial logs
-    stdout_output, stderr_output = server_process.stdout.read(), server_process.stderr.read()
-
-
-print("\n--- Uvicorn STDOUT (Initial Logs) ---")
-print(stdout_output.decode().strip() or "No initial stdout captured.")
-
-print("\n--- Uvicorn STDERR (CRITICAL) ---")
-# The error message from Uvicorn/Python will be here if it failed to start
-error_message = stderr_output.decode().strip()
-if error_message:
-    print(error_message)
-else:
-    print("No errors reported on stderr.")
-
-
-# Fetch the agent card if it successfully launched
-if server_process.poll() is None and 'response' in locals() and response.status_code == 200:
-    # The server is running and responded
-    try:
-        agent_card = response.json()
-        print("\n📋 Eric Tutor Agent Card:")
-        print(json.dumps(agent_card, indent=2))
-
-        print("\n✨ Key Information:")
-        print(f"   Name: {agent_card.get('name')}")
-        print(f"   Description: {agent_card.get('description')}")
-        print(f"   URL: {agent_card.get('url')}")
-        print(f"   Skills: {len(agent_card.get('skills', []))} capabilities exposed")
-
-    except Exception as e:
-        print(f"\n❌ Error processing agent card: {e}")
-
-# Keep server running until interrupted
-if server_process.poll() is None:
-    print(f"\n✅ Server running (PID: {server_process.pid})")
-    print("\n💡 Press Ctrl+C to stop the server...\n")
-    try:
-        # Wait for the server process to complete (keeps it running)
-        server_process.wait()
-    except KeyboardInterrupt:
-        print("\n\n🛑 Shutting down Eric Tutor server...")
-        try:
-            # Send SIGTERM to the process group to kill Uvicorn and its workers
-            os.killpg(os.getpgid(server_process.pid), signal.SIGTERM)
-            server_process.wait(timeout=5)
-            print("✅ Server stopped gracefully.")
-        except Exception as e:
-            print(f"⚠️  Error during shutdown: {e}. Forcing termination.")
-            server_process.kill()
-            print("❌ Server forcibly stopped.")
-else:
-    print("\n❌ Server failed to start. Check the error messages above.")
\ No newline at end of file
+"""
+Supervisor for the Eric tutor A2A server.
+
+Runs A2A_WORKERS uvicorn workers (a2a_tutor_serv/agent.py) that share one
+listening socket on SERVER_PORT: the supervisor binds the port once and each
+worker accepts connections on it (`uvicorn --fd`), so the kernel spreads the
+A2A requests over the workers.
+
+- Logs: each worker's stdout/stderr is read line by line as it is written
+  (a full pipe can never block a worker) into A2A_LOG_DIR/worker-<n>.log,
+  rotated at A2A_LOG_MAX_BYTES with A2A_LOG_BACKUPS old files, and echoed
+  to the console with a [w<n>] prefix.
+- Readiness: a worker is up as soon as uvicorn logs "Application startup
+  complete"; the agent card is then polled with exponential backoff
+  (50 ms doubling to 2 s) for at most READY_TIMEOUT_SECONDS.
+- Restarts: a worker that exits on its own is restarted after a backoff
+  (1 s doubling to 30 s, reset once it has run for a minute); its last log
+  lines are printed.
+- Shutdown (Ctrl+C / SIGTERM): every worker stops accepting connections and
+  finishes the A2A requests it is serving, for at most A2A_DRAIN_SECONDS,
+  before it is killed.
+- Keep-alive: idle client connections stay open for
+  A2A_SERVER_KEEPALIVE_SECONDS (uvicorn's default is 5 s), so a client's
+  next question reuses its connection (a2a_client/connection.py).
+
+Several workers share the session database (tutor_agent/sessions.py), and a
+session's requests may reach any of them, so workers read sessions from the
+database instead of a per-process hot tier and write every event at once
+(ERIK_SESSION_CACHE_SIZE=0, ERIK_SESSION_BATCH_SIZE=1, unless set).
+
+    python a2a_server_launch.py [--workers 4]
+"""
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import logging.handlers
+import os
+import signal
+import socket
+import sys
+import time
+from typing import Optional
+
+import httpx
+from dotenv import load_dotenv
+
+#------------------------------------------------------------------
+# Load .env variables from the specified server directory
+# NOTE: The path for load_dotenv needs to point to the file itself,
+#       not just the directory.
+#------------------------------------------------------------------
+load_dotenv(dotenv_path="./.env")
+
+#------------------------------------------------------------------
+# --- Configuration ---
+A2A_SERVER_PATH = os.getenv(
+    "A2A_SERVER_PATH", os.path.join(os.path.dirname(os.path.abspath(__file__)), "a2a_tutor_serv")
+)
+SERVER_HOST = os.getenv("A2A_HOST", "localhost")
+SERVER_PORT = int(os.getenv("A2A_PORT", 8001))
+AGENT_CARD_URL = f"http://{SERVER_HOST}:{SERVER_PORT}/.well-known/agent-card.json"
+WORKERS = int(os.getenv("A2A_WORKERS", 1))
+
+LOG_DIR = os.getenv("A2A_LOG_DIR", os.path.join(
+    os.getenv("ERIK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "erik")), "a2a_logs"))
+LOG_MAX_BYTES = int(os.getenv("A2A_LOG_MAX_BYTES", 10 * 1024 * 1024))
+LOG_BACKUPS = int(os.getenv("A2A_LOG_BACKUPS", 5))
+# Log lines kept in memory per worker, printed when it crashes
+CRASH_LOG_LINES = 40
+
+READY_TIMEOUT_SECONDS = float(os.getenv("A2A_READY_TIMEOUT", 60))
+READY_POLL_INITIAL = 0.05
+READY_POLL_MAX = 2.0
+READY_LOG_LINE = "Application startup complete"
+
+RESTART_BACKOFF_INITIAL = 1.0
+RESTART_BACKOFF_MAX = 30.0
+# A worker that ran this long before exiting is restarted without delay growth
+RESTART_STABLE_SECONDS = 60.0
+
+DRAIN_SECONDS = float(os.getenv("A2A_DRAIN_SECONDS", 30))
+# Longer than the client's keep-alive (A2A_KEEPALIVE_SECONDS there, 60 s), so the client closes first
+KEEPALIVE_SECONDS = float(os.getenv("A2A_SERVER_KEEPALIVE_SECONDS", 75))
+# --- End Configuration ---
+
+#------------------------------------------------------------------
+# Workers
+#------------------------------------------------------------------
+class Worker:
+    """
+    One uvicorn process serving agent:app on the shared socket, restarted if it dies.
+
+    Args:
+        index: Worker number, used in log file names and console prefixes.
+        sock: The listening socket shared by all workers.
+        env: Environment of the worker process.
+        echo: Whether to copy the worker's log lines to the console.
+    """
+
+    def __init__(self, index: int, sock: socket.socket, env: dict, echo: bool = True):
+        self.index = index
+        self.sock = sock
+        self.env = env
+        self.echo = echo
+        self.process: Optional[asyncio.subprocess.Process] = None
+        self.ready = asyncio.Event()
+        self.restarts = 0
+        self.recent = collections.deque(maxlen=CRASH_LOG_LINES)
+        self.stopping = False
+        self.log = logging.getLogger(f"a2a.worker{index}")
+        self.log.propagate = False
+        self.log.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(
+            os.path.join(LOG_DIR, f"worker-{index}.log"), maxBytes=LOG_MAX_BYTES, backupCount=LOG_BACKUPS
+        )
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        self.log.addHandler(handler)
+
+    def command(self) -> list[str]:
+        return [
+            sys.executable, "-m", "uvicorn",
+            "agent:app",  # Module:app format (agent.py has the app)
+            "--fd", str(self.sock.fileno()),
+            "--log-level", "info",  # "Application startup complete" marks the worker as ready
+            "--timeout-graceful-shutdown", str(int(DRAIN_SECONDS)),
+            "--timeout-keep-alive", str(int(KEEPALIVE_SECONDS)),
+        ]
+
+    async def start(self) -> None:
+        self.ready.clear()
+        self.process = await asyncio.create_subprocess_exec(
+            *self.command(),
+            cwd=A2A_SERVER_PATH,  # Run from the server directory where agent.py is
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.STDOUT,
+            env=self.env,
+            pass_fds=(self.sock.fileno(),),
+            start_new_session=True,  # Own process group, for clean termination
+        )
+        self._emit(f"--- worker {self.index} started (PID {self.process.pid}) ---")
+
+    def _emit(self, line: str) -> None:
+        self.recent.append(line)
+        self.log.info(line)
+        if self.echo:
+            print(f"[w{self.index}] {line}", flush=True)
+
+    async def stream_logs(self) -> None:
+        """Reads the worker's output until it exits, so its pipe never fills up."""
+        while True:
+            line = await self.process.stdout.readline()
+            if not line:
+                return
+            text = line.decode(errors="replace").rstrip()
+            self._emit(text)
+            if READY_LOG_LINE in text:
+                self.ready.set()
+
+    async def supervise(self) -> None:
+        """Runs the worker, restarting it with backoff whenever it exits unexpectedly."""
+        backoff = RESTART_BACKOFF_INITIAL
+        while not self.stopping:
+            started = time.monotonic()
+            await self.start()
+            await self.stream_logs()
+            code = await self.process.wait()
+            if self.stopping:
+                self._emit(f"--- worker {self.index} stopped (exit code {code}) ---")
+                return
+            if time.monotonic() - started >= RESTART_STABLE_SECONDS:
+                backoff = RESTART_BACKOFF_INITIAL
+            print(f"\n❌ Worker {self.index} exited with code {code}; last log lines:", flush=True)
+            for line in list(self.recent)[-10:]:
+                print(f"   {line}")
+            print(f"🔁 Restarting worker {self.index} in {backoff:.0f} s\n", flush=True)
+            self.restarts += 1
+            await asyncio.sleep(backoff)
+            backoff = min(backoff * 2, RESTART_BACKOFF_MAX)
+
+    def send_signal(self, sig: int) -> None:
+        if self.process is not None and self.process.returncode is None:
+            try:
+                os.killpg(self.process.pid, sig)
+            except ProcessLookupError:
+                pass
+
+    async def stop(self) -> None:
+        """Lets the worker finish its in-flight requests (up to DRAIN_SECONDS), then kills it."""
+        self.stopping = True
+        if self.process is None or self.process.returncode is not None:
+            return
+        # uvicorn stops accepting connections and waits for open requests
+        self.send_signal(signal.SIGTERM)
+        try:
+            await asyncio.wait_for(self.process.wait(), DRAIN_SECONDS + 5)
+        except asyncio.TimeoutError:
+            print(f"⚠️  Worker {self.index} did not stop in time. Forcing termination.")
+            self.send_signal(signal.SIGKILL)
+            await self.process.wait()
+
+#------------------------------------------------------------------
+# Readiness
+#------------------------------------------------------------------
+async def wait_until_ready(workers: list[Worker]) -> Optional[dict]:
+    """
+    Waits for the first worker to start, then polls the agent card with backoff.
+
+    Returns:
+        The agent card, or None if the server was not ready in READY_TIMEOUT_SECONDS.
+    """
+    deadline = time.monotonic() + READY_TIMEOUT_SECONDS
+    started = [asyncio.create_task(worker.ready.wait()) for worker in workers]
+    try:
+        done, _ = await asyncio.wait(started, timeout=READY_TIMEOUT_SECONDS, return_when=asyncio.FIRST_COMPLETED)
+    finally:
+        for task in started:
+            task.cancel()
+    if not done:
+        return None
+
+    delay = READY_POLL_INITIAL
+    async with httpx.AsyncClient() as client:
+        while time.monotonic() < deadline:
+            try:
+                response = await client.get(AGENT_CARD_URL, timeout=1)
+                if response.status_code == 200:
+                    return response.json()
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+            delay = min(delay * 2, READY_POLL_MAX)
+    return None
+
+
+def print_agent_card(agent_card: dict) -> None:
+    print("\n📋 Eric Tutor Agent Card:")
+    print(json.dumps(agent_card, indent=2))
+
+    print("\n✨ Key Information:")
+    print(f"   Name: {agent_card.get('name')}")
+    print(f"   Description: {agent_card.get('description')}")
+    print(f"   URL: {agent_card.get('url')}")
+    print(f"   Skills: {len(agent_card.get('skills', []))} capabilities exposed")
+
+#------------------------------------------------------------------
+# Supervisor
+#------------------------------------------------------------------
+def worker_env(workers: int) -> dict:
+    env = {**os.environ}  # Pass environment variables
+    if workers > 1:
+        # Any worker may serve any session: no per-worker session cache or write queue
+        env.setdefault("ERIK_SESSION_CACHE_SIZE", "0")
+        env.setdefault("ERIK_SESSION_BATCH_SIZE", "1")
+    return env
+
+
+async def supervise(n_workers: int, echo: bool) -> int:
+    os.makedirs(LOG_DIR, exist_ok=True)
+    sock = socket.create_server((SERVER_HOST, SERVER_PORT), backlog=2048)
+    sock.set_inheritable(True)
+
+    print(f"🚀 Starting {n_workers} Eric Tutor A2A worker(s) in directory: {A2A_SERVER_PATH}")
+    print(f"   Logs: {LOG_DIR}/worker-<n>.log")
+    env = worker_env(n_workers)
+    workers = [Worker(i, sock, env, echo=echo) for i in range(n_workers)]
+    supervisors = [asyncio.create_task(worker.supervise()) for worker in workers]
+
+    shutdown = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, shutdown.set)
+
+    agent_card = await wait_until_ready(workers)
+    if agent_card is None:
+        print(f"\n⚠️  Server failed to become ready in {READY_TIMEOUT_SECONDS:.0f} s. "
+              f"Check the logs in {LOG_DIR}.")
+        shutdown.set()
+    else:
+        print(f"\n✅ Eric Tutor A2A server is running!")
+        print(f"   Server URL: http://{SERVER_HOST}:{SERVER_PORT}")
+        print(f"   Agent card: {AGENT_CARD_URL}")
+        print_agent_card(agent_card)
+        print(f"\n✅ {n_workers} worker(s) running (PIDs: {', '.join(str(w.process.pid) for w in workers)})")
+        print("\n💡 Press Ctrl+C to stop the server...\n")
+
+    await shutdown.wait()
+    print(f"\n\n🛑 Shutting down Eric Tutor server (draining in-flight requests, up to {DRAIN_SECONDS:.0f} s)...")
+    await asyncio.gather(*(worker.stop() for worker in workers))
+    for task in supervisors:
+        task.cancel()
+    await asyncio.gather(*supervisors, return_exceptions=True)
+    sock.close()
+    restarts = sum(worker.restarts for worker in workers)
+    print(f"✅ Server stopped gracefully{f' ({restarts} worker restarts)' if restarts else ''}.")
+    return 0 if agent_card is not None else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=WORKERS, help="uvicorn worker processes (A2A_WORKERS)")
+    parser.add_argument("--quiet", action="store_true", help="only write worker logs to files, not the console")
+    args = parser.parse_args(argv)
+    sys.exit(asyncio.run(supervise(args.workers, echo=not args.quiet)))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,23 +2,20 @@ import uuid
 from google.genai import types
 
 from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
 from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
+from google.adk.artifacts import InMemoryArtifactService
+from google.adk.auth.credential_service.in_memory_credential_service import InMemoryCredentialService
+from google.adk.memory import InMemoryMemoryService
 
 # from google.adk.tools import google_search
-from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
 from google.adk.tools.tool_context import ToolContext
-from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
-from mcp import StdioServerParameters
 
 from google.adk.apps.app import App, ResumabilityConfig
 from google.adk.tools.function_tool import FunctionTool
 
-from google.adk.a2a.utils.agent_to_a2a import to_a2a
-
 from dotenv import load_dotenv
 import os
+import sys
 
 load_dotenv(dotenv_path="./.env")
 
@@ -52,88 +49,32 @@ It uses a root agent to coordinate the subagents.
 
 
 #------------------------------------------------------------------
-# Retry function
-#------------------------------------------------------------------
-retry_config = types.HttpRetryOptions(
-    attempts=5,  # Maximum retry attempts
-    exp_base=7,  # Delay multiplier
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],  # Retry on these HTTP errors
-)
-
-
-#------------------------------------------------------------------
-# MCP Toolset (These paths are hard coded, so they doesn't need to change)
+# MCP Toolsets (These paths are hard coded, so they doesn't need to change)
+# Same consolidated tool-chest server and per-agent views as the tutor agent
 # TODO: Fix this for production
 #------------------------------------------------------------------
-WOLFRAM_MCP_SERVER = f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov/mcp_tool_chest/wolfram_tools.py"
-MARDI_MCP_SERVER = f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov/mcp_tool_chest/mardi_tools.py"
-CALCULATOR_MCP_SERVER = f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov/mcp_tool_chest/calculator.py"
-DUCKDUCKGO_MCP_SERVER = f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov/mcp_tool_chest/duckduckgo_tools.py"
-#------------------------------------------------------------------
-# Wolfram MCP toolset wrapper
-#------------------------------------------------------------------
-mcp_wolfram = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="python",  # Run MCP server via python
-            args=[
-                "-u",
-                WOLFRAM_MCP_SERVER,
-            ],
-            tool_filter=["wolfram_query"],
-        ),
-        timeout=60,
-    )
-)
-#------------------------------------------------------------------
-# MaRDI MCP toolset wrapper
-#------------------------------------------------------------------
-mcp_mardi = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="python",
-            args=[
-                "-u",
-                MARDI_MCP_SERVER,
-            ],
-            tool_filter=["mardi_query"],
-        ),
-        timeout=60,
-    )
-)
-#------------------------------------------------------------------
-# Calculator MCP toolset wrapper
-#------------------------------------------------------------------
-mcp_calculator = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="python",
-            args=[
-                "-u",
-                CALCULATOR_MCP_SERVER,
-            ],
-            tool_filter=["add", "subtract", "multiply", "divide", "power", "sqrt"],
-        ),
-        timeout=60,
-    )
-)
-#------------------------------------------------------------------
-# DuckDuckGo MCP toolset wrapper
-#------------------------------------------------------------------
-mcp_duckduckgo = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="python",
-            args=[
-                "-u",
-                DUCKDUCKGO_MCP_SERVER,
-            ],
-            tool_filter=["web_search"],
-        ),
-        timeout=60,
-    )
-)
+PROJECT_DIR = f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov"
+if PROJECT_DIR not in sys.path:
+    sys.path.insert(0, PROJECT_DIR)
+
+from tutor_agent.budget import BudgetedAgent, BudgetedAgentTool, BudgetedGemini, budget_exceeded, retry_config
+from tutor_agent.answer_cache import answer_cache_lookup, answer_cache_store
+from tutor_agent.compaction import compaction_callback
+from tutor_agent.fast_path import fast_path_callback
+from tutor_agent.toolsets import agent_toolset
+
+# Per-hop spans (model calls, specialist hops, tool calls, HTTP) with ERIK_TRACING=1,
+# as in tutor_agent/agent.py: the tool servers' spans join the same traces
+from telemetry import setup_tracing
+tracing_enabled = setup_tracing("erik-tutor-a2a")
+if tracing_enabled:
+    from tutor_agent.tracing import TracedGemini
+model_class = TracedGemini if tracing_enabled else BudgetedGemini
+
+mcp_wolfram = agent_toolset("wolfram_agent")
+mcp_mardi = agent_toolset("mardi_agent")
+mcp_calculator = agent_toolset("calculator_agent")
+mcp_duckduckgo = agent_toolset("web_search_agent")
 #-----------------------------------------------------------------
 # Read Prompts
 # Hardcoding path for mock eval class to work
@@ -148,49 +89,67 @@ with open(f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov/tutor_agent/
 with open(f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov/tutor_agent/prompts/orchastrator_prompt.md", "r") as f:
     root_prompt = f.read()
 
+with open(f"{os.path.expandvars('$HOME')}/projects/kaggle_genai_nov/tutor_agent/prompts/fanout_prompt.md", "r") as f:
+    fanout_prompt = f.read()
+
 #-----------------------------------------------------------------
 # Wolfram Agent : Solver/ Analyst
 #-----------------------------------------------------------------
-wolfram_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
+wolfram_agent = BudgetedAgent(
+    model=model_class(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
     name="wolfram_agent",
+    description="Solves equations, calculus and symbolic math, and looks up scientific data with Wolfram|Alpha.",
     instruction=f"""
     {wolfram_prompt}
     """,
     tools=[mcp_wolfram], #mcp_wolfram_server,
+    before_model_callback=compaction_callback,
+    on_tool_error_callback=budget_exceeded,
 )
 
 #-----------------------------------------------------------------
 # MaRDI Agent : The Archivist 
 #-----------------------------------------------------------------
-mardi_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),
+mardi_agent = BudgetedAgent(
+    model=model_class(model="gemini-2.5-flash", retry_options=retry_config),
     name="mardi_agent",
+    description="Finds definitions, formulas and identities in the MaRDI mathematical knowledge graph.",
     instruction=f"""
     {mardi_prompt}
     """,
     tools=[mcp_mardi],
+    before_model_callback=compaction_callback,
+    on_tool_error_callback=budget_exceeded,
 )
 
 #-----------------------------------------------------------------
 # Calculator Agent : The Trivial Calculator
 #-----------------------------------------------------------------
-calculator_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),
+calculator_agent = BudgetedAgent(
+    model=model_class(model="gemini-2.5-flash", retry_options=retry_config),
     name="calculator_agent",
+    description="Evaluates arithmetic with numbers only: + - * / ^ sqrt, whole expressions and tables of values.",
     instruction="""
     You are a calculator agent.
     Use the provided tools to perform basic arithmetic operations.
+    For anything with more than one operation, e.g. (3+4)*5^2/7,
+    call `evaluate_expression` once with the whole expression
+    instead of chaining the single-operation tools.
+    For tables of values (e.g. squares of 1..100, converting a list of units),
+    call `batch_calculate` once for the whole table instead of once per value.
     """,
     tools=[mcp_calculator],
+    before_model_callback=compaction_callback,
+    on_tool_error_callback=budget_exceeded,
 )
 
 #------------------------------------------------------------------
 # Web Search Agent : The Web Searcher
 #------------------------------------------------------------------
-web_search_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
+web_search_agent = BudgetedAgent(
+    model=model_class(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
     name="web_search_agent",
+    description="Looks up current information on the web: time and date, weather, news and recent events.",
     instruction=f"""
     You are a web search agent.
     Your primary role is to find **current information** such as:
@@ -202,6 +161,8 @@ web_search_agent = LlmAgent(
     Use the search tool to look up this information.
     """,
     tools=[mcp_duckduckgo],
+    before_model_callback=compaction_callback,
+    on_tool_error_callback=budget_exceeded,
 )
 
 #-----------------------------------------------------------------
@@ -209,14 +170,54 @@ web_search_agent = LlmAgent(
 # This is an exact copy of the root agent from the tutor agent
 # However, it is used here for the A2A server
 #-----------------------------------------------------------------
-root_tutor_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
+# ERIK_SPECIALIST_MODE as in tutor_agent/agent.py: transfers to sub-agents (default),
+# or "tools", where independent specialist calls from one turn run concurrently
+# and each hop leaves the root agent time to answer (tutor_agent/budget.py)
+SPECIALIST_MODES = ("tools", "transfer")
+SPECIALIST_MODE = os.getenv("ERIK_SPECIALIST_MODE", "transfer")
+if SPECIALIST_MODE not in SPECIALIST_MODES:
+    raise ValueError(f"ERIK_SPECIALIST_MODE must be one of {SPECIALIST_MODES}, got {SPECIALIST_MODE!r}")
+
+specialists = [wolfram_agent, web_search_agent, mardi_agent, calculator_agent]
+fan_out = SPECIALIST_MODE == "tools"
+
+root_tutor_agent = BudgetedAgent(
+    model=model_class(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
     name="root_agent",
     instruction=f"""
     {root_prompt}
+
+    {fanout_prompt if fan_out else ""}
     """,
-    sub_agents=[wolfram_agent, web_search_agent, mardi_agent, calculator_agent],
+    tools=[BudgetedAgentTool(agent=specialist) for specialist in specialists] if fan_out else [],
+    sub_agents=[] if fan_out else specialists,
+    before_model_callback=compaction_callback,
+    # As in tutor_agent/agent.py: pure arithmetic answered locally, repeated
+    # questions from the answer cache (ERIK_ANSWER_CACHE=1), everything else
+    # within ERIK_REQUEST_BUDGET seconds
+    before_agent_callback=[fast_path_callback, answer_cache_lookup],
+    after_agent_callback=answer_cache_store,
+    on_tool_error_callback=budget_exceeded,
+)
+
+#------------------------------------------------------------------
+# Sessions: SQLite-backed with a bounded in-memory hot tier (tutor_agent/sessions.py),
+# so the long-running server keeps flat memory and survives restarts
+#------------------------------------------------------------------
+from tutor_agent.sessions import session_service
+
+runner = Runner(
+    app_name=root_tutor_agent.name,
+    agent=root_tutor_agent,
+    artifact_service=InMemoryArtifactService(),
+    session_service=session_service(),
+    memory_service=InMemoryMemoryService(),
+    credential_service=InMemoryCredentialService(),
 )
 
 #Forward agent to a2a
-app = to_a2a(root_tutor_agent, port=8001)
\ No newline at end of file
+# Streaming (tutor_agent/streaming.py, ERIK_STREAMING): the answer reaches message/stream
+# clients as it is generated, and the agent card advertises streaming
+from tutor_agent.streaming import to_streaming_a2a
+
+app = to_streaming_a2a(root_tutor_agent, port=8001, runner=runner)
\ No newline at end of file
@@ -1,32 +1,39 @@
-import requests
-import json
-
-def check_model_card():
-    #------------------------------------------------------------------
-    # Fetch the agent card from the running server
-    #------------------------------------------------------------------
-    try:
-        response = requests.get(
-            "http://localhost:8001/.well-known/agent-card.json", timeout=5
-        )
-
-        if response.status_code == 200:
-            agent_card = response.json()
-            print("📋 Product Catalog Agent Card:")
-            print(json.dumps(agent_card, indent=2))
-
-            print("\n✨ Key Information:")
-            print(f"   Name: {agent_card.get('name')}")
-            print(f"   Description: {agent_card.get('description')}")
-            print(f"   URL: {agent_card.get('url')}")
-            print(f"   Skills: {len(agent_card.get('skills', []))} capabilities exposed")
-        else:
-            print(f"❌ Failed to fetch agent card: {response.status_code}")
-
-    except requests.exceptions.RequestException as e:
-        print(f"❌ Error fetching agent card: {e}")
-        print("   Make sure the Product Catalog Agent server is running (previous cell)")
-
-if __name__ == "__main__":
-    check_model_card()
-    
\ No newline at end of file
+import asyncio
+import json
+import os
+import sys
+import time
+
+import httpx
+
+# The client's agent-card cache (a2a_client/connection.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "a2a_client"))
+from connection import fetch_card
+
+AGENT_CARD_URL = "http://localhost:8001/.well-known/agent-card.json"
+
+
+async def check_model_card():
+    #------------------------------------------------------------------
+    # Fetch the agent card from the running server (or revalidate the cached copy)
+    #------------------------------------------------------------------
+    start = time.perf_counter()
+    try:
+        async with httpx.AsyncClient(timeout=5) as client:
+            agent_card, source = await fetch_card(AGENT_CARD_URL, client, max_age=0)
+    except httpx.HTTPError as e:
+        print(f"❌ Error fetching agent card: {e}")
+        print("   Make sure the Eric tutor server is running (python a2a_server_launch.py)")
+        return
+
+    print(f"📋 Eric Tutor Agent Card ({source}, {(time.perf_counter() - start) * 1000:.1f} ms):")
+    print(json.dumps(agent_card, indent=2))
+
+    print("\n✨ Key Information:")
+    print(f"   Name: {agent_card.get('name')}")
+    print(f"   Description: {agent_card.get('description')}")
+    print(f"   URL: {agent_card.get('url')}")
+    print(f"   Skills: {len(agent_card.get('skills', []))} capabilities exposed")
+
+if __name__ == "__main__":
+    asyncio.run(check_model_card())
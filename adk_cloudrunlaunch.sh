@@ -117,6 +117,7 @@ echo "--------------------------------------------------"
 # --source=. will detect the Dockerfile in the current directory and use it
 # instead of buildpacks. [web:150]
 # Memory is set to 4Gi to give headroom for MCP subagents.
+# Tools are called in-process (no MCP subprocesses) on the single instance.
 
 gcloud run deploy "$SERVICE_NAME" \
     --project="$PROJECT_ID" \
@@ -128,7 +129,7 @@ gcloud run deploy "$SERVICE_NAME" \
     --max-instances=1 \
     --memory=4Gi \
     --cpu=1 \
-    --set-env-vars="WOLFRAM_API_KEY=$WOLFRAM_KEY,GOOGLE_API_KEY=$GOOGLE_KEY"
+    --set-env-vars="WOLFRAM_API_KEY=$WOLFRAM_KEY,GOOGLE_API_KEY=$GOOGLE_KEY,ERIK_MCP_TRANSPORT=inprocess"
 
 echo "--------------------------------------------------"
 echo "🎉 Deployment Complete!"
@@ -1,8 +1,25 @@
 from mcp.server.fastmcp import FastMCP
+from safe_eval import ExpressionError, check_result, compile_expression, evaluate, to_float
+from transport import run_server
 import math
 
 mcp = FastMCP("calculator")
 
+# Upper bound on the number of results one batch_calculate call may produce
+MAX_BATCH_SIZE = 10_000
+
+# Named batch operations, expressed over x (from `a`) and y (from `b`)
+BATCH_OPERATIONS = {
+    "add": "x + y",
+    "subtract": "x - y",
+    "multiply": "x * y",
+    "divide": "x / y",
+    "power": "x ** y",
+    "sqrt": "sqrt(x)",
+}
+# The named operations that need the second operands `b`
+BINARY_OPERATIONS = {"add", "subtract", "multiply", "divide", "power"}
+
 @mcp.tool()
 def add(a: float, b: float) -> float:
     """
@@ -96,5 +113,112 @@ def sqrt(a: float) -> float:
         raise ValueError("Cannot calculate square root of a negative number")
     return math.sqrt(a)
 
+@mcp.tool()
+def evaluate_expression(expression: str) -> float:
+    """
+    Evaluate a whole arithmetic expression in one step.
+
+    Supports + - * / // % and ^ (or **) with the usual precedence, parentheses,
+    unary minus, the constants pi, e and tau, and the functions
+    abs, round, floor, ceil, sqrt, cbrt, exp, log (natural, or log(x, base)),
+    ln, log10, log2, sin, cos, tan, asin, acos, atan, sinh, cosh, tanh,
+    degrees, radians and factorial.
+
+    Args:
+        expression: The expression to evaluate, e.g. "(3+4)*5^2/7" or "sqrt(2)*sin(pi/4)".
+
+    Returns:
+        The value of the expression.
+
+    Raises:
+        ValueError: If the expression is invalid or undefined (e.g. division by zero),
+            or its value is not a real number a float can hold (e.g. (-8)^(1/3), 10^400).
+            Oversized powers and products (e.g. (10^10000)^10000) are refused
+            before they are computed.
+    """
+    return to_float(evaluate(expression))
+
+def _batch_range(start: float, stop: float, step: float) -> list[float]:
+    if not all(math.isfinite(value) for value in (start, stop, step)):
+        raise ValueError("start, stop and step must be finite numbers")
+    if step == 0:
+        raise ValueError("step must not be zero")
+    # e.g. start=-1e308, stop=1e308 overflows to inf, a tiny step to a count no list can hold
+    steps = (stop - start) / step
+    if not math.isfinite(steps):
+        raise ValueError(f"Range produces more than {MAX_BATCH_SIZE} values")
+    count = math.floor(steps + 1e-9) + 1
+    if count <= 0:
+        return []
+    if count > MAX_BATCH_SIZE:
+        raise ValueError(f"Range produces more than {MAX_BATCH_SIZE} values")
+    return [start + i * step for i in range(count)]
+
+@mcp.tool()
+def batch_calculate(
+    operation: str,
+    a: list[float] | None = None,
+    b: list[float] | float | None = None,
+    start: float | None = None,
+    stop: float | None = None,
+    step: float = 1,
+) -> list[float | None]:
+    """
+    Apply one operation to many operands in a single call (e.g. for tables of values).
+
+    The first operands come either from the list `a` or from the inclusive
+    range start..stop (e.g. start=1, stop=100 for 1, 2, ..., 100).
+
+    Args:
+        operation: One of "add", "subtract", "multiply", "divide", "power", "sqrt",
+            or an expression in x (the value from `a`) and y (the value from `b`),
+            e.g. "x^2" for squares or "x * 2.54" for inch to cm.
+        a: The first operands. Leave empty when using start/stop.
+        b: The second operands: a list as long as `a`, or a single number used for every element.
+            Required by "add", "subtract", "multiply", "divide" and "power" and by expressions in y.
+        start: First value of the range used when `a` is not given.
+        stop: Last value (inclusive) of the range used when `a` is not given.
+        step: Step of the range (default: 1).
+
+    Returns:
+        One result per operand, in order. Elements where the operation is
+        undefined (e.g. division by zero) or has no finite real value
+        (e.g. (-8)^(1/3)) are null.
+
+    Raises:
+        ValueError: If the operation is invalid, the operands are inconsistent or
+            the range is not finite or too long.
+    """
+    if a is None:
+        if start is None or stop is None:
+            raise ValueError("Provide either the operands `a` or a range via `start` and `stop`")
+        a = _batch_range(start, stop, step)
+    if len(a) > MAX_BATCH_SIZE:
+        raise ValueError(f"At most {MAX_BATCH_SIZE} operands are supported")
+
+    has_b = b is not None
+    if not has_b:
+        if operation in BINARY_OPERATIONS:
+            raise ValueError(f"`{operation}` needs the second operands `b`")
+        b = [None] * len(a)
+    elif not isinstance(b, list):
+        b = [b] * len(a)
+    elif len(b) == 1:
+        b = b * len(a)
+    elif len(b) != len(a):
+        raise ValueError(f"`b` has {len(b)} values but `a` has {len(a)}")
+
+    # Validate and compile the operation once, then sweep all operands
+    # Without `b` there is no y, so an expression using it is rejected instead of seeing 0
+    variables = ("x", "y") if has_b else ("x",)
+    compiled = compile_expression(BATCH_OPERATIONS.get(operation, operation), variables)
+    results = []
+    for x, y in zip(a, b):
+        try:
+            results.append(to_float(check_result(compiled(x=x, y=y))))
+        except ExpressionError:
+            results.append(None)
+    return results
+
 if __name__ == "__main__":
-    mcp.run(transport='stdio')
+    run_server(mcp)
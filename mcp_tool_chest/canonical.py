@@ -0,0 +1,179 @@
+"""
+Query canonicalization for the tool servers.
+
+"integrate sin x from 0 to pi", "∫ sin(x) dx, 0..π" and "Integrate sin(x)
+from 0 to pi" ask the same thing. canonicalize() rewrites such phrasings into
+one stable key (here "integrate sin(x) from 0 to pi") so wolfram_query and
+mardi_query share cache entries and can deduplicate in-flight requests.
+
+The key is only ever used for lookups; the tools still send the user's
+original query upstream. Persistent caches use cache_key(), which carries
+KEY_VERSION: entries written under an older canonical form are never served.
+"""
+import re
+import unicodedata
+
+# Bumped whenever canonicalize() stops merging keys it used to merge
+KEY_VERSION = 3
+
+#------------------------------------------------------------------
+# Unicode math symbols
+#------------------------------------------------------------------
+_SUPERSCRIPTS = str.maketrans("⁰¹²³⁴⁵⁶⁷⁸⁹⁻", "0123456789-")
+_SUPERSCRIPT_RUN = re.compile(r"[⁰¹²³⁴⁵⁶⁷⁸⁹⁻]+")
+
+_SYMBOLS = {
+    "∫": " integrate ",
+    "∑": " sum ",
+    "∏": " product ",
+    "∂": " partial ",
+    "√": " sqrt ",
+    "∞": " infinity ",
+    "π": " pi ",
+    "Γ": " gamma ",
+    "θ": " theta ",
+    "×": "*",
+    "·": "*",
+    "÷": "/",
+    "−": "-",
+    "–": "-",
+    "≤": "<=",
+    "≥": ">=",
+    "≠": "!=",
+    "→": " to ",
+}
+_SYMBOL_PATTERN = re.compile("|".join(re.escape(s) for s in _SYMBOLS))
+
+#------------------------------------------------------------------
+# Phrasing
+#------------------------------------------------------------------
+# Leading politeness and question words that never change the answer
+_LEADING_FILLER = re.compile(
+    r"^(?:(?:please|can you|could you|would you|tell me|show me|find me|find|"
+    r"what is|what's|whats|what are|calculate|compute|evaluate|determine|give me)\s+)+"
+)
+# Only before a word: "a" and "an" can also be variables ("solve a x + b = 0", "a + 1")
+_ARTICLES = re.compile(r"\b(?:the|a|an)\s+(?=[a-z]{2,})")
+# A "!" after a number, a single letter or ")" is a factorial ("5!", "n!", "(2n)!"),
+# not punctuation ("define the gamma function!")
+_TRAILING = re.compile(r"(?:[\s?.;:]|(?<![\d)!])(?<!\b[a-z])!)+$")
+
+# Equivalent verbs/nouns mapped onto one spelling, applied in order
+_SYNONYMS = [
+    (re.compile(r"\b(?:integral|antiderivative) of\b"), "integrate"),
+    (re.compile(r"\bintegration of\b"), "integrate"),
+    (re.compile(r"\b(?:derivative|differentiation) of\b"), "differentiate"),
+    (re.compile(r"\bd/d([a-z])\b\s*(.*)"), r"differentiate \2 wrt \1"),
+    (re.compile(r"\b(?:with respect to|w\.r\.t\.?)\s+([a-z])\b"), r"wrt \1"),
+    (re.compile(r"\bsquare root of\b"), "sqrt"),
+    (re.compile(r"\bsolve for ([a-z])\b:?\s*(.*)"), r"solve \2 for \1"),
+    (re.compile(r"\bdefinition of\b"), "define"),
+    (re.compile(r"\bln\b"), "log"),
+]
+
+# "0..pi", "0 .. pi", ", 0..pi" -> " from 0 to pi"
+_RANGE = re.compile(r"\s*,?\s*([\w.+\-*/^()]+?)\s*\.\.\s*([\w.+\-*/^()]+)")
+# "dx" after an integrand, "wrt x" after a derivative and "for x" after an
+# equation: dropped when x is the only variable, kept otherwise
+_DIFFERENTIAL = re.compile(r"\s+d([a-z])\b")
+_WRT = re.compile(r"\s+wrt ([a-z])\b")
+_SOLVE_FOR = re.compile(r"\s+for ([a-z])$")
+
+_FUNCTIONS = (
+    "sin|cos|tan|cot|sec|csc|sinh|cosh|tanh|arcsin|arccos|arctan|asin|acos|atan|"
+    "log|exp|sqrt|abs|gamma|erf|zeta"
+)
+# "sin x" -> "sin(x)", "sin 2x" -> "sin(2x)"; "sin x^2" is left alone (sin(x^2) or sin(x)^2?)
+_BARE_CALL = re.compile(rf"\b({_FUNCTIONS})\s+(\d*[a-z]|\d+(?:\.\d+)?)\b(?!\s*[(^])")
+# "sin (x)" -> "sin(x)"
+_SPACED_CALL = re.compile(rf"\b({_FUNCTIONS})\s+\(")
+_OPERATOR_SPACING = re.compile(r"\s*([+\-*/^=<>!,])\s*")
+_PAREN_SPACING = re.compile(r"(\()\s+|\s+(\))")
+# "5*x" -> "5x", matching how the implicit product is usually typed
+_IMPLICIT_PRODUCT = re.compile(r"(\d)(?:\*| )(?=[a-z](?![a-z])|\()")
+_WHITESPACE = re.compile(r"\s+")
+
+# Single-letter tokens that are constants, not variables
+_RESERVED_LETTERS = {"e", "i"}
+_SINGLE_LETTER = re.compile(r"(?<![a-z])[a-z](?![a-z])")
+_CANONICAL_VARIABLES = "xyzuvwabcdfghjklmnopqrst"
+
+
+def _normalize_unicode(text: str) -> str:
+    text = _SUPERSCRIPT_RUN.sub(lambda m: "^" + m.group(0).translate(_SUPERSCRIPTS), text)
+    text = _SYMBOL_PATTERN.sub(lambda m: _SYMBOLS[m.group(0)], text)
+    # NFKC folds full-width digits, ligatures and other compatibility forms
+    return unicodedata.normalize("NFKC", text)
+
+
+def _drop_implied_variable(pattern: re.Pattern, text: str) -> str:
+    # "integrate sin x dx" -> "integrate sin x", but "integrate x*y dx" keeps its dx
+    def drop(match):
+        variables = {letter for letter in _SINGLE_LETTER.findall(pattern.sub("", text))
+                     if letter not in _RESERVED_LETTERS}
+        return "" if variables <= {match.group(1)} else match.group(0)
+
+    return pattern.sub(drop, text)
+
+
+def _rename_variables(text: str) -> str:
+    mapping = {}
+
+    def rename(match):
+        letter = match.group(0)
+        if letter in _RESERVED_LETTERS:
+            return letter
+        if letter not in mapping:
+            mapping[letter] = _CANONICAL_VARIABLES[len(mapping) % len(_CANONICAL_VARIABLES)]
+        return mapping[letter]
+
+    return _SINGLE_LETTER.sub(rename, text)
+
+
+def canonicalize(query: str, rename_variables: bool = False) -> str:
+    """
+    Rewrites a math question into a stable cache/deduplication key.
+
+    Normalizes unicode math symbols (∫, π, ², ...), case, whitespace, filler
+    words, common synonyms ("integral of" -> "integrate"), function-call
+    spacing ("sin x" -> "sin(x)"), ranges ("0..π" -> "from 0 to pi") and
+    operator spacing. Whatever changes the answer stays in the key: the
+    variable of d/dy, "solve for y" or "dy" when there are several variables.
+
+    Args:
+        query: The query as typed by the user or the agent.
+        rename_variables: Also rename single-letter variables in order of
+            first appearance (x, y, z, ...), so "sin(t)" and "sin(x)" share
+            a key. Off by default because answers usually mention the
+            variable by name.
+
+    Returns:
+        The canonical key.
+    """
+    # Symbols are mapped again after casefolding: "Π" only becomes "π" there
+    text = _normalize_unicode(_normalize_unicode(query).casefold())
+    text = _WHITESPACE.sub(" ", text).strip()
+    text = _TRAILING.sub("", text)
+    text = _LEADING_FILLER.sub("", text)
+    text = _ARTICLES.sub("", text)
+    for pattern, replacement in _SYNONYMS:
+        text = pattern.sub(replacement, text)
+    text = text.replace("**", "^")
+    text = _RANGE.sub(r" from \1 to \2", text)
+    if "integrate" in text:
+        text = _drop_implied_variable(_DIFFERENTIAL, text)
+    text = _SPACED_CALL.sub(r"\1(", text)
+    text = _BARE_CALL.sub(r"\1(\2)", text)
+    text = _OPERATOR_SPACING.sub(r"\1", text)
+    text = _PAREN_SPACING.sub(lambda m: m.group(1) or m.group(2), text)
+    text = _IMPLICIT_PRODUCT.sub(r"\1", text)
+    text = _WHITESPACE.sub(" ", text).strip()
+    text = _drop_implied_variable(_SOLVE_FOR, _drop_implied_variable(_WRT, text))
+    if rename_variables:
+        text = _rename_variables(text)
+    return text
+
+
+def cache_key(query: str) -> str:
+    """canonicalize(query) tagged with KEY_VERSION, for caches that outlive the process."""
+    return f"v{KEY_VERSION}:{canonicalize(query)}"
@@ -0,0 +1,145 @@
+"""
+Request deadline shared by the agents, the model calls and the tools.
+
+A question used to have no time limit: every Gemini call retried up to five
+times with exp_base=7 (1 s, 7 s, 49 s, ... capped at 60 s between attempts),
+every MCP call waited up to 60 s and every tool HTTP request 10 s, one after
+the other down the root -> specialist -> tool chain. Instead, the root agent
+starts a budget for the whole request (ERIK_REQUEST_BUDGET seconds), and
+everything below it waits at most for what is left of it:
+
+    start(seconds)        sets the deadline of the current request (context
+                          variable: seen by the tasks and threads it starts)
+    clear()               ends it, so the next request in the task starts afresh
+    scope()               a block that is one request: starts a deadline unless
+                          it already runs inside one, and ends it on exit
+    remaining()           seconds left, inf outside a request
+    check(what)           remaining(), or DeadlineExceeded if nothing is left
+    narrowed(reserve)     a block with `reserve` seconds less, e.g. a
+                          specialist hop that must leave the root time to answer
+    backoff(attempt)      capped, fully jittered delay before a retry
+    DeadlineExceeded      raised when there is no time left to start or finish
+
+Stdlib only, so the tool servers (http_client.py) can import it as well.
+"""
+import contextlib
+import contextvars
+import math
+import os
+import random
+import time
+from typing import Iterator, Optional
+
+#------------------------------------------------------------------
+# Configuration
+#------------------------------------------------------------------
+# Seconds a question may take end to end (0: no deadline)
+REQUEST_BUDGET_SECONDS = float(os.getenv("ERIK_REQUEST_BUDGET", 60))
+# Kept back from each specialist hop for the root agent's own final answer
+SYNTHESIS_RESERVE_SECONDS = float(os.getenv("ERIK_SYNTHESIS_RESERVE", 10))
+# Attempts of a model call (the first included), and the backoff between them
+# (exponential, capped, jittered)
+RETRY_ATTEMPTS = int(os.getenv("ERIK_RETRY_ATTEMPTS", 4))
+RETRY_INITIAL_DELAY_SECONDS = float(os.getenv("ERIK_RETRY_INITIAL_DELAY", 0.5))
+RETRY_MAX_DELAY_SECONDS = float(os.getenv("ERIK_RETRY_MAX_DELAY", 4))
+RETRY_EXP_BASE = 2.0
+# A second, identical model request when the first has not answered after this
+# many seconds; the first to answer wins (0: no hedging)
+HEDGE_AFTER_SECONDS = float(os.getenv("ERIK_HEDGE_AFTER", 0))
+
+_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar("erik_deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    """The request's time budget ran out."""
+
+
+def start(seconds: Optional[float] = None) -> Optional[float]:
+    """
+    Starts the time budget of a request in the current context.
+
+    Args:
+        seconds: The budget (default REQUEST_BUDGET_SECONDS); 0 or less
+            leaves the request without a deadline.
+
+    Returns:
+        The deadline (time.monotonic() seconds), or None without one.
+    """
+    seconds = REQUEST_BUDGET_SECONDS if seconds is None else seconds
+    deadline = time.monotonic() + seconds if seconds > 0 else None
+    _deadline.set(deadline)
+    return deadline
+
+
+def clear() -> None:
+    """Removes the current deadline."""
+    _deadline.set(None)
+
+
+@contextlib.contextmanager
+def scope(seconds: Optional[float] = None) -> Iterator[None]:
+    """
+    Runs a block as one request, however it ends (returns, raises or is closed).
+
+    Inside a running deadline (a hop or a transfer of the same request) the
+    block keeps it; otherwise a deadline of `seconds` (see start()) is started
+    and removed on exit.
+    """
+    if _deadline.get() is not None:
+        yield
+        return
+    start(seconds)
+    try:
+        yield
+    finally:
+        clear()
+
+
+def remaining() -> float:
+    """Seconds left until the current deadline (math.inf without one, never below 0)."""
+    deadline = _deadline.get()
+    if deadline is None:
+        return math.inf
+    return max(0.0, deadline - time.monotonic())
+
+
+def check(what: str = "request") -> float:
+    """
+    Returns the time left, or raises DeadlineExceeded if there is none.
+
+    Args:
+        what: What was about to start, for the error message.
+    """
+    left = remaining()
+    if left <= 0:
+        raise DeadlineExceeded(f"No time left in the request budget for the {what}")
+    return left
+
+
+@contextlib.contextmanager
+def narrowed(reserve: float) -> Iterator[None]:
+    """
+    Runs a block with a deadline `reserve` seconds earlier, then restores it.
+
+    Without a deadline the block runs unchanged.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        yield
+        return
+    token = _deadline.set(deadline - reserve)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def backoff(attempt: int, initial: float = RETRY_INITIAL_DELAY_SECONDS, maximum: float = RETRY_MAX_DELAY_SECONDS,
+            exp_base: float = RETRY_EXP_BASE) -> float:
+    """
+    Delay before retry number `attempt` (0 for the first retry).
+
+    Full jitter: uniform between 0 and the capped exponential delay, so clients
+    that failed together do not retry together.
+    """
+    return random.uniform(0, min(maximum, initial * exp_base ** attempt))
@@ -1,9 +1,38 @@
 from mcp.server.fastmcp import FastMCP
-from ddgs import DDGS
+from http_client import get_client
+from transport import run_server
 import json
+import os
 
 fastmcp = FastMCP("duckduckgo-search")
 
+# Optional JSON search backend (a SearXNG instance, or a local stand-in for
+# benchmarks): GET <url>?q=...&format=json -> {"results": [{"title", "url", "content"}]}
+SEARCH_URL = os.getenv("WEB_SEARCH_URL")
+
+# One DDGS instance for the server's lifetime: it caches its search engines
+# and their HTTP clients, so connections are kept alive between searches.
+# Created on the first search so the server answers the MCP handshake
+# without importing ddgs.
+_ddgs = None
+
+
+def get_ddgs():
+    global _ddgs
+    if _ddgs is None:
+        from ddgs import DDGS
+
+        _ddgs = DDGS(timeout=int(os.getenv("TOOL_HTTP_TIMEOUT", 10)))
+    return _ddgs
+
+
+def search_backend(query: str, max_results: int) -> list[dict]:
+    """Searches WEB_SEARCH_URL; results have the same keys as DDGS.text (title, href, body)."""
+    resp = get_client(SEARCH_URL).get(SEARCH_URL, params={"q": query, "format": "json"})
+    resp.raise_for_status()
+    return [{"title": r.get("title"), "href": r.get("url"), "body": r.get("content")}
+            for r in resp.json().get("results", [])[:max_results]]
+
 @fastmcp.tool()
 def web_search(query: str, max_results: int = 5) -> str:
     """
@@ -18,7 +47,10 @@ def web_search(query: str, max_results: int = 5) -> str:
     """
     try:
         # Perform the search
-        results = DDGS().text(query, max_results=max_results)
+        if SEARCH_URL:
+            results = search_backend(query, max_results)
+        else:
+            results = get_ddgs().text(query, max_results=max_results)
         
         if not results:
             return "No search results found. The query may have been blocked or returned no results."
@@ -38,4 +70,4 @@ Snippet: {result.get('body', 'N/A')}
         return f"Error performing search: {str(e)}"
 
 if __name__ == "__main__":
-    fastmcp.run(transport='stdio')
+    run_server(fastmcp)
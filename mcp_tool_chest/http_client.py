@@ -0,0 +1,150 @@
+"""
+Shared, pooled HTTP clients for the MCP tool servers.
+
+Module-level `requests.get` opens a new TCP + TLS connection for every call,
+and under load the handshake dominates tool latency. The tool servers
+instead get one long-lived httpx client per upstream host (Wolfram, MaRDI
+API, MaRDI SPARQL, ...) with keep-alive, a per-host connection limit,
+HTTP/2 when the `h2` package is installed, and timeouts taken from the
+environment. Inside an agent request (in-process tools) no timeout reaches
+past the request's deadline (deadline.py).
+
+    resp = get_client(url).get(url, params=params)
+    resp = await get_async_client(url).get(url, params=params)
+"""
+import asyncio
+import os
+import threading
+import weakref
+from urllib.parse import urlsplit
+
+import httpx
+
+import deadline
+from telemetry import TRACING_ENABLED, TracedAsyncTransport, TracedTransport
+
+#------------------------------------------------------------------
+# Configuration
+#------------------------------------------------------------------
+TIMEOUT_SECONDS = float(os.getenv("TOOL_HTTP_TIMEOUT", 10))
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("TOOL_HTTP_CONNECT_TIMEOUT", 5))
+MAX_CONNECTIONS_PER_HOST = int(os.getenv("TOOL_HTTP_MAX_CONNECTIONS_PER_HOST", 10))
+MAX_KEEPALIVE_PER_HOST = int(os.getenv("TOOL_HTTP_MAX_KEEPALIVE_PER_HOST", MAX_CONNECTIONS_PER_HOST))
+KEEPALIVE_EXPIRY_SECONDS = float(os.getenv("TOOL_HTTP_KEEPALIVE_EXPIRY", 30))
+USER_AGENT = os.getenv("TOOL_HTTP_USER_AGENT", "Erik-MCP-Tools/1.0")
+
+
+def _http2_enabled() -> bool:
+    if os.getenv("TOOL_HTTP2", "1").lower() in ("0", "false", "no"):
+        return False
+    try:
+        import h2  # noqa: F401  (httpx needs it for HTTP/2)
+    except ImportError:
+        return False
+    return True
+
+
+HTTP2 = _http2_enabled()
+
+#------------------------------------------------------------------
+# Client pools (one per host)
+#------------------------------------------------------------------
+_lock = threading.Lock()
+_clients: dict[str, httpx.Client] = {}
+# Async clients are bound to the event loop they were first used on
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, dict[str, httpx.AsyncClient]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def _host_key(url: str) -> str:
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+def _within_deadline(request: httpx.Request) -> None:
+    # Shortens every timeout of the request to the time left in the agent request
+    left = deadline.check(f"request to {request.url.host}")
+    if left == float("inf"):
+        return
+    request.extensions["timeout"] = {phase: left if value is None else min(value, left)
+                                     for phase, value in request.extensions.get("timeout", {}).items()}
+
+
+async def _within_deadline_async(request: httpx.Request) -> None:
+    _within_deadline(request)
+
+
+def _client_options(is_async: bool = False) -> dict:
+    options = {
+        "http2": HTTP2,
+        "timeout": httpx.Timeout(TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+        "limits": httpx.Limits(
+            max_connections=MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=MAX_KEEPALIVE_PER_HOST,
+            keepalive_expiry=KEEPALIVE_EXPIRY_SECONDS,
+        ),
+        "headers": {"User-Agent": USER_AGENT},
+        "follow_redirects": True,
+        "event_hooks": {"request": [_within_deadline_async if is_async else _within_deadline]},
+    }
+    if TRACING_ENABLED:
+        # A custom transport replaces the client's own, so it gets the pool settings
+        pool = {"http2": options["http2"], "limits": options["limits"]}
+        options["transport"] = (TracedAsyncTransport(httpx.AsyncHTTPTransport(**pool)) if is_async
+                                else TracedTransport(httpx.HTTPTransport(**pool)))
+    return options
+
+
+def get_client(url: str) -> httpx.Client:
+    """
+    Returns the pooled synchronous client for the host of `url`.
+
+    Args:
+        url: Any URL on the target host; only scheme, host and port are used.
+
+    Returns:
+        A shared httpx.Client. Do not close it; use close_all() on shutdown.
+    """
+    key = _host_key(url)
+    client = _clients.get(key)
+    if client is None:
+        with _lock:
+            client = _clients.get(key)
+            if client is None:
+                client = _clients[key] = httpx.Client(**_client_options())
+    return client
+
+
+def get_async_client(url: str) -> httpx.AsyncClient:
+    """
+    Returns the pooled async client for the host of `url` on the running event loop.
+
+    Args:
+        url: Any URL on the target host; only scheme, host and port are used.
+
+    Returns:
+        A shared httpx.AsyncClient. Do not close it; use aclose_all() on shutdown.
+    """
+    key = _host_key(url)
+    loop = asyncio.get_running_loop()
+    clients = _async_clients.setdefault(loop, {})
+    client = clients.get(key)
+    if client is None:
+        client = clients[key] = httpx.AsyncClient(**_client_options(is_async=True))
+    return client
+
+
+def close_all() -> None:
+    """Closes every pooled synchronous client."""
+    with _lock:
+        for client in _clients.values():
+            client.close()
+        _clients.clear()
+
+
+async def aclose_all() -> None:
+    """Closes every pooled async client of the running event loop."""
+    clients = _async_clients.pop(asyncio.get_running_loop(), {})
+    for client in clients.values():
+        await client.aclose()
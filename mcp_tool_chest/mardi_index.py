@@ -0,0 +1,328 @@
+"""
+Local MaRDI formula index for offline, sub-millisecond lookups.
+
+A snapshot of what MaRDIClient returns for common concepts (QID, label,
+cleaned TeX, description, type) is kept in a compact SQLite database with
+an FTS5 full-text index over label and description. mardi_query serves
+concepts found here directly and only goes to the remote SPARQL endpoint
+on a miss.
+
+The snapshot is built and refreshed from the command line:
+
+    python mcp_tool_chest/mardi_index.py refresh                  # COMMON_CONCEPTS
+    python mcp_tool_chest/mardi_index.py refresh "gamma function"
+    python mcp_tool_chest/mardi_index.py search "reflection formula"
+    python mcp_tool_chest/mardi_index.py stats
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+from canonical import canonicalize
+from response_cache import DEFAULT_CACHE_DIR
+
+INDEX_PATH = os.getenv("MARDI_INDEX_PATH", os.path.join(DEFAULT_CACHE_DIR, "mardi_index.sqlite3"))
+
+# Concepts students ask about most; the default set for `refresh`
+COMMON_CONCEPTS = [
+    "gamma function",
+    "beta function",
+    "riemann zeta function",
+    "bessel function",
+    "error function",
+    "binomial coefficient",
+    "legendre polynomial",
+    "hermite polynomial",
+    "chebyshev polynomial",
+    "hypergeometric function",
+    "exponential function",
+    "natural logarithm",
+    "sine",
+    "cosine",
+    "fibonacci number",
+    "airy function",
+    "elliptic integral",
+    "digamma function",
+    "polylogarithm",
+    "lambert w function",
+]
+
+# Share of an indexed concept's words a query must name to be served from the
+# index without an exact match ("zeta function" -> "riemann zeta function"),
+# so generic queries ("function", "polynomial") go to the live lookup instead
+MIN_TOKEN_OVERLAP = float(os.getenv("MARDI_INDEX_MIN_OVERLAP", 0.6))
+
+_FTS_TOKEN = re.compile(r"\w+")
+
+
+def _singular(token: str) -> str:
+    # A plural "s" is dropped so "functions" finds "function"
+    return token[:-1] if len(token) > 3 and token.endswith("s") else token
+
+
+def _fts_query(text: str, prefix: bool = False) -> Optional[str]:
+    """Turns free text into an FTS5 query where every token must match."""
+    tokens = _FTS_TOKEN.findall(text.lower())
+    if not tokens:
+        return None
+    if not prefix:
+        return " AND ".join(f'"{token}"' for token in tokens)
+    return " AND ".join(f'"{_singular(token)}"*' for token in tokens)
+
+
+def token_overlap(query: str, concept: str) -> float:
+    """
+    How much of a concept a query names, word for word.
+
+    Args:
+        query: The concept as asked for, e.g. "zeta function".
+        concept: An indexed concept, e.g. "riemann zeta function".
+
+    Returns:
+        The share of the concept's words that are in the query (1.0 for an
+        exact match), or 0.0 if the query has a word the concept lacks.
+    """
+    asked = {_singular(token) for token in _FTS_TOKEN.findall(query.lower())}
+    known = {_singular(token) for token in _FTS_TOKEN.findall(concept.lower())}
+    if not asked or not asked <= known:
+        return 0.0
+    return len(asked) / len(known)
+
+
+class MaRDIIndex:
+    """
+    SQLite/FTS5 snapshot of MaRDI formulas, keyed by canonical concept.
+
+    Args:
+        path: Location of the SQLite file (created if missing).
+    """
+
+    def __init__(self, path: str = INDEX_PATH):
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS concepts (
+                key TEXT PRIMARY KEY,
+                concept TEXT NOT NULL,
+                refreshed_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS formulas (
+                id INTEGER PRIMARY KEY,
+                concept_key TEXT NOT NULL REFERENCES concepts(key),
+                position INTEGER NOT NULL,
+                qid TEXT NOT NULL,
+                label TEXT NOT NULL,
+                tex TEXT NOT NULL,
+                description TEXT NOT NULL,
+                type TEXT NOT NULL,
+                link TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS formulas_concept ON formulas(concept_key, position);
+            CREATE VIRTUAL TABLE IF NOT EXISTS formulas_fts USING fts5(
+                label, description, concept, formula_id UNINDEXED
+            );
+        """)
+        self._conn.commit()
+
+    #--------------------------------------------------------------
+    # Lookups
+    #--------------------------------------------------------------
+    def _formulas(self, concept_key: str) -> list[dict]:
+        rows = self._conn.execute(
+            "SELECT label, tex, description, link, type FROM formulas WHERE concept_key = ? ORDER BY position",
+            (concept_key,),
+        ).fetchall()
+        return [
+            {"id": label, "tex": tex, "description": description, "link": link, "type": kind}
+            for label, tex, description, link, kind in rows
+        ]
+
+    def lookup(self, concept: str) -> Optional[list[dict]]:
+        """
+        Returns the indexed formulas for a concept, in mardi_query's format.
+
+        The canonical concept is matched exactly first. Otherwise the indexed
+        concept names containing every word (as a prefix) are candidates, and
+        the one the query names best is served if the query names at least
+        MIN_TOKEN_OVERLAP of its words: "Gamma functions" finds
+        "gamma function" and "zeta function" "riemann zeta function", while
+        "gamma" or "polynomial" are left to the live lookup.
+
+        Args:
+            concept: The concept as asked for, e.g. "the Gamma function".
+
+        Returns:
+            The formulas, or None if the concept is not in the index.
+        """
+        key = canonicalize(concept)
+        with self._lock:
+            known = self._conn.execute("SELECT 1 FROM concepts WHERE key = ?", (key,)).fetchone()
+            if known is None:
+                query = _fts_query(key, prefix=True)
+                candidates = []
+                if query:
+                    candidates = self._conn.execute(
+                        """
+                        SELECT DISTINCT f.concept_key FROM formulas_fts
+                        JOIN formulas f ON f.id = formulas_fts.formula_id
+                        WHERE formulas_fts MATCH ?
+                        """,
+                        (f"concept : ({query})",),
+                    ).fetchall()
+                overlap, best = max(((token_overlap(key, candidate), candidate) for (candidate,) in candidates),
+                                    default=(0.0, None))
+                if overlap < MIN_TOKEN_OVERLAP:
+                    self.misses += 1
+                    return None
+                key = best
+            self.hits += 1
+            return self._formulas(key)
+
+    def search(self, text: str, limit: int = 10) -> list[dict]:
+        """
+        Full-text search over formula labels and descriptions.
+
+        Args:
+            text: Words that must all appear, e.g. "reflection formula".
+            limit: Maximum number of formulas to return.
+
+        Returns:
+            Matching formulas (best first), each with its concept.
+        """
+        query = _fts_query(text)
+        if not query:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT f.label, f.tex, f.description, f.link, f.type, c.concept
+                FROM formulas_fts
+                JOIN formulas f ON f.id = formulas_fts.formula_id
+                JOIN concepts c ON c.key = f.concept_key
+                WHERE formulas_fts MATCH ? ORDER BY bm25(formulas_fts) LIMIT ?
+                """,
+                (f"{{label description}} : ({query})", limit),
+            ).fetchall()
+        return [
+            {"id": label, "tex": tex, "description": description, "link": link, "type": kind, "concept": concept}
+            for label, tex, description, link, kind, concept in rows
+        ]
+
+    #--------------------------------------------------------------
+    # Snapshot maintenance
+    #--------------------------------------------------------------
+    def store(self, concept: str, formulas: list[dict]) -> None:
+        """Replaces the snapshot of one concept with `formulas` (mardi_query format)."""
+        key = canonicalize(concept)
+        with self._lock:
+            old_ids = [row[0] for row in self._conn.execute(
+                "SELECT id FROM formulas WHERE concept_key = ?", (key,)
+            )]
+            self._conn.executemany("DELETE FROM formulas_fts WHERE formula_id = ?", [(i,) for i in old_ids])
+            self._conn.execute("DELETE FROM formulas WHERE concept_key = ?", (key,))
+            self._conn.execute(
+                "INSERT OR REPLACE INTO concepts (key, concept, refreshed_at) VALUES (?, ?, ?)",
+                (key, concept, time.time()),
+            )
+            for position, item in enumerate(formulas):
+                link = item.get("link", "")
+                cursor = self._conn.execute(
+                    """
+                    INSERT INTO formulas (concept_key, position, qid, label, tex, description, type, link)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                    """,
+                    (key, position, link.rstrip("/").rsplit("/", 1)[-1], item["id"], item["tex"],
+                     item.get("description", ""), item.get("type", ""), link),
+                )
+                self._conn.execute(
+                    "INSERT INTO formulas_fts (label, description, concept, formula_id) VALUES (?, ?, ?, ?)",
+                    (item["id"], item.get("description", ""), key, cursor.lastrowid),
+                )
+            self._conn.commit()
+
+    async def refresh(self, client, concepts: list[str], concurrency: int = 4) -> dict:
+        """
+        Re-fetches concepts from MaRDI and stores them in the index.
+
+        Concepts for which MaRDI returns nothing are left as they are, so a
+        flaky connection never empties a good snapshot.
+
+        Args:
+            client: A MaRDIClient.
+            concepts: Concept names to refresh.
+            concurrency: Maximum number of concurrent MaRDI lookups.
+
+        Returns:
+            Number of formulas stored per concept.
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def refresh_one(concept):
+            async with semaphore:
+                formulas = await client.formulas_for_agent(concept)
+            if formulas:
+                self.store(concept, formulas)
+            return concept, len(formulas)
+
+        return dict(await asyncio.gather(*(refresh_one(c) for c in concepts)))
+
+    def concepts(self) -> list[str]:
+        with self._lock:
+            return [row[0] for row in self._conn.execute("SELECT concept FROM concepts ORDER BY concept")]
+
+    def stats(self) -> dict:
+        """Lookup counters since startup plus the size of the snapshot."""
+        with self._lock:
+            (concepts,) = self._conn.execute("SELECT COUNT(*) FROM concepts").fetchone()
+            (formulas,) = self._conn.execute("SELECT COUNT(*) FROM formulas").fetchone()
+            (oldest,) = self._conn.execute("SELECT MIN(refreshed_at) FROM concepts").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "concepts": concepts,
+            "formulas": formulas,
+            "oldest_refresh": oldest,
+        }
+
+#------------------------------------------------------------------
+# Command line
+#------------------------------------------------------------------
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build and query the local MaRDI formula index.")
+    parser.add_argument("--path", default=INDEX_PATH, help=f"index file (default: {INDEX_PATH})")
+    commands = parser.add_subparsers(dest="command", required=True)
+    refresh = commands.add_parser("refresh", help="fetch concepts from MaRDI into the index")
+    refresh.add_argument("concepts", nargs="*", help="concepts to refresh (default: common concepts)")
+    refresh.add_argument("--all", action="store_true", help="refresh every concept already in the index")
+    search = commands.add_parser("search", help="full-text search over labels and descriptions")
+    search.add_argument("text")
+    commands.add_parser("stats", help="show the size of the index")
+    args = parser.parse_args(argv)
+
+    index = MaRDIIndex(args.path)
+    if args.command == "refresh":
+        from mardi_search import MaRDIClient
+
+        concepts = args.concepts or (index.concepts() if args.all else COMMON_CONCEPTS)
+        counts = asyncio.run(index.refresh(MaRDIClient(), concepts))
+        for concept, count in counts.items():
+            print(f"{count:>4}  {concept}" + ("" if count else "  (not found, kept previous snapshot)"))
+    elif args.command == "search":
+        print(json.dumps(index.search(args.text), indent=2))
+    else:
+        print(json.dumps(index.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
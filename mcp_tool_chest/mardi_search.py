@@ -1,16 +1,100 @@
 import asyncio
 import re
-import requests
 import json
-from SPARQLWrapper import SPARQLWrapper, JSON
+import logging
+import os
+from http_client import get_async_client
 import html
+from urllib.parse import urlsplit
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+SPARQL_URL = os.getenv("MARDI_SPARQL_URL", "https://query.portal.mardi4nfdi.de/sparql")
+API_URL = os.getenv("MARDI_API_URL", "https://portal.mardi4nfdi.de/w/api.php")
+
+# How a concept is resolved to formulas:
+#   "single"   - one SPARQL query that also does the label search (mwapi EntitySearch)
+#   "two_step" - wbsearchentities on the MediaWiki API, then SPARQL for the QID
+#   "auto"     - single, falling back to two_step (for good) if the endpoint rejects
+#                the query (HTTP 400 or a SPARQL parse error); other failures
+#                (timeouts, 5xx, ...) only fail that lookup
+LOOKUP_MODES = ("auto", "single", "two_step")
+LOOKUP_MODE = os.getenv("MARDI_LOOKUP_MODE", "auto")
+
+# Formula properties on the MaRDI portal
+FORMULA_QUERY = """
+SELECT ?formula ?formulaLabel ?mathExpression ?description WHERE {{
+  {concept_clause}
+  ?formula wdt:P4 {concept} .
+  ?formula wdt:P15 ?mathExpression .
+  OPTIONAL {{
+    ?formula schema:description ?description .
+    FILTER(LANG(?description) = "en")
+  }}
+  SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
+}}
+LIMIT {limit}
+"""
+
+# Label search inside SPARQL, equivalent to wbsearchentities with limit=1
+ENTITY_SEARCH_CLAUSE = """
+  SERVICE wikibase:mwapi {{
+    bd:serviceParam wikibase:endpoint "{endpoint}" ;
+                    wikibase:api "EntitySearch" ;
+                    mwapi:search "{term}" ;
+                    mwapi:language "en" ;
+                    mwapi:limit "1" .
+    ?concept wikibase:apiOutputItem mwapi:item .
+  }}
+"""
+
+
+# How SPARQL endpoints (Blazegraph, Jena, Virtuoso) report a query they cannot parse
+_PARSE_ERROR_PATTERN = re.compile(r"MalformedQuery|QueryParseException|parse error|syntax error", re.IGNORECASE)
+
+
+def _query_rejected(error: Exception) -> bool:
+    """True if the endpoint refused the query itself, rather than failing transiently."""
+    if not isinstance(error, httpx.HTTPStatusError):
+        return False
+    response = error.response
+    return response.status_code == 400 or bool(_PARSE_ERROR_PATTERN.search(response.text[:2000]))
+
+
+# TeX extraction from MaRDI MathML, compiled once
+# Annotation content is XML-escaped, so it never contains "<"
+_ANNOTATION_PATTERN = re.compile(r"<annotation(\s[^>]*)?>([^<]*)</annotation>", re.IGNORECASE)
+_ENCODING_PATTERN = re.compile(r'\s*encoding="([^"]*)"')
+_ANNOTATION_PRIORITY = {"application/x-tex": 0, "application/x-latex": 1}
+# Matched without the optional leading "{" so the regex can scan for "\"
+_ARTIFACT_PATTERN = re.compile(r"\\(?:display|text)style")
+
+
+def _sparql_string(value: str) -> str:
+    """Escapes a value for use inside a double-quoted SPARQL string literal."""
+    return (
+        value.replace("\\", "\\\\")
+        .replace('"', '\\"')
+        .replace("\n", "\\n")
+        .replace("\r", "\\r")
+    )
 
 class MaRDIClient:
-    def __init__(self):
-        self.sparql_url = "https://query.portal.mardi4nfdi.de/sparql"
-        self.api_url = "https://portal.mardi4nfdi.de/w/api.php"
-        self.sparql = SPARQLWrapper(self.sparql_url)
-        self.sparql.addCustomHttpHeader("User-Agent", "MaRDI-MCP-Agent/1.0")
+    """
+    Async client for the MaRDI portal.
+
+    Every request goes through the pooled async HTTP client and carries its
+    own query, so one instance can serve many concurrent lookups without
+    blocking the event loop or sharing mutable query state.
+    """
+    def __init__(self, sparql_url: str = SPARQL_URL, api_url: str = API_URL, lookup_mode: str = LOOKUP_MODE):
+        if lookup_mode not in LOOKUP_MODES:
+            raise ValueError(f"lookup_mode must be one of {LOOKUP_MODES}, got {lookup_mode!r}")
+        self.sparql_url = sparql_url
+        self.api_url = api_url
+        self.lookup_mode = lookup_mode
 
     def _extract_tex(self, math_ml_string):
         """
@@ -20,21 +104,23 @@ class MaRDIClient:
         if not math_ml_string or not isinstance(math_ml_string, str):
             return ""
 
-        # 1. Regex to find content inside <annotation encoding="application/x-tex">...</annotation>
-        # We use a list of patterns to be safe, but the first one is the standard MaRDI format.
-        patterns = [
-            r'<annotation encoding="application/x-tex"[^>]*>(.*?)</annotation>',
-            r'<annotation encoding="application/x-latex"[^>]*>(.*?)</annotation>', 
-            r'<annotation[^>]+>(.*?)</annotation>'  # Fallback: any annotation
-        ]
-        
-        raw_tex = ""
-        for pat in patterns:
-            match = re.search(pat, math_ml_string, re.DOTALL | re.IGNORECASE)
-            if match:
-                raw_tex = match.group(1)
-                break  # Stop as soon as we find a match
-        
+        # 1. One pass over the <annotation> elements, keeping the best encoding
+        #    (x-tex, then x-latex, then any annotation with attributes)
+        # The annotations follow the (much longer) presentation markup; jump there
+        # with a plain substring search before running the case-insensitive regex.
+        start = max(math_ml_string.find("<annotation"), 0)
+        raw_tex, best = "", len(_ANNOTATION_PRIORITY) + 1
+        for match in _ANNOTATION_PATTERN.finditer(math_ml_string, start):
+            attributes = match.group(1)
+            if not attributes:
+                continue
+            encoding = _ENCODING_PATTERN.match(attributes)
+            rank = _ANNOTATION_PRIORITY.get(encoding.group(1).lower() if encoding else "", len(_ANNOTATION_PRIORITY))
+            if rank < best:
+                raw_tex, best = match.group(2), rank
+                if rank == 0:
+                    break  # Stop as soon as we find the standard MaRDI format
+
         if not raw_tex:
             return ""  # Could not find any TeX annotation
 
@@ -42,32 +128,28 @@ class MaRDIClient:
         # Converts "&lt;" -> "<", "&gt;" -> ">", "&amp;" -> "&"
         clean_tex = html.unescape(raw_tex).strip()
 
-        # 3. Remove MediaWiki/MathJax artifacts
-        # Common wrappers that are useless for LLMs/Solders
-        artifacts = [
-            r"{\displaystyle", 
-            r"{\textstyle", 
-            r"\displaystyle", 
-            r"\textstyle"
-        ]
-        for artifact in artifacts:
-            clean_tex = clean_tex.replace(artifact, "")
-
-        # 4. Balance Braces (Simple Heuristic)
-        # The .replace() above often leaves trailing braces "}}" from the original wrapper.
-        # If we have more closing braces than opening ones, strip them from the end.
-        while clean_tex.count('}') > clean_tex.count('{'):
-            if clean_tex.endswith('}'):
-                clean_tex = clean_tex[:-1]
-            else:
-                # If the extra brace is somewhere in the middle (unlikely but possible),
-                # we stop to avoid breaking valid nested math.
-                break
-
-        return clean_tex.strip()
-
-
-    def search_entity_id(self, term):
+        # 3. Remove MediaWiki/MathJax artifacts ({\displaystyle, \textstyle, ...)
+        parts = _ARTIFACT_PATTERN.split(clean_tex)
+        if len(parts) > 1:
+            clean_tex = "".join(part[:-1] if part.endswith("{") else part for part in parts[:-1]) + parts[-1]
+
+        # 4. Balance Braces
+        # Removing "{\displaystyle" leaves its closing brace(s) at the end. Count the
+        # unmatched "}" (escaped \{ \} are literal braces, not groups) and strip
+        # that many from the end; a stray brace elsewhere is left alone.
+        excess = (
+            clean_tex.count("}") - clean_tex.count("\\}") + clean_tex.count("\\\\}")
+            - clean_tex.count("{") + clean_tex.count("\\{") - clean_tex.count("\\\\{")
+        )
+        end = len(clean_tex)
+        while excess > 0 and end and clean_tex[end - 1] == "}":
+            end -= 1
+            excess -= 1
+
+        return clean_tex[:end].strip()
+
+
+    async def search_entity_id(self, term):
         params = {
             'action': 'wbsearchentities',
             'search': term,
@@ -77,48 +159,66 @@ class MaRDIClient:
             'format': 'json'
         }
         try:
-            resp = requests.get(self.api_url, params=params, headers={'User-Agent': 'MaRDI-MCP'})
+            resp = await get_async_client(self.api_url).get(self.api_url, params=params, headers={'User-Agent': 'MaRDI-MCP'})
             data = resp.json()
             if data.get('search'):
                 return data['search'][0]
             return None
-        except Exception:
+        except Exception as e:
+            logger.warning("MaRDI entity search failed: %s", e)
             return None
 
+    async def _sparql_query(self, query: str):
+        """Runs one SPARQL query and returns the JSON result bindings."""
+        resp = await get_async_client(self.sparql_url).get(
+            self.sparql_url,
+            params={"query": query, "format": "json"},
+            headers={"Accept": "application/sparql-results+json", "User-Agent": "MaRDI-MCP-Agent/1.0"},
+        )
+        resp.raise_for_status()
+        return resp.json()["results"]["bindings"]
+
+    async def _fetch_bindings_single(self, concept_term: str, limit: int):
+        """Resolves label -> entity -> formulas in one SPARQL round-trip."""
+        concept_clause = ENTITY_SEARCH_CLAUSE.format(
+            endpoint=urlsplit(self.api_url).netloc,
+            term=_sparql_string(concept_term),
+        )
+        query = FORMULA_QUERY.format(concept_clause=concept_clause, concept="?concept", limit=limit)
+        return await self._sparql_query(query)
+
+    async def _fetch_bindings_two_step(self, concept_term: str, limit: int):
+        """Resolves the entity on the MediaWiki API first, then queries its formulas."""
+        entity = await self.search_entity_id(concept_term)
+        if not entity:
+            return []
+        query = FORMULA_QUERY.format(concept_clause="", concept=f"wd:{entity['id']}", limit=limit)
+        return await self._sparql_query(query)
+
     # --- NEW: Internal method to get raw data (List of Dicts) ---
     async def _fetch_raw_formulas(self, concept_term: str, limit: int = 20):
         """Fetches the raw list of formula dictionaries."""
-        entity = self.search_entity_id(concept_term)
-        if not entity:
-            return []
+        bindings = None
+        if self.lookup_mode in ("single", "auto"):
+            try:
+                bindings = await self._fetch_bindings_single(concept_term, limit)
+            except Exception as e:
+                logger.warning("MaRDI single-query lookup failed: %s", e)
+                if self.lookup_mode == "auto" and _query_rejected(e):
+                    # The endpoint does not support mwapi search; stop trying
+                    logger.warning("Falling back to two-step MaRDI lookups")
+                    self.lookup_mode = "two_step"
+                else:
+                    return []
 
-        concept_id = entity['id']
-        
-        # Improved Query with Description
-        query = f"""
-        SELECT ?formula ?formulaLabel ?mathExpression ?description WHERE {{
-          ?formula wdt:P4 wd:{concept_id} .
-          ?formula wdt:P15 ?mathExpression .
-          OPTIONAL {{ 
-            ?formula schema:description ?description . 
-            FILTER(LANG(?description) = "en") 
-          }}
-          SERVICE wikibase:label {{ bd:serviceParam wikibase:language "en". }}
-        }}
-        LIMIT {limit}
-        """
-        
-        self.sparql.setQuery(query)
-        self.sparql.setReturnFormat(JSON)
-        
-        loop = asyncio.get_running_loop()
-        try:
-            results = await loop.run_in_executor(None, lambda: self.sparql.query().convert())
-        except Exception as e:
-            print(f"Error: {e}")
-            return []
+        if bindings is None:
+            try:
+                bindings = await self._fetch_bindings_two_step(concept_term, limit)
+            except Exception as e:
+                # stdout is the MCP stdio channel, so errors go to the log (stderr)
+                logger.warning("MaRDI SPARQL query failed: %s", e)
+                return []
 
-        bindings = results["results"]["bindings"]
         cleaned_results = []
         
         for b in bindings:
@@ -135,10 +235,9 @@ class MaRDIClient:
             
         return cleaned_results
 
-    # --- The Method triggering your error (FIXED) ---
-    async def filter_formulas_for_agent(self, concept: str):
+    async def formulas_for_agent(self, concept: str):
         """
-        Returns a JSON string of the top ranked formulas.
+        Returns the top ranked formulas as a list of dicts (id, tex, description, link, type).
         """
         # 1. Get the RAW list of dicts (not a string!)
         raw_items = await self._fetch_raw_formulas(concept)
@@ -154,14 +253,21 @@ class MaRDIClient:
             
             valid_results.append({
                 "id": item['id'],
-                "tex": item['tex'].replace('}}', ''),#for removing the leftoverclosing braces
+                "tex": item['tex'],
                 "description": item['description'],
                 "link": item['url'],
                 "type": "condition/bound" if is_inequality else "definition/identity"
             })
         
-        # 2. Limit to top 10 and return as JSON string for the Agent
-        return json.dumps(valid_results[:10], indent=2)
+        # 2. Limit to top 10
+        return valid_results[:10]
+
+    # --- The Method triggering your error (FIXED) ---
+    async def filter_formulas_for_agent(self, concept: str):
+        """
+        Returns a JSON string of the top ranked formulas.
+        """
+        return json.dumps(await self.formulas_for_agent(concept), indent=2)
 
 if __name__ == "__main__":
     # This should now print a valid JSON string
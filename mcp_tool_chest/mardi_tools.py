@@ -1,10 +1,43 @@
 from mcp.server.fastmcp import FastMCP
 from mardi_search import MaRDIClient
+from mardi_index import INDEX_PATH, MaRDIIndex
+from canonical import cache_key
+from response_cache import DEFAULT_CACHE_DIR, ResponseCache
+from transport import run_server
 import asyncio
+import json
+import os
 
 mcp = FastMCP("mardi-search")
 client = MaRDIClient()
 
+#------------------------------------------------------------------
+# Local formula index (offline snapshot, see mardi_index.py refresh)
+#------------------------------------------------------------------
+INDEX_ENABLED = os.getenv("MARDI_INDEX_ENABLED", "1").lower() not in ("0", "false", "no")
+
+index = MaRDIIndex(INDEX_PATH) if INDEX_ENABLED else None
+
+#------------------------------------------------------------------
+# Response cache and in-flight deduplication
+#------------------------------------------------------------------
+CACHE_ENABLED = os.getenv("MARDI_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+CACHE_PATH = os.getenv("MARDI_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "mardi_cache.sqlite3"))
+CACHE_TTL_SECONDS = float(os.getenv("MARDI_CACHE_TTL", 30 * 24 * 3600))
+CACHE_MAX_ENTRIES = int(os.getenv("MARDI_CACHE_MAX_ENTRIES", 10_000))
+
+cache = ResponseCache(CACHE_PATH, CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES) if CACHE_ENABLED else None
+
+# Concurrent lookups of the same concept share one upstream request
+_inflight: dict[str, asyncio.Task] = {}
+
+async def _fetch(concept: str, key: str) -> str:
+    result = await client.filter_formulas_for_agent(concept)
+    # Empty results are not cached: the portal may just have been unreachable
+    if cache is not None and result != "[]":
+        cache.set(key, result)
+    return result
+
 @mcp.tool()
 async def mardi_query(concept: str) -> str:
     """Search for mathematical formulas and definitions in MaRDI.
@@ -12,7 +45,37 @@ async def mardi_query(concept: str) -> str:
     Args:
         concept: The mathematical concept to search for (e.g., "gamma function").
     """
-    return await client.filter_formulas_for_agent(concept)
+    if index is not None:
+        formulas = index.lookup(concept)
+        if formulas:
+            return json.dumps(formulas, indent=2)
+
+    # "Gamma function", "the Γ function", ... share one cache entry
+    key = cache_key(concept)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch(concept, key))
+        _inflight[key] = task
+        task.add_done_callback(lambda _: _inflight.pop(key, None))
+    # shield: one caller being cancelled must not cancel the shared request
+    return await asyncio.shield(task)
+
+@mcp.tool()
+def mardi_cache_stats() -> dict:
+    """Report hit/miss counters and size of the MaRDI response cache and local index.
+
+    Returns:
+        Cache statistics (hits, misses, hit_rate, evictions, entries, ...) and index statistics
+    """
+    return {
+        "cache": {"enabled": True, **cache.stats()} if cache is not None else {"enabled": False},
+        "index": {"enabled": True, **index.stats()} if index is not None else {"enabled": False},
+    }
 
 if __name__ == "__main__":
-    mcp.run(transport='stdio')
+    run_server(mcp)
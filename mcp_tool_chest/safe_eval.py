@@ -0,0 +1,317 @@
+"""
+Safe arithmetic evaluation without `eval`.
+
+The expression is parsed with `ast` and only a whitelist of node types is
+walked: numbers, + - * / // % ** and unary +/-, the constants in CONSTANTS
+and calls to the functions in FUNCTIONS. Anything else (other names,
+attribute access, keyword arguments, comprehensions, ...) is rejected with
+an ExpressionError before a single operation runs. Integer powers and
+products whose result would have more than MAX_RESULT_DIGITS digits are
+refused before they are computed, so no input can keep the caller busy.
+"""
+import ast
+import math
+import operator
+import re
+
+# Guard against `9**9**9`-style inputs that would hang the process.
+MAX_EXPONENT = 10_000
+MAX_FACTORIAL = 1_000
+MAX_EXPRESSION_LENGTH = 1_000
+# Longest integer result; Python refuses to print ints past 4300 digits
+MAX_RESULT_DIGITS = 1_000
+
+
+class ExpressionError(ValueError):
+    """Raised when an expression is malformed or uses a non-whitelisted construct."""
+
+
+def _digits(value: int) -> float:
+    # Decimal digits of an integer, without printing it (math.log10 takes ints of any size)
+    return math.log10(abs(value)) if value else 0.0
+
+
+def _check_digits(digits: float) -> None:
+    # Integer results are checked before they are computed: a chain such as
+    # (10^10000)^1000 passes every single-operand check but takes minutes
+    if digits > MAX_RESULT_DIGITS:
+        raise ExpressionError(f"Result has more than {MAX_RESULT_DIGITS} digits")
+
+
+def _power(base, exponent):
+    if abs(exponent) > MAX_EXPONENT and abs(base) not in (0, 1):
+        raise ExpressionError(f"Exponent {exponent} is too large")
+    if isinstance(base, int) and isinstance(exponent, int) and exponent > 0:
+        _check_digits(exponent * _digits(base))
+    result = operator.pow(base, exponent)
+    if isinstance(result, complex):
+        # e.g. (-8)**(1/3): Python answers with a complex root
+        raise ExpressionError(f"{format_number(base)}^{format_number(exponent)} is not a real number")
+    return result
+
+
+def _multiply(left, right):
+    if isinstance(left, int) and isinstance(right, int):
+        _check_digits(_digits(left) + _digits(right))
+    return operator.mul(left, right)
+
+
+_BINARY_OPS = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: _multiply,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: _power,
+}
+
+_UNARY_OPS = {
+    ast.UAdd: operator.pos,
+    ast.USub: operator.neg,
+}
+
+
+def _factorial(n):
+    if n != int(n) or n < 0:
+        raise ExpressionError("factorial() is only defined for non-negative integers")
+    if n > MAX_FACTORIAL:
+        raise ExpressionError(f"factorial() argument is larger than {MAX_FACTORIAL}")
+    return math.factorial(int(n))
+
+
+def _log(x, base=math.e):
+    return math.log(x, base)
+
+
+FUNCTIONS = {
+    "abs": abs,
+    "round": round,
+    "floor": math.floor,
+    "ceil": math.ceil,
+    "sqrt": math.sqrt,
+    "cbrt": math.cbrt,
+    "exp": math.exp,
+    "log": _log,
+    "ln": math.log,
+    "log10": math.log10,
+    "log2": math.log2,
+    "sin": math.sin,
+    "cos": math.cos,
+    "tan": math.tan,
+    "asin": math.asin,
+    "acos": math.acos,
+    "atan": math.atan,
+    "sinh": math.sinh,
+    "cosh": math.cosh,
+    "tanh": math.tanh,
+    "degrees": math.degrees,
+    "radians": math.radians,
+    "factorial": _factorial,
+}
+
+CONSTANTS = {
+    "pi": math.pi,
+    "e": math.e,
+    "tau": math.tau,
+}
+
+# Symbols students type that Python spells differently.
+_SYMBOLS = {
+    "^": "**",
+    "×": "*",
+    "·": "*",
+    "÷": "/",
+    "−": "-",
+    "π": "pi",
+}
+_SYMBOL_PATTERN = re.compile("|".join(re.escape(s) for s in _SYMBOLS))
+# "√2" -> "sqrt(2)", "√(x+1)" -> "sqrt(x+1)"
+_ROOT_PATTERN = re.compile(r"√\s*(\d+(?:\.\d+)?|(?=\())")
+
+
+def normalize_expression(expression: str) -> str:
+    """
+    Rewrites calculator notation into Python operator syntax.
+
+    Args:
+        expression: The raw expression, e.g. "(3+4)*5^2" or "√2 * π".
+
+    Returns:
+        The expression with ^, ×, ÷, √, π and friends replaced by Python syntax.
+    """
+    expression = _ROOT_PATTERN.sub(lambda m: f"sqrt({m.group(1)})" if m.group(1) else "sqrt", expression)
+    return _SYMBOL_PATTERN.sub(lambda m: _SYMBOLS[m.group(0)], expression).strip()
+
+
+def _call(name, func, args):
+    try:
+        return func(*args)
+    except ExpressionError:
+        raise
+    except TypeError:
+        raise ExpressionError(f"Wrong number of arguments for {name}()")
+    except ValueError:
+        raise ExpressionError(f"{name}() is undefined for {', '.join(map(format_number, args))}")
+    except OverflowError:
+        raise ExpressionError("Result is too large")
+
+
+def _apply(op, left, right):
+    try:
+        return op(left, right)
+    except ZeroDivisionError:
+        raise ExpressionError("Cannot divide by zero")
+    except OverflowError:
+        raise ExpressionError("Result is too large")
+
+
+def _compile_node(node, variables):
+    """
+    Validates a node against the whitelist and turns it into a closure.
+
+    The closure takes the variable bindings as a dict, so an expression is
+    checked once and can then be evaluated many times without re-walking or
+    re-validating the tree.
+    """
+    if isinstance(node, ast.Expression):
+        return _compile_node(node.body, variables)
+    if isinstance(node, ast.Constant):
+        if isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            value = node.value
+            return lambda env: value
+        raise ExpressionError(f"Unsupported constant: {node.value!r}")
+    if isinstance(node, ast.BinOp):
+        op = _BINARY_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        left = _compile_node(node.left, variables)
+        right = _compile_node(node.right, variables)
+        return lambda env: _apply(op, left(env), right(env))
+    if isinstance(node, ast.UnaryOp):
+        op = _UNARY_OPS.get(type(node.op))
+        if op is None:
+            raise ExpressionError(f"Unsupported operator: {type(node.op).__name__}")
+        operand = _compile_node(node.operand, variables)
+        return lambda env: op(operand(env))
+    if isinstance(node, ast.Name):
+        name = node.id
+        if name in variables:
+            return lambda env: env[name]
+        if name not in CONSTANTS:
+            raise ExpressionError(f"Unknown name: {name}")
+        value = CONSTANTS[name]
+        return lambda env: value
+    if isinstance(node, ast.Call):
+        if not isinstance(node.func, ast.Name) or node.func.id not in FUNCTIONS:
+            raise ExpressionError(f"Unsupported function: {ast.unparse(node.func)}")
+        if node.keywords:
+            raise ExpressionError("Keyword arguments are not supported")
+        name = node.func.id
+        func = FUNCTIONS[name]
+        args = [_compile_node(arg, variables) for arg in node.args]
+        return lambda env: _call(name, func, [arg(env) for arg in args])
+    raise ExpressionError(f"Unsupported syntax: {type(node).__name__}")
+
+
+def compile_expression(expression: str, variables=()):
+    """
+    Parses and validates an expression once for repeated evaluation.
+
+    Args:
+        expression: The expression, e.g. "x^2 + 1".
+        variables: Names that may appear in the expression besides the constants.
+
+    Returns:
+        A function taking the variables as keyword arguments and returning
+        the value, e.g. compile_expression("x^2", ["x"])(x=3) == 9.
+
+    Raises:
+        ExpressionError: If the expression is malformed or uses anything
+            outside the whitelist. Evaluation errors (division by zero, ...)
+            are raised as ExpressionError when the function is called.
+    """
+    source = normalize_expression(expression)
+    if not source:
+        raise ExpressionError("Empty expression")
+    if len(source) > MAX_EXPRESSION_LENGTH:
+        raise ExpressionError(f"Expression is longer than {MAX_EXPRESSION_LENGTH} characters")
+    try:
+        tree = ast.parse(source, mode="eval")
+        compiled = _compile_node(tree, frozenset(variables))
+    except SyntaxError as e:
+        raise ExpressionError(f"Invalid expression: {e.msg}")
+    except RecursionError:
+        raise ExpressionError("Expression is nested too deeply")
+
+    def run(**env):
+        try:
+            return compiled(env)
+        except RecursionError:
+            raise ExpressionError("Expression is nested too deeply")
+    return run
+
+
+def evaluate(expression: str) -> float:
+    """
+    Evaluates an arithmetic expression safely.
+
+    Args:
+        expression: The expression to evaluate, e.g. "(3+4)*5^2/7".
+
+    Returns:
+        The numeric result.
+
+    Raises:
+        ExpressionError: If the expression is malformed, uses anything outside
+            the whitelist, is undefined (division by zero, sqrt(-1), ...) or
+            has no usable real value (see check_result).
+    """
+    return check_result(compile_expression(expression)())
+
+
+def check_result(value):
+    """
+    Rejects results that are no usable real number.
+
+    Args:
+        value: The value of an expression.
+
+    Returns:
+        The value, unchanged.
+
+    Raises:
+        ExpressionError: If the value is complex, infinite or NaN, or an
+            integer longer than MAX_RESULT_DIGITS digits.
+    """
+    if isinstance(value, complex):
+        raise ExpressionError("Result is not a real number")
+    if isinstance(value, float) and not math.isfinite(value):
+        raise ExpressionError("Result is not a finite number")
+    if isinstance(value, int) and abs(value) >= 10 ** MAX_RESULT_DIGITS:
+        raise ExpressionError(f"Result has more than {MAX_RESULT_DIGITS} digits")
+    return value
+
+
+def to_float(value) -> float:
+    """
+    Converts a checked result to a float, for callers that promise one.
+
+    Raises:
+        ExpressionError: If the value is too large for a float (e.g. 10^400).
+    """
+    try:
+        return float(value)
+    except OverflowError:
+        raise ExpressionError("Result is too large for a floating-point number")
+
+
+def format_number(value) -> str:
+    """Formats a result the way a calculator would (no trailing .0, 12 significant digits)."""
+    if isinstance(value, int) and abs(value) >= 10 ** MAX_RESULT_DIGITS:
+        return f"a number with more than {MAX_RESULT_DIGITS} digits"
+    if isinstance(value, float):
+        if value.is_integer() and abs(value) < 1e15:
+            return str(int(value))
+        return f"{value:.12g}"
+    return str(value)
@@ -0,0 +1,285 @@
+"""
+Per-hop tracing for the tutor agent and the tool servers.
+
+With ERIK_TRACING=1, every hop of an answer becomes an OpenTelemetry span:
+
+    invocation / invoke_agent <agent>     ADK (agent runs)
+    call_llm                              ADK (one per model call; tokens in/out)
+    execute_tool <tool>                   ADK (tool calls, transfer_to_agent, AgentTool)
+    mcp_tool <tool>                       tool server side of an MCP tool call
+    http <METHOD> <host>                  one per outbound HTTP attempt (Gemini, Wolfram,
+                                          MaRDI); the parent span counts the attempts,
+                                          so retries show up as erik.retries
+
+Spans are appended to ERIK_TRACE_FILE as JSON lines (trace_export.py) (default
+~/.cache/erik/traces.jsonl) with the duration, tokens in/out and retry
+count pulled out of the attributes. If OTEL_EXPORTER_OTLP_ENDPOINT (or
+OTEL_EXPORTER_OTLP_TRACES_ENDPOINT) is set they are also sent to that
+OTLP/HTTP collector (Jaeger, Tempo, Cloud Trace via the collector, ...).
+
+The tool servers (the tool chest and the separate servers alike) trace into
+the same file when they run as their own processes. The agent sends its
+trace context (W3C traceparent) in each MCP request's `_meta`, so an
+mcp_tool span nests under the execute_tool span that called it over stdio
+and HTTP; with ERIK_MCP_TRANSPORT=inprocess it nests there directly.
+"""
+import atexit
+import functools
+import inspect
+import json
+import logging
+import os
+from typing import Optional
+
+import httpx
+# Only the API at import: the SDK (provider, exporters) is loaded by
+# setup_tracing when tracing is on, so the tool servers do not pay for it
+from opentelemetry import propagate, trace
+from opentelemetry.trace import Status, StatusCode
+
+from response_cache import DEFAULT_CACHE_DIR
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------
+# Configuration
+#------------------------------------------------------------------
+TRACING_ENABLED = os.getenv("ERIK_TRACING", "0").lower() in ("1", "true", "yes")
+TRACE_FILE = os.getenv("ERIK_TRACE_FILE", os.path.join(DEFAULT_CACHE_DIR, "traces.jsonl"))
+OTLP_ENABLED = bool(os.getenv("OTEL_EXPORTER_OTLP_ENDPOINT") or os.getenv("OTEL_EXPORTER_OTLP_TRACES_ENDPOINT"))
+
+# Attribute names shared by the spans and the JSONL records
+TOKENS_IN = "gen_ai.usage.input_tokens"
+TOKENS_OUT = "gen_ai.usage.output_tokens"
+HTTP_ATTEMPTS = "erik.http_attempts"
+RETRIES = "erik.retries"
+
+tracer = trace.get_tracer("erik")
+
+#------------------------------------------------------------------
+# Setup
+#------------------------------------------------------------------
+_configured = False
+
+
+def setup_tracing(service_name: str) -> bool:
+    """
+    Installs the JSONL (and OTLP) exporters if ERIK_TRACING is set; once per process.
+
+    An application that already configured an OpenTelemetry SDK provider
+    keeps it; the exporters are added to it.
+
+    Args:
+        service_name: service.name of the spans, e.g. "erik-tutor".
+
+    Returns:
+        Whether tracing is on.
+    """
+    global _configured
+    if not TRACING_ENABLED or _configured:
+        return _configured
+    from opentelemetry.sdk.resources import Resource
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import BatchSpanProcessor
+
+    from trace_export import JsonlSpanExporter
+
+    provider = trace.get_tracer_provider()
+    if not isinstance(provider, TracerProvider):
+        provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        trace.set_tracer_provider(provider)
+    provider.add_span_processor(BatchSpanProcessor(JsonlSpanExporter(TRACE_FILE)))
+    if OTLP_ENABLED:
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+
+        provider.add_span_processor(BatchSpanProcessor(OTLPSpanExporter()))
+    # Short-lived processes (stdio tool servers) must not lose their last batch
+    atexit.register(provider.force_flush)
+    _configured = True
+    logger.info("Tracing to %s%s", TRACE_FILE, " and OTLP" if OTLP_ENABLED else "")
+    return True
+
+#------------------------------------------------------------------
+# Instrumentation
+#------------------------------------------------------------------
+def _count_attempt() -> int:
+    """Counts an HTTP attempt on the enclosing span (e.g. call_llm); returns the attempt number."""
+    parent = trace.get_current_span()
+    attributes = getattr(parent, "attributes", None)
+    if attributes is None or not parent.is_recording():
+        return 1
+    attempts = attributes.get(HTTP_ATTEMPTS, 0) + 1
+    parent.set_attribute(HTTP_ATTEMPTS, attempts)
+    parent.set_attribute(RETRIES, attempts - 1)
+    return attempts
+
+
+def _start_http_span(request: httpx.Request):
+    attempt = _count_attempt()
+    # No query string: it may carry API keys (Wolfram appid)
+    span = tracer.start_span(f"http {request.method} {request.url.host}", attributes={
+        "http.method": request.method,
+        "http.url": str(request.url.copy_with(query=None)),
+        "erik.attempt": attempt,
+    })
+    return span
+
+
+def _end_http_span(span, response: Optional[httpx.Response], error: Optional[BaseException]) -> None:
+    if response is not None:
+        span.set_attribute("http.status_code", response.status_code)
+        if response.status_code >= 400:
+            span.set_status(Status(StatusCode.ERROR))
+    if error is not None:
+        span.record_exception(error)
+        span.set_status(Status(StatusCode.ERROR, type(error).__name__))
+    span.end()
+
+
+class TracedTransport(httpx.BaseTransport):
+    """httpx transport that records one span per request attempt (until the response headers)."""
+
+    def __init__(self, transport: httpx.BaseTransport):
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        span = _start_http_span(request)
+        try:
+            response = self.transport.handle_request(request)
+        except BaseException as error:
+            _end_http_span(span, None, error)
+            raise
+        _end_http_span(span, response, None)
+        return response
+
+    def close(self) -> None:
+        self.transport.close()
+
+
+class TracedAsyncTransport(httpx.AsyncBaseTransport):
+    """Async httpx transport that records one span per request attempt (until the response headers)."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        span = _start_http_span(request)
+        try:
+            response = await self.transport.handle_async_request(request)
+        except BaseException as error:
+            _end_http_span(span, None, error)
+            raise
+        _end_http_span(span, response, None)
+        return response
+
+    async def aclose(self) -> None:
+        await self.transport.aclose()
+
+
+def trace_meta() -> dict:
+    """
+    The current trace context as MCP request `_meta` fields (W3C traceparent).
+
+    An MCP client sends it with a tool call, and the server's mcp_tool span
+    joins the caller's trace (see traced_tool).
+    """
+    carrier = {}
+    propagate.inject(carrier)
+    return carrier
+
+
+def _caller_context():
+    # Trace context sent in the `_meta` of the MCP request being handled;
+    # None outside one (in-process calls nest under the current span anyway)
+    from mcp.server.lowlevel.server import request_ctx
+
+    try:
+        meta = request_ctx.get().meta
+    except LookupError:
+        return None
+    carrier = {key: value for key, value in ((meta and meta.model_extra) or {}).items() if isinstance(value, str)}
+    return propagate.extract(carrier) if carrier else None
+
+
+def traced_tool(fn, name: str):
+    """
+    Wraps a tool function so each call is an `mcp_tool <name>` span.
+
+    The wrapper keeps the function's signature and sync/async kind, so
+    FastMCP derives the same tool schema from it. Called over MCP, the span
+    is a child of the caller's span sent in the request's `_meta`
+    (trace_meta). Exceptions mark the span as failed and propagate.
+    """
+    if inspect.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def async_wrapper(*args, **kwargs):
+            with tracer.start_as_current_span(f"mcp_tool {name}", context=_caller_context()):
+                return await fn(*args, **kwargs)
+        async_wrapper.traced = True
+        return async_wrapper
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        with tracer.start_as_current_span(f"mcp_tool {name}", context=_caller_context()):
+            return fn(*args, **kwargs)
+    wrapper.traced = True
+    return wrapper
+
+
+def trace_server_tools(server) -> None:
+    """Wraps every tool of a FastMCP server in traced_tool (tools already wrapped are left alone)."""
+    for tool in server._tool_manager.list_tools():
+        if not getattr(tool.fn, "traced", False):
+            tool.fn = traced_tool(tool.fn, tool.name)
+
+#------------------------------------------------------------------
+# Command line
+#------------------------------------------------------------------
+def load_traces(path: str = TRACE_FILE) -> dict[str, list[dict]]:
+    """Reads a trace file into {trace_id: [span records]}, in the order traces started."""
+    traces: dict[str, list[dict]] = {}
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            traces.setdefault(record["trace_id"], []).append(record)
+    return dict(sorted(traces.items(), key=lambda item: min(r["start"] for r in item[1])))
+
+
+def format_trace(spans: list[dict]) -> str:
+    """A trace as an indented tree: duration, tokens and retries per hop."""
+    children: dict[Optional[str], list[dict]] = {}
+    ids = {span["span_id"] for span in spans}
+    for span in sorted(spans, key=lambda s: s["start"]):
+        parent = span["parent_id"] if span["parent_id"] in ids else None
+        children.setdefault(parent, []).append(span)
+    lines = []
+
+    def walk(parent, depth):
+        for span in children.get(parent, []):
+            tokens = f"{span['tokens_in']}/{span['tokens_out']}" if span["tokens_in"] is not None else ""
+            retries = str(span["retries"]) if span["retries"] else ""
+            error = "  ERROR" if span["status"] == "ERROR" else ""
+            lines.append(f"{'  ' * depth + span['name']:<52}{span['duration_ms']:>10.1f}{tokens:>12}{retries:>8}{error}")
+            walk(span["span_id"], depth + 1)
+
+    walk(None, 0)
+    return "\n".join([f"{'span':<52}{'ms':>10}{'tok in/out':>12}{'retries':>8}"] + lines)
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Show traces recorded with ERIK_TRACING=1.")
+    parser.add_argument("--path", default=TRACE_FILE, help=f"trace file (default: {TRACE_FILE})")
+    parser.add_argument("--last", type=int, default=1, help="number of most recent traces to show")
+    parser.add_argument("--trace", help="show this trace id instead")
+    args = parser.parse_args(argv)
+
+    traces = load_traces(args.path)
+    selected = [args.trace] if args.trace else list(traces)[-args.last:]
+    for trace_id in selected:
+        print(f"trace {trace_id}\n{format_trace(traces[trace_id])}\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Consolidated MCP server for every tool in the tool chest.
+
+Instead of one `python -u <script>` process per tool server, the agents can
+start this single server, which registers the tools of calculator.py,
+wolfram_tools.py, mardi_tools.py and duckduckgo_tools.py under their
+original names, and give each agent a filtered view of it.
+
+Requests are handled concurrently: async tools run on the event loop, and
+blocking tools (synchronous HTTP clients) run in worker threads, so a slow
+Wolfram call does not hold up a calculator call.
+
+    python -u mcp_tool_chest/tool_chest.py
+    python -u mcp_tool_chest/tool_chest.py --transport streamable-http --port 8765
+"""
+import functools
+
+import anyio
+from mcp.server.fastmcp import FastMCP
+
+import calculator
+import duckduckgo_tools
+import mardi_tools
+import wolfram_tools
+from telemetry import TRACING_ENABLED, traced_tool
+from transport import run_server
+
+mcp = FastMCP("tool-chest")
+
+# (tool server, whether its synchronous tools block on I/O)
+TOOL_SERVERS = [
+    (calculator.mcp, False),
+    (wolfram_tools.fastmcp, True),
+    (mardi_tools.mcp, True),
+    (duckduckgo_tools.fastmcp, True),
+]
+
+
+def _in_worker_thread(fn):
+    """Wraps a blocking tool function so it runs in a worker thread."""
+    @functools.wraps(fn)
+    async def wrapper(*args, **kwargs):
+        return await anyio.to_thread.run_sync(functools.partial(fn, *args, **kwargs))
+    return wrapper
+
+
+def register_tools(server: FastMCP) -> list[str]:
+    """
+    Registers the tools of every tool server on `server`.
+
+    Args:
+        server: The FastMCP server to add the tools to.
+
+    Returns:
+        The names of the registered tools.
+    """
+    names = []
+    for source, blocking in TOOL_SERVERS:
+        for tool in source._tool_manager.list_tools():
+            fn = _in_worker_thread(tool.fn) if blocking and not tool.is_async else tool.fn
+            if TRACING_ENABLED:
+                fn = traced_tool(fn, tool.name)
+            server.add_tool(fn, name=tool.name, title=tool.title, description=tool.description,
+                            annotations=tool.annotations)
+            names.append(tool.name)
+    return names
+
+
+register_tools(mcp)
+
+if __name__ == "__main__":
+    run_server(mcp)
@@ -0,0 +1,77 @@
+"""
+JSONL export of the spans recorded with ERIK_TRACING=1 (see telemetry.py).
+
+Imported by telemetry.setup_tracing only when tracing is on, since it needs
+the OpenTelemetry SDK.
+"""
+import json
+import os
+import threading
+from typing import Sequence
+
+from opentelemetry.sdk.trace import ReadableSpan
+from opentelemetry.sdk.trace.export import SpanExporter, SpanExportResult
+
+from telemetry import RETRIES, TOKENS_IN, TOKENS_OUT
+
+# Long attribute values (ADK records whole requests and responses) are cut in the JSONL file
+MAX_ATTRIBUTE_CHARS = 300
+
+
+def _kind(name: str) -> str:
+    if name == "execute_tool transfer_to_agent":
+        return "transfer"
+    for prefix, kind in (("call_llm", "llm"), ("invoke_agent", "agent"), ("execute_tool", "tool"),
+                         ("mcp_tool", "mcp"), ("http ", "http"), ("invocation", "invocation")):
+        if name.startswith(prefix):
+            return kind
+    return "other"
+
+
+def span_record(span: ReadableSpan) -> dict:
+    """One span as a flat JSON-serializable record."""
+    attributes = {}
+    for key, value in (span.attributes or {}).items():
+        if isinstance(value, str) and len(value) > MAX_ATTRIBUTE_CHARS:
+            value = value[:MAX_ATTRIBUTE_CHARS] + "..."
+        elif isinstance(value, tuple):
+            value = list(value)
+        attributes[key] = value
+    return {
+        "trace_id": f"{span.context.trace_id:032x}",
+        "span_id": f"{span.context.span_id:016x}",
+        "parent_id": f"{span.parent.span_id:016x}" if span.parent else None,
+        "name": span.name,
+        "kind": _kind(span.name),
+        "service": span.resource.attributes.get("service.name"),
+        "start": span.start_time / 1e9,
+        "duration_ms": (span.end_time - span.start_time) / 1e6,
+        "tokens_in": attributes.get(TOKENS_IN),
+        "tokens_out": attributes.get(TOKENS_OUT),
+        "retries": attributes.get(RETRIES, 0),
+        "status": span.status.status_code.name,
+        "attributes": attributes,
+    }
+
+
+class JsonlSpanExporter(SpanExporter):
+    """
+    Appends finished spans to a file, one JSON object per line.
+
+    Args:
+        path: The JSONL file (created if missing; several processes may share it).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+
+    def export(self, spans: Sequence[ReadableSpan]) -> SpanExportResult:
+        lines = "".join(json.dumps(span_record(span), default=str) + "\n" for span in spans)
+        with self._lock, open(self.path, "a") as f:
+            f.write(lines)
+        return SpanExportResult.SUCCESS
+
+    def shutdown(self) -> None:
+        pass
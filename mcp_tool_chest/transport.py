@@ -0,0 +1,65 @@
+"""
+Transport selection for the MCP tool servers.
+
+Every tool server (and the consolidated tool_chest.py) can run over stdio,
+as a subprocess of one agent, or as a long-lived streamable-HTTP service
+that many agent workers share, together with its warm caches:
+
+    python -u mcp_tool_chest/tool_chest.py                                  # stdio
+    python -u mcp_tool_chest/tool_chest.py --transport streamable-http --port 8765
+    MCP_TRANSPORT=streamable-http MCP_HOST=0.0.0.0 python -u mcp_tool_chest/tool_chest.py
+
+Over HTTP the MCP endpoint is http://<host>:<port>/mcp.
+"""
+import argparse
+import logging
+import os
+
+from mcp.server.fastmcp import FastMCP
+
+from telemetry import setup_tracing, trace_server_tools
+
+TRANSPORTS = ("stdio", "streamable-http")
+
+TRANSPORT = os.getenv("MCP_TRANSPORT", "stdio")
+HOST = os.getenv("MCP_HOST", "127.0.0.1")
+PORT = int(os.getenv("MCP_PORT", 8765))
+# Stateless mode keeps no per-client session on the server, so clients can be
+# spread over several replicas without sticky sessions
+STATELESS_HTTP = os.getenv("MCP_STATELESS_HTTP", "0").lower() in ("1", "true", "yes")
+# FastMCP logs every request at INFO; WARNING keeps busy servers quiet
+LOG_LEVEL = os.getenv("MCP_LOG_LEVEL", "INFO").upper()
+
+
+def run_server(server: FastMCP, argv=None) -> None:
+    """
+    Runs a tool server on the configured transport.
+
+    Command line flags override the MCP_TRANSPORT, MCP_HOST, MCP_PORT,
+    MCP_STATELESS_HTTP and MCP_LOG_LEVEL environment variables. With
+    ERIK_TRACING=1 each tool call is a span in the trace file, joined to the
+    caller's trace (telemetry.py).
+
+    Args:
+        server: The FastMCP server to run.
+        argv: Command line arguments (default: sys.argv[1:]).
+    """
+    parser = argparse.ArgumentParser(description=f"Run the {server.name} MCP server.")
+    parser.add_argument("--transport", choices=TRANSPORTS, default=TRANSPORT)
+    parser.add_argument("--host", default=HOST, help="bind address for streamable-http")
+    parser.add_argument("--port", type=int, default=PORT, help="port for streamable-http")
+    parser.add_argument("--stateless", action="store_true", default=STATELESS_HTTP,
+                        help="no server-side MCP sessions (streamable-http)")
+    parser.add_argument("--log-level", default=LOG_LEVEL, choices=("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"))
+    args = parser.parse_args(argv)
+    if args.transport not in TRANSPORTS:
+        parser.error(f"MCP_TRANSPORT must be one of {TRANSPORTS}, got {args.transport!r}")
+
+    server.settings.host = args.host
+    server.settings.port = args.port
+    server.settings.stateless_http = args.stateless
+    server.settings.log_level = args.log_level
+    logging.getLogger().setLevel(args.log_level)
+    if setup_tracing(server.name):
+        trace_server_tools(server)
+    server.run(transport=args.transport)
@@ -1,11 +1,25 @@
 from mcp.server.fastmcp import FastMCP
-import requests
+from canonical import cache_key
+from http_client import get_client
+from response_cache import DEFAULT_CACHE_DIR, ResponseCache
+from transport import run_server
 import os
 from dotenv import load_dotenv
 
 load_dotenv()
 fastmcp = FastMCP("wolfram-llm")
 API_KEY = os.getenv("WOLFRAM_API_KEY")
+API_URL = os.getenv("WOLFRAM_API_URL", "https://www.wolframalpha.com/api/v1/llm-api")
+
+#------------------------------------------------------------------
+# Response cache (persists across MCP server restarts)
+#------------------------------------------------------------------
+CACHE_ENABLED = os.getenv("WOLFRAM_CACHE_ENABLED", "1").lower() not in ("0", "false", "no")
+CACHE_PATH = os.getenv("WOLFRAM_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "wolfram_cache.sqlite3"))
+CACHE_TTL_SECONDS = float(os.getenv("WOLFRAM_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MAX_ENTRIES = int(os.getenv("WOLFRAM_CACHE_MAX_ENTRIES", 10_000))
+
+cache = ResponseCache(CACHE_PATH, CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES) if CACHE_ENABLED else None
 
 @fastmcp.tool()
 def wolfram_query(query: str) -> str:
@@ -19,21 +33,45 @@ def wolfram_query(query: str) -> str:
     """
     if not API_KEY:
         return "Error: WOLFRAM_API_KEY missing"
+
+    # Equivalent phrasings ("∫ sin(x) dx, 0..π" / "integrate sin x from 0 to pi") share one entry
+    key = cache_key(query)
+    if cache is not None:
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
     
-    url = "https://www.wolframalpha.com/api/v1/llm-api"
+    url = API_URL
     params = {"input": query, "appid": API_KEY}
     
     try:
-        resp = requests.get(url, params=params, timeout=10)
+        # Pooled keep-alive connection; timeouts come from TOOL_HTTP_TIMEOUT (default 10s)
+        resp = get_client(url).get(url, params=params)
         # print(f"DEBUG: Status={resp.status_code}, Content-Type={resp.headers.get('content-type')}")
         # print(f"DEBUG: Response={resp.text[:200]}")  # First 200 chars
         resp.raise_for_status()
         
         # Wolfram LLM API returns plain text, NOT JSON
-        return resp.text if resp.text else "No result from Wolfram"
+        if not resp.text:
+            return "No result from Wolfram"
+        # Only successful answers are cached, so errors are retried next time
+        if cache is not None:
+            cache.set(key, resp.text)
+        return resp.text
         
     except Exception as e:
         return f"Error: {str(e)}"
 
+@fastmcp.tool()
+def wolfram_cache_stats() -> dict:
+    """Report hit/miss counters and size of the Wolfram response cache.
+
+    Returns:
+        Cache statistics (hits, misses, hit_rate, evictions, entries, ...)
+    """
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
 if __name__ == "__main__":
-    fastmcp.run(transport='stdio')
+    run_server(fastmcp)
@@ -0,0 +1,181 @@
+"""
+Agent-card resolution and connection reuse of the A2A client.
+
+Serves a scripted agent with the A2A server app (tutor_agent/streaming.py)
+on local ports and measures:
+
+    card      resolving the agent card with a new connection per fetch (as
+              check_model_card.py did), a cold fetch_card(), a revalidation
+              (304) and a cache hit within A2A_CARD_MAX_AGE
+              (a2a_client/connection.py)
+    turns     a conversation of --turns questions with --gap seconds of
+              "typing" between them, with ADK's RemoteA2aAgent and its own
+              HTTP client against uvicorn's default 5 s keep-alive, and with
+              the client's StreamingRemoteA2aAgent (keep-alive connection, cached card)
+              against the launcher's keep-alive; counts the TCP connections
+              the server accepted and times each turn
+
+On localhost a handshake costs well under a millisecond; over a network it
+is one round-trip (plus TLS), once per connection counted here.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_a2a_client.py [--turns 4] [--gap 6] [--fetches 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "a2a_flow"))
+sys.path.insert(0, os.path.join(ROOT, "a2a_flow", "a2a_client"))
+
+# A cache directory of our own, so the run starts cold and leaves nothing behind
+os.environ["A2A_CARD_CACHE_DIR"] = tempfile.mkdtemp(prefix="a2a_cards_")
+
+import httpx
+import uvicorn
+from a2a.client.client import ClientConfig
+from a2a.client.client_factory import ClientFactory
+from a2a.types import TransportProtocol
+from google.adk.agents import LlmAgent
+from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH, RemoteA2aAgent
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from scripted_llm import ScriptedLlm, text_response
+from tutor_agent.streaming import to_streaming_a2a
+
+import a2a_server_launch
+import agent as a2a_client
+import connection
+
+# uvicorn's default
+DEFAULT_KEEPALIVE_SECONDS = 5
+
+
+class ConnectionCounter:
+    """ASGI wrapper counting the distinct client connections (address, port) of its requests."""
+
+    def __init__(self, app):
+        self.app = app
+        self.peers = set()
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope.get("client"):
+            self.peers.add(tuple(scope["client"]))
+        await self.app(scope, receive, send)
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(keepalive_seconds):
+    """Serves a scripted agent; returns its agent card URL and connection counter."""
+    eric = LlmAgent(name="eric", description="Scripted Eric", instruction="Answer.",
+                    model=ScriptedLlm(script=lambda _: text_response("Gamma(5.5) = 52.3428"), latency=0.0))
+    port = free_port()
+    app = ConnectionCounter(to_streaming_a2a(eric, runner=InMemoryRunner(agent=eric), host="127.0.0.1", port=port))
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning",
+                                           timeout_keep_alive=int(keepalive_seconds)))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            sys.exit("The A2A server failed to start")
+        time.sleep(0.05)
+    return f"http://127.0.0.1:{port}{AGENT_CARD_WELL_KNOWN_PATH}", app
+
+
+def median_ms(samples):
+    return statistics.median(samples) * 1000
+
+
+async def time_card(card_url, fetches):
+    async def timed(fetch):
+        start = time.perf_counter()
+        await fetch()
+        return time.perf_counter() - start
+
+    async def fresh_connection():
+        async with httpx.AsyncClient() as client:
+            (await client.get(card_url)).raise_for_status()
+
+    rows = [("new connection per fetch", [await timed(fresh_connection) for _ in range(fetches)])]
+    async with connection.keepalive_client() as client:
+        rows.append(("fetch_card, cold", [await timed(lambda: connection.fetch_card(card_url, client))]))
+        rows.append(("fetch_card, revalidated", [await timed(lambda: connection.fetch_card(card_url, client, max_age=0))
+                                                 for _ in range(fetches)]))
+        rows.append(("fetch_card, cached", [await timed(lambda: connection.fetch_card(card_url, client))
+                                            for _ in range(fetches)]))
+    print(f"{'agent card':<28}{'median ms':>12}")
+    for name, samples in rows:
+        print(f"{name:<28}{median_ms(samples):>12.2f}")
+
+
+async def time_turns(remote, counter, turns, gap):
+    runner = InMemoryRunner(agent=remote, app_name="bench_a2a_client")
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    timings = []
+    for turn in range(turns):
+        if turn:
+            await asyncio.sleep(gap)
+        message = types.Content(role="user", parts=[types.Part.from_text(text="What is Gamma(5.5)?")])
+        start = time.perf_counter()
+        async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+        timings.append(time.perf_counter() - start)
+    return len(counter.peers), timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=4, help="questions per conversation")
+    parser.add_argument("--gap", type=float, default=6.0, help="seconds between two questions")
+    parser.add_argument("--fetches", type=int, default=20, help="agent card fetches per mode")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    card_url, _ = start_server(a2a_server_launch.KEEPALIVE_SECONDS)
+    asyncio.run(time_card(card_url, args.fetches))
+
+    print(f"\n{args.turns} turns, {args.gap:.0f} s apart")
+    print(f"{'conversation':<28}{'connections':>12}{'first turn ms':>16}{'later turns ms':>16}")
+    before_url, before = start_server(DEFAULT_KEEPALIVE_SECONDS)
+    after_url, after = start_server(a2a_server_launch.KEEPALIVE_SECONDS)
+
+    def factory(httpx_client=None):
+        return ClientFactory(config=ClientConfig(httpx_client=httpx_client, streaming=True, polling=False,
+                                                 supported_transports=[TransportProtocol.jsonrpc]))
+
+    for name, counter, remote in (
+        # RemoteA2aAgent creates its own client (httpx's 5 s keep-alive) and fetches the card
+        ("before (ADK defaults)", before, RemoteA2aAgent(
+            name="eric_tutor", agent_card=before_url, a2a_client_factory=factory())),
+        ("after (keep-alive, cache)", after, a2a_client.StreamingRemoteA2aAgent(
+            name="eric_tutor", agent_card=after_url, a2a_client_factory=factory(connection.keepalive_client()))),
+    ):
+        connections, timings = asyncio.run(time_turns(remote, counter, args.turns, args.gap))
+        later = median_ms(timings[1:]) if len(timings) > 1 else 0.0
+        print(f"{name:<28}{connections:>12}{timings[0] * 1000:>16.1f}{later:>16.1f}")
+
+    print("\nconnection.TIMING_STATS (after):")
+    for phase in ("card_network", "call_first_event", "call"):
+        print(f"  {phase:<20}{connection.TIMING_STATS[f'{phase}_count']:>4} x {connection.mean_ms(phase):>8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
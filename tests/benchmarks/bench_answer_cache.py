@@ -0,0 +1,129 @@
+"""
+Latency of repeated questions with the answer cache (tutor_agent/answer_cache.py).
+
+Runs the real tutor agent graph (tutor_agent/agent.py) with scripted models
+(scripted_llm.py) on the A2A client's example questions plus a time-sensitive
+one, each in a new session:
+
+    cold          first time: the full root -> specialist chain runs
+    warm          the same questions again: answered from the cache
+    follow-up     a repeated question as the second turn of a session: not
+                  cached, it may depend on the first turn
+    prompt edit   after a change to a file in tutor_agent/prompts/ (on a copy):
+                  every key changes, so the chain runs again
+
+"What time is it in Tokyo?" goes to web_search_agent and is never cached;
+"What is 22 * 100?" is answered by the arithmetic fast path before the cache.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_answer_cache.py [--root-latency 0.4] [--specialist-latency 0.8]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# No tool servers needed: the scripted specialists answer without tool calls
+os.environ["ERIK_MCP_TRANSPORT"] = "inprocess"
+os.environ["ERIK_SPECIALIST_MODE"] = "tools"
+os.environ["ERIK_ANSWER_CACHE"] = "1"
+# A cache of our own, so the run starts cold and leaves nothing behind
+CACHE_DIR = tempfile.mkdtemp(prefix="answer_cache_")
+os.environ["ERIK_ANSWER_CACHE_PATH"] = os.path.join(CACHE_DIR, "answer_cache.sqlite3")
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from scripted_llm import ScriptedLlm, call_response, function_responses, text_response
+from tutor_agent import agent, answer_cache
+
+QUESTIONS = [
+    "What is 22 * 100?",
+    "Solve x^2 + 5x + 6 = 0",
+    "What is the definition of the Gamma function?",
+    "Integrate sin(x) from 0 to pi",
+    "What time is it in Tokyo?",
+]
+SPECIALIST = {
+    "Solve": "wolfram_agent",
+    "definition": "mardi_agent",
+    "Integrate": "wolfram_agent",
+    "time": "web_search_agent",
+}
+
+
+def root_script(llm_request):
+    if function_responses(llm_request):
+        return text_response("Here is the answer, step by step.")
+    question = llm_request.contents[-1].parts[0].text
+    name = next((name for word, name in SPECIALIST.items() if word in question), None)
+    if name is None:
+        return text_response("Hello! What would you like to work on?")
+    return call_response((name, {"request": question}))
+
+
+async def ask(runner, questions):
+    """Asks `questions` as the turns of one new session; returns seconds and whether the cache answered, per turn."""
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    results = []
+    for question in questions:
+        hits = answer_cache.stats()["hits"]
+        message = types.Content(role="user", parts=[types.Part.from_text(text=question)])
+        start = time.perf_counter()
+        async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+        results.append((time.perf_counter() - start, answer_cache.stats()["hits"] > hits))
+    return results
+
+
+def report(mode, results):
+    for question, (seconds, hit) in zip(QUESTIONS, results):
+        print(f"{mode:<14}{question:<48}{seconds * 1000:>10.1f}{'cache' if hit else '':>8}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--root-latency", type=float, default=0.4, help="seconds per root model call")
+    parser.add_argument("--specialist-latency", type=float, default=0.8, help="seconds per specialist model call")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    for specialist in agent.specialists:
+        specialist.model = ScriptedLlm(script=lambda _: text_response("done"), latency=args.specialist_latency)
+    agent.root_agent.model = ScriptedLlm(script=root_script, latency=args.root_latency)
+    runner = InMemoryRunner(agent=agent.root_agent, app_name="bench_answer_cache")
+
+    async def run():
+        print(f"{'mode':<14}{'question':<48}{'ms':>10}{'':>8}")
+        report("cold", [(await ask(runner, [question]))[0] for question in QUESTIONS])
+        report("warm", [(await ask(runner, [question]))[0] for question in QUESTIONS])
+        report("follow-up", [(await ask(runner, ["Hello", question]))[1] for question in QUESTIONS])
+
+        # A prompt edit, on a copy of the prompts: a new process sees a new version
+        prompts = os.path.join(CACHE_DIR, "prompts")
+        shutil.copytree(answer_cache.PROMPTS_DIR, prompts)
+        with open(os.path.join(prompts, "orchastrator_prompt.md"), "a") as f:
+            f.write("\nAlways show your work.\n")
+        answer_cache.PROMPTS_DIR = prompts
+        answer_cache._versions.clear()
+        report("prompt edit", [(await ask(runner, [question]))[0] for question in QUESTIONS])
+
+    asyncio.run(run())
+    stats = answer_cache.stats()
+    print(f"\nanswer_cache.stats(): {stats['hits']} hits, {stats['misses']} misses, "
+          f"hit rate {stats['hit_rate']:.2f}, {stats['entries']} entries")
+    shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
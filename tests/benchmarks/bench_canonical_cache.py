@@ -0,0 +1,163 @@
+"""
+Cache hit-rate benchmark: whitespace/case key vs. canonical key.
+
+Replays the questions from tests/routing_eval_set.json and the README /
+example_usage.py examples, each in several equivalent phrasings, through a
+simulated cache and reports how many lookups hit with
+response_cache.normalize_key (the plain key) and with canonical.canonicalize.
+
+A hit is only worth having if it is the right answer, so it also checks
+that different questions keep different keys: the question groups (apart
+from SAME_QUESTION) and the near-misses in DISTINCT_QUESTIONS, which differ
+only in a variable, an article-like letter or a bracket. It exits with
+status 1 if any of them share a key.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_canonical_cache.py
+"""
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+
+from canonical import canonicalize
+from response_cache import normalize_key
+
+README_QUESTIONS = [
+    "What is the integral of sin(x) from 0 to π?",
+    "Find me the references of Gamma Function from MaRDI portal",
+    "What is the square root of 64?",
+    "Who is the current President of France?",
+    # a2a_client/example_usage.py
+    "What is 22 * 100?",
+    "Solve x^2 + 5x + 6 = 0",
+    "What is the definition of the Gamma function?",
+    "Integrate sin(x) from 0 to pi",
+]
+
+# Hand-written equivalents of how students actually retype the same question
+EXTRA_PHRASINGS = {
+    "Integrate sin(x) from 0 to pi": [
+        "integrate sin x from 0 to pi",
+        "∫ sin(x) dx, 0..π",
+        "Integrate sin(x) dx from 0 to π",
+        "integral of sin x from 0 to pi",
+    ],
+    "Calculate the derivative of x^3 + 5x": [
+        "derivative of x³ + 5x",
+        "d/dx x^3+5*x",
+        "What is the derivative of x**3 + 5 x?",
+    ],
+    "What is the square root of 64?": ["√64", "sqrt(64)", "sqrt 64"],
+    "Solve x^2 + 5x + 6 = 0": ["solve for x: x**2 + 5*x + 6 = 0", "Solve x² + 5x + 6 = 0"],
+    "What is the definition of the Gamma function?": ["definition of Γ function", "define gamma function"],
+}
+
+# Groups that really are one question: the README asks for this integral twice
+SAME_QUESTION = [("What is the integral of sin(x) from 0 to π?", "Integrate sin(x) from 0 to pi")]
+
+# Questions that look alike but have different answers
+DISTINCT_QUESTIONS = [
+    ["d/dx x^2 y", "d/dy x^2 y", "derivative of x^2 y"],
+    ["solve for x: x + y = 1", "solve for y: x + y = 1"],
+    ["integrate x*y dx", "integrate x*y dy"],
+    ["solve a x + b = 0", "solve x + b = 0"],
+    ["what is a + 1", "what is 1", "what is +1"],
+    ["sin x^2", "sin(x)^2", "sin(x^2)"],
+]
+
+
+def load_questions():
+    with open(os.path.join(ROOT, "tests", "routing_eval_set.json")) as f:
+        eval_set = json.load(f)
+    questions = [
+        turn["user_content"]["parts"][0]["text"]
+        for case in eval_set["eval_cases"]
+        for turn in case["conversation"]
+    ]
+    return questions + README_QUESTIONS
+
+
+def mechanical_variants(question):
+    """Phrasings that differ only in case, spacing, punctuation and symbols."""
+    bare = question.rstrip("?")
+    return [
+        question,
+        question.lower(),
+        question.upper(),
+        "  " + re.sub(r" ", "  ", question) + " ",
+        bare,
+        "Please " + question[0].lower() + question[1:],
+        re.sub(r"\b(\w+)\((\w)\)", r"\1 \2", question),  # sin(x) -> sin x
+        re.sub(r"\s*([+*/^=-])\s*", r"\1", question),  # no operator spacing
+        question.replace("pi", "π").replace("*", "×"),
+    ]
+
+
+def replay(stream, key_fn):
+    seen = set()
+    hits = 0
+    for query in stream:
+        key = key_fn(query)
+        if key in seen:
+            hits += 1
+        seen.add(key)
+    return hits, len(seen)
+
+
+def main():
+    groups = {}
+    for question in load_questions():
+        variants = mechanical_variants(question) + EXTRA_PHRASINGS.get(question, [])
+        groups[question] = list(dict.fromkeys(variants))
+    for question, extra in EXTRA_PHRASINGS.items():
+        groups.setdefault(question, [question] + extra)
+
+    stream = [variant for variants in groups.values() for variant in variants]
+
+    # Some groups are the same question too (the README asks the sin(x) integral twice),
+    # so a perfect key may end up with fewer keys than groups.
+    print(f"{len(groups)} question groups, {len(stream)} phrasings\n")
+    print(f"{'key':<28}{'hits':>6}{'hit rate':>10}{'keys':>6}{'us/key':>8}")
+    for name, key_fn in [
+        ("normalize_key", normalize_key),
+        ("canonicalize", canonicalize),
+        ("canonicalize (rename vars)", lambda q: canonicalize(q, rename_variables=True)),
+    ]:
+        start = time.perf_counter()
+        for _ in range(20):
+            for query in stream:
+                key_fn(query)
+        per_key = (time.perf_counter() - start) / (20 * len(stream)) * 1e6
+        hits, keys = replay(stream, key_fn)
+        print(f"{name:<28}{hits:>6}{hits / len(stream):>10.1%}{keys:>6}{per_key:>8.1f}")
+
+    misses = {
+        question: sorted({canonicalize(v) for v in variants})
+        for question, variants in groups.items()
+    }
+    misses = {question: keys for question, keys in misses.items() if len(keys) > 1}
+    print(f"\nGroups with more than one canonical key: {len(misses)}")
+    for question, keys in misses.items():
+        print(f"  {question!r}: {keys}")
+
+    same = {frozenset(pair) for pair in SAME_QUESTION}
+    keys = {question: canonicalize(question) for question in groups}
+    collisions = [(a, b, keys[a]) for i, a in enumerate(groups) for b in list(groups)[i + 1:]
+                  if keys[a] == keys[b] and frozenset((a, b)) not in same]
+    for questions in DISTINCT_QUESTIONS:
+        collisions += [(a, b, canonicalize(a)) for i, a in enumerate(questions) for b in questions[i + 1:]
+                       if canonicalize(a) == canonicalize(b)]
+    print(f"\nDifferent questions sharing a canonical key: {len(collisions)}")
+    for a, b, key in collisions:
+        print(f"  {a!r} and {b!r}: {key!r}")
+    if collisions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
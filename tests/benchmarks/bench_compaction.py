@@ -0,0 +1,100 @@
+"""
+Prompt size per turn over a long tutoring session, with and without history
+compaction (tutor_agent/compaction.py).
+
+Runs the real tutor agent graph with scripted stand-in models
+(scripted_llm.py): every turn the orchestrator calls mardi_agent, which
+answers with a large formula payload, and then answers the user. The
+script records the estimated tokens of every root model request, which is
+what the Gemini call would be billed for and what its latency grows with.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_compaction.py [--turns 40] [--budget 8000]
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+os.environ["ERIK_MCP_TRANSPORT"] = "inprocess"
+os.environ["ERIK_SPECIALIST_MODE"] = "tools"
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from scripted_llm import ScriptedLlm, call_response, text_response
+from tutor_agent import agent, compaction
+
+# About 6 KB of formula JSON, like a mardi_query result for a well-covered concept
+FORMULAS = json.dumps([{"id": f"Q{6000 + i}", "label": f"Gamma function identity {i}",
+                        "formula": r"\Gamma(z+1) = z \Gamma(z), \quad \Gamma(z)\Gamma(1-z) = \frac{\pi}{\sin(\pi z)}",
+                        "description": "functional equation and reflection formula of the gamma function"}
+                       for i in range(30)], indent=2)
+ANSWER = "Here is the definition, the recurrence and the reflection formula, step by step. " * 8
+
+
+def root_script(prompt_tokens):
+    def script(llm_request):
+        prompt_tokens.append(compaction.estimate_tokens(llm_request.contents))
+        last = llm_request.contents[-1]
+        if any(part.function_response for part in last.parts or []):
+            return text_response(ANSWER)
+        return call_response(("mardi_agent", {"request": "Gamma function identities"}))
+    return script
+
+
+async def session(turns):
+    runner = InMemoryRunner(agent=agent.root_agent, app_name="bench_compaction")
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    elapsed = []
+    for turn in range(turns):
+        message = types.Content(role="user", parts=[types.Part.from_text(
+            text=f"Question {turn + 1}: show me identities of the Gamma function")])
+        start = time.perf_counter()
+        async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            pass
+        elapsed.append(time.perf_counter() - start)
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--turns", type=int, default=40, help="turns in the session")
+    parser.add_argument("--budget", type=int, default=compaction.HISTORY_TOKEN_BUDGET, help="history token budget")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    compaction.HISTORY_TOKEN_BUDGET = args.budget
+    mardi = next(a for a in agent.specialists if a.name == "mardi_agent")
+    mardi.model = ScriptedLlm(script=lambda _: text_response(FORMULAS))
+
+    checkpoints = sorted({1, args.turns // 4, args.turns // 2, args.turns * 3 // 4, args.turns} - {0})
+    print(f"estimated tokens of the orchestrator's request to the model, by turn (budget {args.budget})\n")
+    print(f"{'compaction':<12}" + "".join(f"{'turn ' + str(t):>10}" for t in checkpoints) + f"{'total':>12}")
+    for enabled in (False, True):
+        compaction.COMPACTION_ENABLED = enabled
+        compaction.COMPACTION_STATS.clear()
+        prompt_tokens = []
+        agent.root_agent.model = ScriptedLlm(script=root_script(prompt_tokens))
+        asyncio.run(session(args.turns))
+        # Two root requests per turn; the second carries this turn's tool result
+        per_turn = prompt_tokens[1::2]
+        print(f"{'on' if enabled else 'off':<12}" + "".join(f"{per_turn[t - 1]:>10}" for t in checkpoints)
+              + f"{sum(prompt_tokens):>12}")
+    stats = compaction.COMPACTION_STATS
+    print(f"\nreport: {stats['requests']} requests, {stats['compacted']} compacted, "
+          f"{stats['results_referenced']} results referenced, {stats['turns_dropped']} turns dropped, "
+          f"~{compaction.tokens_saved()} tokens saved")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""
+Answer time under an overloaded or stalling model, with the old retry policy
+and with the request's time budget (tutor_agent/budget.py).
+
+Runs the real tutor agent graph (tutor_agent/agent.py) with scripted models
+(scripted_llm.py): each question is root -> one specialist -> root, three
+model calls, in a new session. Two kinds of trouble:
+
+    overloaded    --error-rate of the model calls fail with 503
+    slow tail     --tail-rate of the model calls take --tail-latency seconds
+
+and three policies:
+
+    exp_base=7    the old retry_config, as the API client applied it: up to
+                  5 attempts, waits of about 1, 7, 49 and 60 s, no deadline
+    budget        capped, jittered retries within ERIK_REQUEST_BUDGET; a
+                  specialist out of time is answered around
+    budget+hedge  the same, and a call with no answer after --hedge-after
+                  seconds is sent a second time (ERIK_HEDGE_AFTER)
+
+"answered" counts complete answers, "degraded" answers given without a
+specialist that ran out of time, "failed" runs that ended in an error.
+
+All latencies, waits and budgets run --scale times faster; times are
+reported in unscaled seconds.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_deadline.py [--questions 40] [--budget 60] [--scale 0.05]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# No tool servers needed: the scripted specialists answer without tool calls
+os.environ["ERIK_MCP_TRANSPORT"] = "inprocess"
+os.environ["ERIK_SPECIALIST_MODE"] = "tools"
+os.environ["ERIK_ANSWER_CACHE"] = "0"
+
+import tenacity
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+from google.genai._api_client import retry_args
+
+from scripted_llm import ScriptedLlm, call_response, function_responses, text_response
+from tutor_agent import agent, budget
+import deadline
+
+# The retry_config the three agent modules shared before the time budget
+OLD_RETRY = types.HttpRetryOptions(attempts=5, exp_base=7, initial_delay=1, http_status_codes=[429, 500, 503, 504])
+
+QUESTIONS = [
+    "Solve x^2 + 5x + 6 = 0",
+    "What is the definition of the Gamma function?",
+    "Integrate sin(x) from 0 to pi",
+    "Evaluate (3+4)*5^2/7 step by step",
+]
+SPECIALIST = {
+    "Solve": "wolfram_agent",
+    "definition": "mardi_agent",
+    "Integrate": "wolfram_agent",
+    "Evaluate": "calculator_agent",
+}
+
+SCALE = 0.05
+
+
+class GenaiRetryLlm(ScriptedLlm):
+    """ScriptedLlm retried the way the API client retried under OLD_RETRY (waits scaled)."""
+
+    async def generate_content_async(self, llm_request, stream=False):
+        async def call():
+            return [response async for response in super(GenaiRetryLlm, self).generate_content_async(llm_request, stream)]
+
+        retrying = tenacity.AsyncRetrying(**retry_args(OLD_RETRY), sleep=lambda seconds: asyncio.sleep(seconds * SCALE))
+        for response in await retrying(call):
+            yield response
+
+
+class BudgetedScriptedLlm(budget.BudgetedLlm, ScriptedLlm):
+    """ScriptedLlm with BudgetedGemini's retries and hedging."""
+
+
+def root_script(llm_request):
+    responses = function_responses(llm_request)
+    if responses:
+        if any(budget.DEADLINE_EXCEEDED_KEY in (response.response or {}) for response in responses):
+            return text_response("Here is what I can say without the specialist.")
+        return text_response("Here is the answer, step by step.")
+    question = llm_request.contents[-1].parts[0].text
+    name = next(name for word, name in SPECIALIST.items() if word in question)
+    return call_response((name, {"request": question}))
+
+
+def install(policy, trouble, args):
+    """Gives every agent a scripted model with `trouble`, retried under `policy`."""
+    model_class = GenaiRetryLlm if policy == "exp_base=7" else BudgetedScriptedLlm
+    options = {"error_rate": args.error_rate} if trouble == "overloaded" else {
+        "tail_rate": args.tail_rate, "tail_latency": args.tail_latency * SCALE}
+    for seed, specialist in enumerate(agent.specialists):
+        specialist.model = model_class(script=lambda _: text_response("done"), latency=args.specialist_latency * SCALE,
+                                       seed=seed, **options)
+    agent.root_agent.model = model_class(script=root_script, latency=args.root_latency * SCALE, seed=99, **options)
+    deadline.REQUEST_BUDGET_SECONDS = 0 if policy == "exp_base=7" else args.budget * SCALE
+    deadline.HEDGE_AFTER_SECONDS = args.hedge_after * SCALE if policy == "budget+hedge" else 0
+
+
+async def ask(runner, question):
+    """Asks `question` in a new session; returns unscaled seconds and the outcome."""
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    message = types.Content(role="user", parts=[types.Part.from_text(text=question)])
+    start = time.perf_counter()
+    degraded = answered = False
+    try:
+        async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+            degraded |= any(budget.DEADLINE_EXCEEDED_KEY in (response.response or {})
+                            for response in event.get_function_responses())
+            answered |= bool(event.is_final_response() and event.content and event.content.parts)
+    except Exception:
+        answered = False
+    outcome = "failed" if not answered else "degraded" if degraded else "answered"
+    return (time.perf_counter() - start) / SCALE, outcome
+
+
+async def ask_all(runner, questions):
+    return [await ask(runner, question) for question in questions]
+
+
+def main():
+    global SCALE
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--questions", type=int, default=40, help="questions per policy and trouble")
+    parser.add_argument("--budget", type=float, default=60.0, help="request budget, seconds")
+    parser.add_argument("--root-latency", type=float, default=1.0, help="seconds per root model call")
+    parser.add_argument("--specialist-latency", type=float, default=1.5, help="seconds per specialist model call")
+    parser.add_argument("--error-rate", type=float, default=0.3, help="fraction of overloaded calls failing with 503")
+    parser.add_argument("--tail-rate", type=float, default=0.1, help="fraction of calls that stall")
+    parser.add_argument("--tail-latency", type=float, default=120.0, help="seconds a stalled call takes")
+    parser.add_argument("--hedge-after", type=float, default=4.0, help="seconds before a call is hedged")
+    parser.add_argument("--scale", type=float, default=SCALE, help="time scale of the run")
+    args = parser.parse_args()
+    SCALE = args.scale
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    # The budgeted retries' waits, scaled like everything else
+    budget.retry_config = types.HttpRetryOptions(
+        attempts=deadline.RETRY_ATTEMPTS,
+        initial_delay=deadline.RETRY_INITIAL_DELAY_SECONDS * SCALE,
+        max_delay=deadline.RETRY_MAX_DELAY_SECONDS * SCALE,
+        exp_base=deadline.RETRY_EXP_BASE,
+        http_status_codes=budget.RETRY_STATUS_CODES,
+    )
+    deadline.SYNTHESIS_RESERVE_SECONDS *= SCALE
+    runner = InMemoryRunner(agent=agent.root_agent, app_name="bench_deadline")
+
+    print(f"{'trouble':<12}{'policy':<14}{'p50 s':>8}{'p95 s':>8}{'max s':>8}"
+          f"{'answered':>10}{'degraded':>10}{'failed':>8}")
+    for trouble in ("overloaded", "slow tail"):
+        for policy in ("exp_base=7", "budget", "budget+hedge"):
+            install(policy, trouble, args)
+            results = asyncio.run(ask_all(runner, [QUESTIONS[i % len(QUESTIONS)] for i in range(args.questions)]))
+            seconds = sorted(result[0] for result in results)
+            outcomes = [result[1] for result in results]
+            p95 = seconds[min(len(seconds) - 1, int(len(seconds) * 0.95))]
+            print(f"{trouble:<12}{policy:<14}{statistics.median(seconds):>8.1f}{p95:>8.1f}{seconds[-1]:>8.1f}"
+                  f"{outcomes.count('answered'):>10}{outcomes.count('degraded'):>10}{outcomes.count('failed'):>8}")
+
+    print(f"\nbudget.BUDGET_STATS: {dict(budget.BUDGET_STATS)}")
+
+
+if __name__ == "__main__":
+    main()
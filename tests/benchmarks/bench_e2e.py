@@ -0,0 +1,237 @@
+"""
+End-to-end latency and throughput of the tutor agent, fully offline.
+
+Runs the real root_agent graph (fast path, compaction, specialists as
+AgentTools) and the real mcp_tool_chest tools against local stand-ins:
+
+    Gemini            scripted models (scripted_llm.py) for the root agent and
+                      each specialist; each specialist calls its real tool once
+    Wolfram LLM API   WolframStandIn   (WOLFRAM_API_URL)
+    MaRDI             MaRDIStandIn     (MARDI_API_URL, MARDI_SPARQL_URL)
+    web search        SearchStandIn    (WEB_SEARCH_URL)
+
+Each stand-in has its own latency and error injection. A weighted mix of
+representative questions (arithmetic on the fast path, a definition, a
+solve, current information and a multi-part question that fans out to
+three specialists) is asked at a fixed concurrency, each question in a new
+session. Reports p50/p95/p99 latency overall and per category, queries
+per second, and failed queries.
+
+Model errors are 503s raised by the scripted model after its latency. The
+scripted models retry them like the agents' BudgetedGemini does (capped,
+jittered backoff within the question's ERIK_REQUEST_BUDGET, see
+tutor_agent/budget.py), so they show up as latency, and as failed queries
+only once the retries or the budget run out. Tool-service errors are retried or reported by the
+tools themselves, so they show up as latency and as degraded answers.
+
+The tool caches and the local MaRDI index are off (every question reaches
+the stand-ins) unless --caches is given; they then use a temporary cache
+directory.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_e2e.py [--queries 100] [--concurrency 8] [--transport stdio|inprocess]
+        [--model-latency 0.3] [--model-error-rate 0.0] [--tool-latency 0.1] [--tool-error-rate 0.0]
+        [--caches]
+"""
+import argparse
+import asyncio
+import logging
+import math
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from stand_ins import MaRDIStandIn, SearchStandIn, WolframStandIn
+
+# (category, weight, question, specialist calls the root model makes)
+QUESTION_MIX = [
+    ("arithmetic", 3, "What is 22 * 100?", []),
+    ("definition", 2, "What is the definition of the Gamma function?",
+     [("mardi_agent", "gamma function")]),
+    ("solve", 2, "Solve x^2 + 5x + 6 = 0",
+     [("wolfram_agent", "solve x^2 + 5x + 6 = 0")]),
+    ("current", 1, "What is the weather in Berlin today?",
+     [("web_search_agent", "weather in Berlin today")]),
+    ("multi-part", 2, "Define the Gamma function, compute Gamma(5.5) and 17 * 23.",
+     [("mardi_agent", "gamma function"), ("wolfram_agent", "Gamma(5.5)"), ("calculator_agent", "17 * 23")]),
+]
+CALLS = {question: calls for _, _, question, calls in QUESTION_MIX}
+
+# The real tool each scripted specialist calls with its request
+SPECIALIST_TOOLS = {
+    "wolfram_agent": ("wolfram_query", "query"),
+    "mardi_agent": ("mardi_query", "concept"),
+    "calculator_agent": ("evaluate_expression", "expression"),
+    "web_search_agent": ("web_search", "query"),
+}
+
+
+def configure_environment(args, wolfram, mardi, search):
+    """Points the tools at the stand-ins; must run before tutor_agent is imported."""
+    os.environ.update({
+        "ERIK_MCP_TRANSPORT": args.transport,
+        "ERIK_SPECIALIST_MODE": "tools",
+        "WOLFRAM_API_URL": wolfram.api_url,
+        "WOLFRAM_API_KEY": "bench",
+        "MARDI_API_URL": mardi.api_url,
+        "MARDI_SPARQL_URL": mardi.sparql_url,
+        "WEB_SEARCH_URL": search.search_url,
+        "ERIK_CACHE_DIR": tempfile.mkdtemp(prefix="bench_e2e_"),
+        "MCP_LOG_LEVEL": "WARNING",
+    })
+    caches = "1" if args.caches else "0"
+    for name in ("WOLFRAM_CACHE_ENABLED", "MARDI_CACHE_ENABLED", "MARDI_INDEX_ENABLED"):
+        os.environ[name] = caches
+
+
+def install_models(agent, args):
+    from scripted_llm import ScriptedLlm, call_response, function_responses, text_response
+    from tutor_agent.budget import BudgetedLlm
+
+    class BudgetedScriptedLlm(BudgetedLlm, ScriptedLlm):
+        """ScriptedLlm with BudgetedGemini's retries, as the agents' models have."""
+
+    def root_script(llm_request):
+        if function_responses(llm_request):
+            return text_response("Here is the answer, put together from the specialists.")
+        question = next(part.text for content in llm_request.contents if content.role == "user"
+                        for part in content.parts or [] if part.text)
+        return call_response(*[(name, {"request": request}) for name, request in CALLS[question]])
+
+    def specialist_script(tool, argument):
+        def script(llm_request):
+            responses = function_responses(llm_request)
+            if responses:
+                return text_response(str(responses[-1].response)[:500])
+            request = next(part.text for content in llm_request.contents if content.role == "user"
+                           for part in content.parts or [] if part.text)
+            return call_response((tool, {argument: request}))
+        return script
+
+    models = [BudgetedScriptedLlm(script=root_script, latency=args.model_latency,
+                                  error_rate=args.model_error_rate, seed=args.seed)]
+    agent.root_agent.model = models[0]
+    for specialist in agent.specialists:
+        tool, argument = SPECIALIST_TOOLS[specialist.name]
+        specialist.model = BudgetedScriptedLlm(script=specialist_script(tool, argument), latency=args.model_latency,
+                                               error_rate=args.model_error_rate, seed=args.seed + len(models))
+        models.append(specialist.model)
+    return models
+
+
+async def ask(runner, question):
+    from google.genai import types
+
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    message = types.Content(role="user", parts=[types.Part.from_text(text=question)])
+    start = time.perf_counter()
+    answer = ""
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        if event.is_final_response() and event.content and event.content.parts:
+            answer = event.content.parts[0].text or ""
+    return time.perf_counter() - start, answer
+
+
+async def run_load(runner, questions, concurrency):
+    """Asks the questions with at most `concurrency` in flight; returns (category, seconds or None) and wall time."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(category, question):
+        async with semaphore:
+            try:
+                seconds, _ = await ask(runner, question)
+                return category, seconds
+            except Exception:
+                return category, None
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(one(category, question) for category, question in questions))
+    return results, time.perf_counter() - start
+
+
+def percentile(values, q):
+    """Nearest-rank percentile (q in 0..100)."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, max(0, math.ceil(q / 100 * len(ordered)) - 1))]
+
+
+def report_row(label, timings, failed):
+    ms = [t * 1000 for t in timings]
+    if not ms:
+        return f"{label:<14}{0:>6}{failed:>8}" + f"{'-':>10}" * 4
+    return (f"{label:<14}{len(ms):>6}{failed:>8}{percentile(ms, 50):>10.0f}{percentile(ms, 95):>10.0f}"
+            f"{percentile(ms, 99):>10.0f}{statistics.mean(ms):>10.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--queries", type=int, default=100, help="questions to ask (after warmup)")
+    parser.add_argument("--concurrency", type=int, default=8, help="questions in flight at once")
+    parser.add_argument("--warmup", type=int, default=len(QUESTION_MIX), help="unmeasured questions first")
+    parser.add_argument("--transport", choices=("stdio", "inprocess"), default="stdio",
+                        help="how the agents reach the tool chest (ERIK_MCP_TRANSPORT)")
+    parser.add_argument("--model-latency", type=float, default=0.3, help="seconds per model call")
+    parser.add_argument("--model-error-rate", type=float, default=0.0, help="fraction of model calls failing with 503")
+    parser.add_argument("--tool-latency", type=float, default=0.1, help="seconds per stand-in service request")
+    parser.add_argument("--tool-error-rate", type=float, default=0.0,
+                        help="fraction of stand-in service requests answered with 503")
+    parser.add_argument("--caches", action="store_true", help="keep the tool caches and the local MaRDI index on")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    stand_in_options = dict(latency=args.tool_latency, error_rate=args.tool_error_rate)
+    with WolframStandIn(seed=args.seed, **stand_in_options) as wolfram, \
+            MaRDIStandIn(seed=args.seed + 1, **stand_in_options) as mardi, \
+            SearchStandIn(seed=args.seed + 2, **stand_in_options) as search:
+        configure_environment(args, wolfram, mardi, search)
+        from google.adk.runners import InMemoryRunner
+        from tutor_agent import agent
+
+        models = install_models(agent, args)
+        runner = InMemoryRunner(agent=agent.root_agent, app_name="bench_e2e")
+
+        mix = random.Random(args.seed)
+        categories = [(category, question) for category, _, question, _ in QUESTION_MIX]
+        weights = [weight for _, weight, _, _ in QUESTION_MIX]
+        questions = mix.choices(categories, weights=weights, k=args.queries)
+
+        async def run():
+            # Warm up: tool server start, MCP sessions, pooled connections
+            await run_load(runner, categories[:args.warmup], 1)
+            for model in models:
+                model.calls = model.errors = 0
+            for stand_in in (wolfram, mardi, search):
+                stand_in.requests = stand_in.errors = 0
+            return await run_load(runner, questions, args.concurrency)
+
+        results, wall = asyncio.run(run())
+
+    print(f"{args.queries} questions at concurrency {args.concurrency}, transport {args.transport}, "
+          f"model {args.model_latency * 1000:.0f} ms (errors {args.model_error_rate:.0%}), "
+          f"tools {args.tool_latency * 1000:.0f} ms (errors {args.tool_error_rate:.0%}), "
+          f"caches {'on' if args.caches else 'off'}\n")
+    print(f"{'category':<14}{'ok':>6}{'failed':>8}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}")
+    for category, _, _, _ in QUESTION_MIX:
+        timings = [t for c, t in results if c == category and t is not None]
+        failed = sum(1 for c, t in results if c == category and t is None)
+        print(report_row(category, timings, failed))
+    timings = [t for _, t in results if t is not None]
+    print(report_row("all", timings, len(results) - len(timings)))
+    print(f"\nthroughput {len(timings) / wall:.1f} queries/s ({wall:.1f} s wall)")
+    print(f"model calls {sum(m.calls for m in models)} (503s {sum(m.errors for m in models)}), "
+          f"service requests wolfram {wolfram.requests} / mardi {mardi.requests} / search {search.requests} "
+          f"(503s {wolfram.errors + mardi.errors + search.errors})")
+
+
+if __name__ == "__main__":
+    main()
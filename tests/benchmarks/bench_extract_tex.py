@@ -0,0 +1,97 @@
+"""
+Micro-benchmark of MaRDIClient._extract_tex over a corpus of MaRDI MathML.
+
+Times the precompiled single-pass extraction against the previous
+implementation (per-call regexes, chained replaces, quadratic brace loop and
+the `replace('}}', '')` applied afterwards by filter_formulas_for_agent) and
+reports where the two disagree, since the old `}}` stripping also broke valid
+TeX such as `\\frac{1}{n^{s}}`.
+
+The bundled corpus (data/mardi_mathml.jsonl, one JSON string per line) is
+MediaWiki Math output as served in MaRDI's `wdt:P15` values; point --corpus
+at a fresh dump to benchmark other data.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_extract_tex.py [--corpus FILE] [--repeat 200]
+"""
+import argparse
+import html
+import json
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+
+from mardi_search import MaRDIClient
+
+DEFAULT_CORPUS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "mardi_mathml.jsonl")
+
+
+def legacy_extract_tex(math_ml_string):
+    """The implementation before precompilation, including the `}}` post-processing."""
+    if not math_ml_string or not isinstance(math_ml_string, str):
+        return ""
+    patterns = [
+        r'<annotation encoding="application/x-tex"[^>]*>(.*?)</annotation>',
+        r'<annotation encoding="application/x-latex"[^>]*>(.*?)</annotation>',
+        r'<annotation[^>]+>(.*?)</annotation>'
+    ]
+    raw_tex = ""
+    for pat in patterns:
+        match = re.search(pat, math_ml_string, re.DOTALL | re.IGNORECASE)
+        if match:
+            raw_tex = match.group(1)
+            break
+    if not raw_tex:
+        return ""
+    clean_tex = html.unescape(raw_tex).strip()
+    for artifact in [r"{\displaystyle", r"{\textstyle", r"\displaystyle", r"\textstyle"]:
+        clean_tex = clean_tex.replace(artifact, "")
+    while clean_tex.count('}') > clean_tex.count('{'):
+        if clean_tex.endswith('}'):
+            clean_tex = clean_tex[:-1]
+        else:
+            break
+    return clean_tex.strip().replace('}}', '')
+
+
+def time_per_call(func, corpus, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in corpus:
+            func(item)
+    return (time.perf_counter() - start) / (repeat * len(corpus))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", default=DEFAULT_CORPUS, help="JSONL file with one MathML string per line")
+    parser.add_argument("--repeat", type=int, default=200, help="passes over the corpus")
+    args = parser.parse_args()
+
+    with open(args.corpus, encoding="utf-8") as f:
+        corpus = [json.loads(line) for line in f if line.strip()]
+    extract_tex = MaRDIClient()._extract_tex
+
+    print(f"corpus: {len(corpus)} MathML strings, {sum(map(len, corpus)) / 1024:.0f} KiB, "
+          f"longest {max(map(len, corpus))} chars\n")
+    print(f"{'implementation':<16}{'us/call':>10}{'long expr us':>14}")
+    longest = [max(corpus, key=len)]
+    results = {}
+    for name, func in (("legacy", legacy_extract_tex), ("precompiled", extract_tex)):
+        results[name] = (time_per_call(func, corpus, args.repeat), time_per_call(func, longest, args.repeat))
+        print(f"{name:<16}{results[name][0] * 1e6:>10.1f}{results[name][1] * 1e6:>14.1f}")
+    print(f"\nspeed-up: {results['legacy'][0] / results['precompiled'][0]:.1f}x overall, "
+          f"{results['legacy'][1] / results['precompiled'][1]:.1f}x on the longest expression")
+
+    differences = [(old, new) for old, new in ((legacy_extract_tex(m), extract_tex(m)) for m in corpus) if old != new]
+    print(f"\n{len(differences)} of {len(corpus)} outputs differ from the legacy implementation")
+    for old, new in differences[:5]:
+        print(f"  legacy:      {old[:90]}\n  precompiled: {new[:90]}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Latency of a multi-specialist question: parallel fan-out vs. one call per turn.
+
+Runs the real tutor agent graph (tutor_agent/agent.py, specialists as
+AgentTools) on "Define the Gamma function, compute Γ(5.5) and 17 * 23" with
+scripted stand-in models (scripted_llm.py) in place of Gemini:
+
+    parallel   - the root model calls mardi_agent, wolfram_agent and
+                 calculator_agent in one turn; ADK runs them concurrently
+    sequential - the root model calls one specialist per turn, as it has to
+                 when transferring to sub-agents
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_fanout.py [--runs 5] [--root-latency 0.3] [--specialist-latency 0.8]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+# No tool servers needed: the scripted specialists answer without tool calls
+os.environ["ERIK_MCP_TRANSPORT"] = "inprocess"
+os.environ["ERIK_SPECIALIST_MODE"] = "tools"
+
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from scripted_llm import ScriptedLlm, call_response, function_responses, text_response
+from tutor_agent import agent
+
+QUESTION = "Define the Gamma function, compute Gamma(5.5) and 17 * 23."
+CALLS = [
+    ("mardi_agent", {"request": "Definition of the Gamma function"}),
+    ("wolfram_agent", {"request": "Gamma(5.5)"}),
+    ("calculator_agent", {"request": "17 * 23"}),
+]
+ANSWERS = {
+    "mardi_agent": "Gamma(z) = integral_0^inf t^(z-1) e^(-t) dt",
+    "wolfram_agent": "Gamma(5.5) = 52.3428",
+    "calculator_agent": "17 * 23 = 391",
+}
+
+
+def root_script(parallel):
+    def script(llm_request):
+        done = len(function_responses(llm_request))
+        if done == len(CALLS):
+            return text_response("Here is everything together.")
+        return call_response(*CALLS) if parallel else call_response(CALLS[done])
+    return script
+
+
+async def ask(runner):
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    message = types.Content(role="user", parts=[types.Part.from_text(text=QUESTION)])
+    start = time.perf_counter()
+    async for _ in runner.run_async(user_id="bench", session_id=session.id, new_message=message):
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5, help="questions per mode")
+    parser.add_argument("--root-latency", type=float, default=0.3, help="seconds per root model call")
+    parser.add_argument("--specialist-latency", type=float, default=0.8, help="seconds per specialist model call")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    for specialist in agent.specialists:
+        answer = ANSWERS.get(specialist.name, "")
+        specialist.model = ScriptedLlm(script=lambda _, answer=answer: text_response(answer),
+                                       latency=args.specialist_latency)
+
+    print(f"{len(CALLS)} specialists, root call {args.root_latency * 1000:.0f} ms, "
+          f"specialist call {args.specialist_latency * 1000:.0f} ms, median of {args.runs}\n")
+    print(f"{'mode':<12}{'root calls':>12}{'latency ms':>12}")
+    for mode in ("parallel", "sequential"):
+        root_model = ScriptedLlm(script=root_script(mode == "parallel"), latency=args.root_latency)
+        agent.root_agent.model = root_model
+        runner = InMemoryRunner(agent=agent.root_agent, app_name="bench_fanout")
+        timings = [asyncio.run(ask(runner)) for _ in range(args.runs)]
+        print(f"{mode:<12}{root_model.calls // args.runs:>12}{statistics.median(timings) * 1000:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
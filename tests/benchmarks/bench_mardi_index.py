@@ -0,0 +1,88 @@
+"""
+Latency of MaRDI concept lookups: local SQLite/FTS5 index vs. remote SPARQL.
+
+Builds a throwaway index from the local MaRDI stand-in, then times exact
+hits, partial hits ("zeta function" -> "riemann zeta function"), full-text
+searches, queries too vague to serve from the index ("gamma", "function")
+and misses against the index, and the same concepts against the stand-in with
+a fixed per-request latency.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_mardi_index.py [--latency 0.05] [--rounds 2000]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mardi_index import MaRDIIndex
+from mardi_search import MaRDIClient
+from stand_ins import MARDI_CONCEPTS, MaRDIStandIn
+
+WORKLOADS = {
+    "exact hit": ("lookup", ["gamma function", "the Beta function", "Riemann zeta function", "Bessel function"]),
+    "partial hit": ("lookup", ["Gamma functions", "zeta function", "riemann zeta", "Bessel functions"]),
+    "full-text": ("search", ["reflection formula", "euler product", "definition", "bound"]),
+    "too vague": ("lookup", ["gamma", "zeta", "function", "functions"]),
+    "miss": ("lookup", ["lambert w function", "airy function", "polylogarithm", "hermite polynomial"]),
+}
+# Workloads that must fall through to the live lookup
+MISSES = ("too vague", "miss")
+
+
+def percentile(ms, q):
+    return statistics.quantiles(ms, n=100)[q - 1] if len(ms) > 1 else ms[0]
+
+
+def report(name, timings):
+    ms = [t * 1000 for t in timings]
+    print(f"{name:<16}{statistics.median(ms):>10.3f}{percentile(ms, 95):>10.3f}{percentile(ms, 99):>10.3f}")
+
+
+async def time_remote(client, rounds):
+    concepts = list(MARDI_CONCEPTS)
+    await client.formulas_for_agent(concepts[0])
+    timings = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        await client.formulas_for_agent(concepts[i % len(concepts)])
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in latency per request (s)")
+    parser.add_argument("--rounds", type=int, default=2000, help="index lookups per workload")
+    parser.add_argument("--remote-rounds", type=int, default=20, help="remote lookups")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp, MaRDIStandIn(latency=args.latency) as stand_in:
+        client = MaRDIClient(sparql_url=stand_in.sparql_url, api_url=stand_in.api_url, lookup_mode="single")
+        index = MaRDIIndex(os.path.join(tmp, "mardi_index.sqlite3"))
+        counts = asyncio.run(index.refresh(client, list(MARDI_CONCEPTS)))
+        print(f"index: {len(counts)} concepts, {sum(counts.values())} formulas; "
+              f"stand-in latency {args.latency * 1000:.0f} ms/request\n")
+
+        print(f"{'lookup':<16}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+        for name, (method, queries) in WORKLOADS.items():
+            call = getattr(index, method)
+            timings = []
+            for i in range(args.rounds):
+                start = time.perf_counter()
+                result = call(queries[i % len(queries)])
+                timings.append(time.perf_counter() - start)
+                assert bool(result) == (name not in MISSES), f"unexpected result for {queries[i % len(queries)]!r}"
+            report(f"index {name}", timings)
+        report("remote SPARQL", asyncio.run(time_remote(client, args.remote_rounds)))
+
+
+if __name__ == "__main__":
+    main()
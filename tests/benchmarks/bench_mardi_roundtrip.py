@@ -0,0 +1,70 @@
+"""
+Latency of MaRDI concept lookups: two-step (wbsearchentities + SPARQL) vs.
+single SPARQL query with in-query entity search.
+
+Runs MaRDIClient against the local MaRDI stand-in with a fixed per-request
+latency, so the difference is the saved round-trip.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_mardi_roundtrip.py [--latency 0.05] [--rounds 20]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mardi_search import MaRDIClient
+from stand_ins import MaRDIStandIn
+
+CONCEPTS = ["gamma function", "beta function", "riemann zeta function", "bessel function"]
+
+
+async def run_mode(stand_in, mode, rounds):
+    client = MaRDIClient(sparql_url=stand_in.sparql_url, api_url=stand_in.api_url, lookup_mode=mode)
+    # Warm up the pooled connections so only request latency is measured
+    await client.filter_formulas_for_agent(CONCEPTS[0])
+    requests_before = stand_in.requests
+    timings = []
+    for i in range(rounds):
+        start = time.perf_counter()
+        result = await client.filter_formulas_for_agent(CONCEPTS[i % len(CONCEPTS)])
+        timings.append(time.perf_counter() - start)
+        assert result != "[]", f"{mode} lookup returned nothing"
+    return timings, (stand_in.requests - requests_before) / rounds
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--latency", type=float, default=0.05, help="stand-in latency per request (s)")
+    parser.add_argument("--rounds", type=int, default=20)
+    args = parser.parse_args()
+    # The "auto" run logs its (expected) fallback warning otherwise
+    logging.basicConfig(level=logging.ERROR)
+
+    print(f"stand-in latency {args.latency * 1000:.0f} ms/request, {args.rounds} lookups per mode\n")
+    print(f"{'mode':<10}{'requests':>10}{'p50 ms':>10}{'mean ms':>10}{'max ms':>10}")
+    with MaRDIStandIn(latency=args.latency) as stand_in:
+        for mode in ("two_step", "single"):
+            timings, per_lookup = asyncio.run(run_mode(stand_in, mode, args.rounds))
+            ms = [t * 1000 for t in timings]
+            print(f"{mode:<10}{per_lookup:>10.1f}{statistics.median(ms):>10.1f}"
+                  f"{statistics.mean(ms):>10.1f}{max(ms):>10.1f}")
+
+    # "auto" against an endpoint without mwapi: one failed attempt, then two-step for good
+    with MaRDIStandIn(latency=args.latency, support_mwapi=False) as stand_in:
+        client = MaRDIClient(sparql_url=stand_in.sparql_url, api_url=stand_in.api_url, lookup_mode="auto")
+        for concept in CONCEPTS:
+            assert asyncio.run(client.filter_formulas_for_agent(concept)) != "[]"
+        print(f"\nauto without mwapi support: {stand_in.requests} requests for {len(CONCEPTS)} lookups "
+              f"(mode is now {client.lookup_mode!r})")
+
+
+if __name__ == "__main__":
+    main()
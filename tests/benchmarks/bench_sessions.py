@@ -0,0 +1,82 @@
+"""
+Session-store memory and throughput under sustained traffic.
+
+Simulates a long-running server: a stream of new conversations, each a few
+user/model turns, through ADK's InMemorySessionService and through
+tutor_agent.sessions.SQLiteSessionService (temporary database file). Prints
+the traced Python heap as traffic accumulates, and the cost per appended
+event.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_sessions.py [--sessions 5000] [--turns 4] [--cache-size 256]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from google.adk.events.event import Event
+from google.adk.sessions import InMemorySessionService
+from google.genai import types
+
+from tutor_agent.sessions import SQLiteSessionService
+
+QUESTION = "Define the Gamma function and compute Gamma(5.5). " * 3
+ANSWER = "The Gamma function extends the factorial: Gamma(z) = integral_0^inf t^(z-1) e^(-t) dt. " * 6
+
+
+def event(author, text):
+    role = "user" if author == "user" else "model"
+    return Event(author=author, content=types.Content(role=role, parts=[types.Part.from_text(text=text)]))
+
+
+async def traffic(service, sessions, turns, checkpoints):
+    heap, appended, elapsed = [], 0, 0.0
+    for i in range(sessions):
+        session = await service.create_session(app_name="bench", user_id=f"user{i % 100}")
+        for _ in range(turns):
+            start = time.perf_counter()
+            # What the Runner does per turn: fetch the session, append the question and the answer
+            session = await service.get_session(app_name="bench", user_id=session.user_id, session_id=session.id)
+            await service.append_event(session, event("user", QUESTION))
+            await service.append_event(session, event("root_agent", ANSWER))
+            elapsed += time.perf_counter() - start
+            appended += 2
+        if i + 1 in checkpoints:
+            heap.append(tracemalloc.get_traced_memory()[0])
+    return heap, elapsed / appended
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=5000, help="conversations to simulate")
+    parser.add_argument("--turns", type=int, default=4, help="user/model turns per conversation")
+    parser.add_argument("--cache-size", type=int, default=256, help="hot-tier size of the SQLite service")
+    args = parser.parse_args()
+
+    checkpoints = [args.sessions * k // 5 for k in range(1, 6)]
+    print(f"{args.sessions} sessions x {args.turns} turns, traced heap in MB after each fifth of the traffic\n")
+    print(f"{'service':<12}" + "".join(f"{n:>9}" for n in checkpoints) + f"{'us/event':>10}")
+    with tempfile.TemporaryDirectory() as tmp:
+        services = {
+            "in-memory": InMemorySessionService(),
+            "sqlite": SQLiteSessionService(os.path.join(tmp, "sessions.sqlite3"), max_cached=args.cache_size),
+        }
+        for name, service in services.items():
+            tracemalloc.start()
+            heap, per_event = asyncio.run(traffic(service, args.sessions, args.turns, set(checkpoints)))
+            tracemalloc.stop()
+            print(f"{name:<12}" + "".join(f"{h / 2**20:>9.1f}" for h in heap) + f"{per_event * 1e6:>10.0f}")
+            if isinstance(service, SQLiteSessionService):
+                asyncio.run(service.close())
+                print(f"\nsqlite stats: {service.stats()}")
+
+
+if __name__ == "__main__":
+    main()
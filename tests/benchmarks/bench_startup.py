@@ -0,0 +1,73 @@
+"""
+Cold-start report for the tutor agent and the MCP tool servers.
+
+1. Imports tutor_agent.agent in a fresh interpreter and prints the per-component
+   timings it records (tutor_agent/startup.py), plus the wall time of the
+   whole import.
+2. Starts each stdio tool server in a fresh process and times the MCP
+   handshake (`initialize`, then `tools/list`), i.e. how long an agent
+   waits before its first tool call.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_startup.py [--runs 3]
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+TOOL_CHEST_DIR = os.path.join(ROOT, "mcp_tool_chest")
+TOOL_SERVERS = ["tool_chest.py", "calculator.py", "wolfram_tools.py", "mardi_tools.py", "duckduckgo_tools.py"]
+
+AGENT_IMPORT = """
+import time
+start = time.perf_counter()
+import tutor_agent.agent
+elapsed = time.perf_counter() - start
+from tutor_agent.startup import report
+print(report())
+print(f"{'wall time of import tutor_agent.agent':<52}{elapsed * 1000:>10.1f}")
+"""
+
+
+async def handshake(script):
+    from mcp import ClientSession, StdioServerParameters
+    from mcp.client.stdio import stdio_client
+
+    params = StdioServerParameters(
+        command=sys.executable, args=["-u", script], env={**os.environ, "MCP_LOG_LEVEL": "WARNING"}
+    )
+    start = time.perf_counter()
+    with open(os.devnull, "w") as devnull:
+        async with stdio_client(params, errlog=devnull) as (read, write):
+            async with ClientSession(read, write) as session:
+                await session.initialize()
+                initialized = time.perf_counter() - start
+                await session.list_tools()
+                listed = time.perf_counter() - start
+    return initialized, listed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="fresh processes per tool server")
+    args = parser.parse_args()
+
+    print("tutor_agent.agent import (fresh interpreter)\n")
+    result = subprocess.run([sys.executable, "-c", AGENT_IMPORT], cwd=ROOT, capture_output=True, text=True)
+    print(result.stdout if result.returncode == 0 else result.stderr)
+
+    print(f"tool-server handshake (median of {args.runs} fresh processes)\n")
+    print(f"{'server':<24}{'initialize ms':>15}{'tools/list ms':>15}")
+    for script in TOOL_SERVERS:
+        runs = [asyncio.run(handshake(os.path.join(TOOL_CHEST_DIR, script))) for _ in range(args.runs)]
+        print(f"{script:<24}{statistics.median(r[0] for r in runs) * 1000:>15.0f}"
+              f"{statistics.median(r[1] for r in runs) * 1000:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
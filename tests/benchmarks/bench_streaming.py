@@ -0,0 +1,147 @@
+"""
+Time to first token vs. time to the complete answer, with and without streaming.
+
+Runs the real tutor agent graph (tutor_agent/agent.py) with scripted models
+(scripted_llm.py) on a question that fans out to three specialists; the root
+model's answer is a long explanation that streams in chunks over its latency.
+
+    local      - Runner.run_async in the process, as the REPL does
+    a2a        - through the A2A server app (tutor_agent/streaming.py, served by
+                 uvicorn on a local port) and the a2a_client's remote agent
+
+Without streaming the first word is seen when the whole answer is there;
+with streaming, after the root model's first chunk.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_streaming.py [--runs 3] [--root-latency 2.0] [--specialist-latency 0.5]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+import statistics
+import sys
+import threading
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, "a2a_flow", "a2a_client"))
+
+# No tool servers needed: the scripted specialists answer without tool calls
+os.environ["ERIK_MCP_TRANSPORT"] = "inprocess"
+os.environ["ERIK_SPECIALIST_MODE"] = "tools"
+
+import uvicorn
+from google.adk.agents.remote_a2a_agent import AGENT_CARD_WELL_KNOWN_PATH, RemoteA2aAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.runners import InMemoryRunner
+from google.genai import types
+
+from scripted_llm import ScriptedLlm, call_response, function_responses, text_response
+from tutor_agent import agent
+from tutor_agent.streaming import to_streaming_a2a
+
+import agent as a2a_client
+
+QUESTION = "Define the Gamma function, compute Gamma(5.5) and 17 * 23, and explain each step."
+CALLS = [
+    ("mardi_agent", {"request": "Definition of the Gamma function"}),
+    ("wolfram_agent", {"request": "Gamma(5.5)"}),
+    ("calculator_agent", {"request": "17 * 23"}),
+]
+EXPLANATION = " ".join(["Step by step: the Gamma function extends the factorial, Gamma(n) = (n-1)!, "
+                        "and Gamma(5.5) = 52.3428, while 17 * 23 = 391."] * 12)
+
+
+def root_script(llm_request):
+    if function_responses(llm_request):
+        return text_response(EXPLANATION)
+    return call_response(*CALLS)
+
+
+async def timed_answer(runner, run_config=None):
+    """Seconds to the first answer text and to the complete answer."""
+    session = await runner.session_service.create_session(app_name=runner.app_name, user_id="bench")
+    message = types.Content(role="user", parts=[types.Part.from_text(text=QUESTION)])
+    start = time.perf_counter()
+    first = None
+    async for event in runner.run_async(user_id="bench", session_id=session.id, new_message=message,
+                                        run_config=run_config):
+        text = "".join(part.text or "" for part in (event.content.parts or []) if not part.thought) \
+            if event.content else ""
+        if text and first is None and (event.partial or event.is_final_response()):
+            first = time.perf_counter() - start
+    return first, time.perf_counter() - start
+
+
+async def timed_answers(runner, runs, run_config=None):
+    # One event loop for all runs: the remote agent's HTTP client is bound to it
+    return [await timed_answer(runner, run_config) for _ in range(runs)]
+
+
+def free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(port):
+    runner = InMemoryRunner(agent=agent.root_agent, app_name="bench_streaming")
+    app = to_streaming_a2a(agent.root_agent, runner=runner, host="127.0.0.1", port=port)
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        if not thread.is_alive():
+            sys.exit("The A2A server failed to start")
+        time.sleep(0.05)
+    return server
+
+
+def report(mode, timings):
+    first = statistics.median(t[0] for t in timings)
+    total = statistics.median(t[1] for t in timings)
+    print(f"{mode:<24}{first * 1000:>16.0f}{total * 1000:>12.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=3, help="questions per mode")
+    parser.add_argument("--root-latency", type=float, default=2.0,
+                        help="seconds per root model call (the answer streams over this time)")
+    parser.add_argument("--specialist-latency", type=float, default=0.5, help="seconds per specialist model call")
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+    warnings.simplefilter("ignore")
+
+    for specialist in agent.specialists:
+        specialist.model = ScriptedLlm(script=lambda _: text_response("done"), latency=args.specialist_latency)
+    agent.root_agent.model = ScriptedLlm(script=root_script, latency=args.root_latency)
+
+    print(f"root call {args.root_latency * 1000:.0f} ms ({len(EXPLANATION)} characters, 8 chunks), "
+          f"3 specialists in parallel at {args.specialist_latency * 1000:.0f} ms, median of {args.runs}\n")
+    print(f"{'mode':<24}{'first text ms':>16}{'total ms':>12}")
+    local = InMemoryRunner(agent=agent.root_agent, app_name="bench_streaming")
+    for mode, streaming in (("local", StreamingMode.NONE), ("local, streaming", StreamingMode.SSE)):
+        config = RunConfig(streaming_mode=streaming)
+        report(mode, asyncio.run(timed_answers(local, args.runs, config)))
+
+    port = free_port()
+    server = start_server(port)
+    card = f"http://127.0.0.1:{port}{AGENT_CARD_WELL_KNOWN_PATH}"
+    for mode, remote in (
+        ("a2a", RemoteA2aAgent(name="eric_tutor", agent_card=card)),
+        ("a2a, streaming", a2a_client.StreamingRemoteA2aAgent(
+            name="eric_tutor", agent_card=card, a2a_client_factory=a2a_client.eric_tutor._a2a_client_factory)),
+    ):
+        runner = InMemoryRunner(agent=remote, app_name="bench_streaming_client")
+        report(mode, asyncio.run(timed_answers(runner, args.runs)))
+    server.should_exit = True
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Per-call tool latency: in-process FunctionTools vs. the stdio tool chest.
+
+Calls the same calculator tools through the agent toolsets of
+tutor_agent/toolsets.py in each mode: "inprocess" (direct function call)
+and "stdio" (JSON-RPC over a pipe to mcp_tool_chest/tool_chest.py), and
+optionally "http" against a running streamable-HTTP tool chest.
+
+Usage (from the repository root):
+    python tests/benchmarks/bench_tool_modes.py [--rounds 500] [--http-url http://127.0.0.1:8765/mcp]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import statistics
+import sys
+import time
+import warnings
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from tutor_agent import toolsets
+
+CALLS = [
+    ("add", {"a": 2, "b": 3}),
+    ("evaluate_expression", {"expression": "(3+4)*5^2/7"}),
+    ("batch_calculate", {"operation": "x^2", "start": 1, "stop": 20}),
+]
+
+
+def percentile(values, q):
+    return statistics.quantiles(values, n=100)[q - 1]
+
+
+async def run_mode(mode, rounds, http_url=None):
+    toolsets.MCP_TRANSPORT = mode
+    if http_url:
+        toolsets.MCP_URL = http_url
+    toolsets._tool_chest = None
+    toolset = toolsets.agent_toolset("calculator_agent")
+    try:
+        tools = {tool.name: tool for tool in await toolset.get_tools()}
+        results = {}
+        for name, args in CALLS:
+            await tools[name].run_async(args=args, tool_context=None)  # warm up
+            timings = []
+            for _ in range(rounds):
+                start = time.perf_counter()
+                await tools[name].run_async(args=args, tool_context=None)
+                timings.append(time.perf_counter() - start)
+            results[name] = timings
+        return results
+    finally:
+        await toolset.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rounds", type=int, default=500, help="calls per tool and mode")
+    parser.add_argument("--http-url", help="also measure a running streamable-HTTP tool chest")
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+    # The stdio server inherits MCP_LOG_LEVEL; keep its per-request log lines quiet
+    os.environ.setdefault("MCP_LOG_LEVEL", "WARNING")
+    warnings.simplefilter("ignore")
+
+    modes = ["inprocess", "stdio"] + (["http"] if args.http_url else [])
+    print(f"{args.rounds} calls per tool\n")
+    print(f"{'mode':<11}{'tool':<22}{'p50 us':>10}{'p95 us':>10}{'mean us':>10}")
+    for mode in modes:
+        results = asyncio.run(run_mode(mode, args.rounds, args.http_url))
+        for name, timings in results.items():
+            us = [t * 1e6 for t in timings]
+            print(f"{mode:<11}{name:<22}{statistics.median(us):>10.0f}{percentile(us, 95):>10.0f}"
+                  f"{statistics.mean(us):>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+Scripted stand-in for Gemini: a model that answers from a script after a
+fixed delay, so agent flows can be timed with no network and no API keys.
+
+Kept apart from stand_ins.py because importing google.adk takes seconds:
+
+    specialist.model = ScriptedLlm(script=lambda request: text_response("391"), latency=0.8)
+"""
+import asyncio
+import random
+from typing import AsyncGenerator, Callable
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import errors, types
+from pydantic import PrivateAttr
+
+
+def function_responses(llm_request: LlmRequest) -> list[types.FunctionResponse]:
+    """All function responses in the request's conversation so far."""
+    return [part.function_response for content in llm_request.contents for part in content.parts or []
+            if part.function_response]
+
+
+def text_response(text: str) -> types.Content:
+    return types.Content(role="model", parts=[types.Part.from_text(text=text)])
+
+
+def call_response(*calls: tuple[str, dict]) -> types.Content:
+    """A model turn with one function call per (name, args) pair."""
+    return types.Content(role="model", parts=[types.Part.from_function_call(name=name, args=args)
+                                              for name, args in calls])
+
+
+class ScriptedLlm(BaseLlm):
+    """
+    A model that answers from a script after a fixed delay.
+
+    Args:
+        script: Maps the request to the model turn to return.
+        latency: Seconds each call takes, standing in for the Gemini round-trip.
+        error_rate: Fraction of calls that fail with a 503 ServerError, as
+            an overloaded Gemini endpoint does.
+        tail_rate: Fraction of calls that take tail_latency instead, as the
+            occasional stalled Gemini request does.
+        tail_latency: Seconds such a slow call takes.
+        seed: Seed for the error and tail injection, for reproducible runs.
+        stream_chunks: With stream=True (StreamingMode.SSE), text answers
+            arrive as this many partial responses spread over the latency,
+            then the complete answer, as Gemini's streaming API does.
+    """
+
+    model: str = "scripted"
+    script: Callable[[LlmRequest], types.Content]
+    latency: float = 0.0
+    error_rate: float = 0.0
+    tail_rate: float = 0.0
+    tail_latency: float = 0.0
+    seed: int = 0
+    calls: int = 0
+    errors: int = 0
+    stream_chunks: int = 8
+    _random: random.Random = PrivateAttr(default=None)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        self.calls += 1
+        content = self.script(llm_request)
+        text = "".join(part.text or "" for part in content.parts or [])
+        streamed = stream and text and all(part.text for part in content.parts)
+        chunks = self.stream_chunks if streamed else 1
+        size = -(-len(text) // chunks) if streamed else 0
+        latency = self.tail_latency if self.tail_rate and self._rng().random() < self.tail_rate else self.latency
+        for i in range(chunks):
+            await asyncio.sleep(latency / chunks)
+            if i == 0:
+                self._maybe_fail()
+            if streamed:
+                chunk = types.Content(role="model", parts=[types.Part.from_text(text=text[i * size:(i + 1) * size])])
+                yield LlmResponse(content=chunk, partial=True)
+        yield LlmResponse(content=content)
+
+    def _rng(self) -> random.Random:
+        if self._random is None:
+            self._random = random.Random(self.seed)
+        return self._random
+
+    def _maybe_fail(self) -> None:
+        if not self.error_rate:
+            return
+        if self._rng().random() < self.error_rate:
+            self.errors += 1
+            raise errors.ServerError(503, {"error": {"code": 503, "message": "The model is overloaded.",
+                                                     "status": "UNAVAILABLE"}})
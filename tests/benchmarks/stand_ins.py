@@ -0,0 +1,272 @@
+"""
+Local stand-ins for the external services the tool servers call.
+
+Each stand-in is a small threaded HTTP server with configurable latency
+and error injection, so benchmarks can run on a laptop with no network
+and no API keys:
+
+    with MaRDIStandIn(latency=0.05) as mardi:
+        client = MaRDIClient(sparql_url=mardi.sparql_url, api_url=mardi.api_url)
+"""
+import json
+import random
+import re
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+#------------------------------------------------------------------
+# Generic stand-in server
+#------------------------------------------------------------------
+class StandInServer:
+    """
+    Threaded HTTP server that dispatches GET requests by path.
+
+    Args:
+        routes: Maps a path to handler(params) -> (status, content_type, body),
+            where params is the parsed query string with single values.
+        latency: Seconds to sleep before answering each request.
+        error_rate: Fraction of requests answered with HTTP 503.
+        seed: Seed for the error injection, for reproducible runs.
+    """
+
+    def __init__(self, routes: dict, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        self.routes = routes
+        self.latency = latency
+        self.error_rate = error_rate
+        self.requests = 0
+        self.errors = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self._server.server_port}"
+
+    def _handler_class(self):
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                # Headers and body are separate writes; avoid Nagle/delayed-ACK stalls
+                self.connection.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
+            def do_GET(self):
+                parts = urlsplit(self.path)
+                params = {k: v[0] for k, v in parse_qs(parts.query).items()}
+                self._respond(*stand_in._dispatch(parts.path, params))
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                body = self.rfile.read(length).decode()
+                parts = urlsplit(self.path)
+                if self.headers.get("Content-Type", "").startswith("application/json"):
+                    params = {"json": json.loads(body or "null")}
+                else:
+                    params = {k: v[0] for k, v in parse_qs(body).items()}
+                self._respond(*stand_in._dispatch(parts.path, params))
+
+            def _respond(self, status, content_type, body):
+                data = body.encode() if isinstance(body, str) else body
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def _dispatch(self, path, params):
+        with self._lock:
+            self.requests += 1
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors += 1
+        if self.latency:
+            time.sleep(self.latency)
+        if fail:
+            return 503, "text/plain", "injected error"
+        handler = self.routes.get(path)
+        if handler is None:
+            return 404, "text/plain", f"no stand-in route for {path}"
+        return handler(params)
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+#------------------------------------------------------------------
+# MaRDI portal (MediaWiki API + SPARQL query service)
+#------------------------------------------------------------------
+def _mathml(tex: str) -> str:
+    escaped = tex.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    return (
+        '<math xmlns="http://www.w3.org/1998/Math/MathML" alttext="{\\displaystyle ' + escaped + '}">'
+        "<semantics><mrow/>"
+        '<annotation encoding="application/x-tex">{\\displaystyle ' + escaped + "}</annotation>"
+        "</semantics></math>"
+    )
+
+
+# concept label -> (QID, [(formula label, TeX, description)])
+MARDI_CONCEPTS = {
+    "gamma function": ("Q2", [
+        ("Euler integral of the second kind", r"\Gamma(z) = \int_{0}^{\infty} t^{z-1} e^{-t} \, dt", "definition of the gamma function for Re z > 0"),
+        ("Recurrence relation", r"\Gamma(z+1) = z \Gamma(z)", "functional equation of the gamma function"),
+        ("Reflection formula", r"\Gamma(z) \Gamma(1-z) = \frac{\pi}{\sin(\pi z)}", "Euler's reflection formula"),
+        ("Half-integer value", r"\Gamma\left(\tfrac{1}{2}\right) = \sqrt{\pi}", "special value"),
+    ]),
+    "beta function": ("Q3", [
+        ("Euler integral of the first kind", r"\mathrm{B}(a,b) = \int_{0}^{1} t^{a-1} (1-t)^{b-1} \, dt", "definition of the beta function"),
+        ("Beta in terms of gamma", r"\mathrm{B}(a,b) = \frac{\Gamma(a)\Gamma(b)}{\Gamma(a+b)}", "relation to the gamma function"),
+    ]),
+    "riemann zeta function": ("Q4", [
+        ("Dirichlet series", r"\zeta(s) = \sum_{n=1}^{\infty} \frac{1}{n^{s}}", "definition for Re s > 1"),
+        ("Euler product", r"\zeta(s) = \prod_{p} \frac{1}{1 - p^{-s}}", "product over primes"),
+    ]),
+    "bessel function": ("Q5", [
+        ("Bessel differential equation", r"z^{2} \frac{d^{2}w}{dz^{2}} + z \frac{dw}{dz} + (z^{2} - \nu^{2}) w = 0", "defining ODE"),
+        ("Bound for J_0", r"|J_{0}(x)| \le 1", "bound on the real line"),
+    ]),
+}
+
+_QID_PATTERN = re.compile(r"wdt:P4 wd:(Q\d+)")
+_MWAPI_SEARCH_PATTERN = re.compile(r'mwapi:search "((?:[^"\\]|\\.)*)"')
+
+
+def _search_concept(term: str):
+    term = term.strip().lower()
+    for label, (qid, _) in MARDI_CONCEPTS.items():
+        if term in label or label in term:
+            return label, qid
+    return None, None
+
+
+def _formula_bindings(label: str, limit: int):
+    qid, formulas = MARDI_CONCEPTS[label]
+    bindings = []
+    for i, (name, tex, description) in enumerate(formulas[:limit]):
+        bindings.append({
+            "formula": {"type": "uri", "value": f"https://portal.mardi4nfdi.de/entity/{qid}F{i}"},
+            "formulaLabel": {"type": "literal", "value": name},
+            "mathExpression": {"type": "literal", "value": _mathml(tex)},
+            "description": {"type": "literal", "value": description, "xml:lang": "en"},
+        })
+    return bindings
+
+
+class MaRDIStandIn(StandInServer):
+    """MediaWiki `wbsearchentities` and a SPARQL endpoint answering the MaRDIClient queries."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0, support_mwapi: bool = True):
+        self.support_mwapi = support_mwapi
+        super().__init__(
+            {"/w/api.php": self._api, "/sparql": self._sparql},
+            latency=latency, error_rate=error_rate, seed=seed,
+        )
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.base_url}/w/api.php"
+
+    @property
+    def sparql_url(self) -> str:
+        return f"{self.base_url}/sparql"
+
+    def _api(self, params):
+        label, qid = _search_concept(params.get("search", ""))
+        results = [{"id": qid, "label": label}] if qid else []
+        return 200, "application/json", json.dumps({"search": results})
+
+    def _sparql(self, params):
+        query = params.get("query", "")
+        limit = int(re.search(r"LIMIT (\d+)", query).group(1)) if "LIMIT" in query else 20
+        label = None
+        search = _MWAPI_SEARCH_PATTERN.search(query)
+        if search:
+            if not self.support_mwapi:
+                return 400, "text/plain", "Service wikibase:mwapi is not supported"
+            label, _ = _search_concept(search.group(1).replace('\\"', '"'))
+        else:
+            qid = _QID_PATTERN.search(query)
+            if qid:
+                label = next((k for k, (q, _) in MARDI_CONCEPTS.items() if q == qid.group(1)), None)
+        bindings = _formula_bindings(label, limit) if label else []
+        body = {"head": {"vars": ["formula", "formulaLabel", "mathExpression", "description"]},
+                "results": {"bindings": bindings}}
+        return 200, "application/sparql-results+json", json.dumps(body)
+
+#------------------------------------------------------------------
+# Wolfram|Alpha LLM API
+#------------------------------------------------------------------
+WOLFRAM_ANSWERS = {
+    "integrate": "Input: integral_0^pi sin(x) dx\n\nResult: 2\n\nIndefinite integral: -cos(x) + constant",
+    "solve": "Input: solve x^2 + 5x + 6 = 0\n\nResults:\nx = -3\nx = -2",
+    "derivative": "Input: d/dx(x^2 sin(x))\n\nResult: x^2 cos(x) + 2 x sin(x)",
+    "gamma": "Input: Gamma(5.5)\n\nDecimal approximation: 52.34277778455352018114900849241819367949013237611424488006\n\n"
+             "Exact result: (945 sqrt(pi))/32",
+}
+
+
+class WolframStandIn(StandInServer):
+    """The Wolfram|Alpha LLM API (`GET /api/v1/llm-api?input=...&appid=...`), answering in plain text."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        super().__init__({"/api/v1/llm-api": self._query}, latency=latency, error_rate=error_rate, seed=seed)
+
+    @property
+    def api_url(self) -> str:
+        return f"{self.base_url}/api/v1/llm-api"
+
+    def _query(self, params):
+        if not params.get("appid"):
+            return 403, "text/plain", "Invalid appid"
+        text = params.get("input", "").lower()
+        answer = next((a for key, a in WOLFRAM_ANSWERS.items() if key in text), None)
+        if answer is None:
+            return 501, "text/plain", f'Wolfram|Alpha did not understand your input: "{params.get("input")}"'
+        return 200, "text/plain", answer
+
+#------------------------------------------------------------------
+# Web search (SearXNG-style JSON API, see duckduckgo_tools.WEB_SEARCH_URL)
+#------------------------------------------------------------------
+class SearchStandIn(StandInServer):
+    """A JSON search endpoint: `GET /search?q=...&format=json` -> {"results": [...]}."""
+
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, seed: int = 0):
+        super().__init__({"/search": self._search}, latency=latency, error_rate=error_rate, seed=seed)
+
+    @property
+    def search_url(self) -> str:
+        return f"{self.base_url}/search"
+
+    def _search(self, params):
+        query = params.get("q", "")
+        results = [{
+            "title": f"{query} - result {i}",
+            "url": f"https://example.org/{i}",
+            "content": f"Snippet {i} about {query}: current conditions, times and recent news.",
+        } for i in range(1, 6)]
+        return 200, "application/json", json.dumps({"query": query, "results": results})
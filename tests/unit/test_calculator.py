@@ -0,0 +1,68 @@
+"""
+Unit tests for the calculator tools (mcp_tool_chest/calculator.py).
+
+Run from the repository root:
+    python -m unittest discover -s tests/unit
+"""
+import os
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+
+from calculator import batch_calculate, evaluate_expression
+
+
+class EvaluateExpressionTest(unittest.TestCase):
+    """evaluate_expression() returns a float or raises a clear ValueError."""
+
+    def test_values(self):
+        self.assertEqual(evaluate_expression("(3+4)*5^2/7"), 25.0)
+        self.assertIsInstance(evaluate_expression("2^10"), float)
+
+    def test_not_a_float(self):
+        for expression, message in (("(-8)^(1/3)", "not a real number"), ("10^400", "too large"),
+                                    ("10^5000", "digits"), ("1e308 * 10", "not a finite number")):
+            with self.assertRaisesRegex(ValueError, message):
+                evaluate_expression(expression)
+
+    def test_huge_intermediates_fail_fast(self):
+        # Would block the tool chest (and every other tool call) for minutes
+        start = time.perf_counter()
+        with self.assertRaisesRegex(ValueError, "digits"):
+            evaluate_expression("(10^10000)^10000")
+        self.assertEqual(batch_calculate("(10^10000)^x", a=[10000, 1]), [None, None])
+        self.assertLess(time.perf_counter() - start, 0.1)
+
+
+class BatchCalculateTest(unittest.TestCase):
+    """batch_calculate() nulls bad elements only and needs `b` for binary operations."""
+
+    def test_values(self):
+        self.assertEqual(batch_calculate("x^2", start=1, stop=4), [1.0, 4.0, 9.0, 16.0])
+        self.assertEqual(batch_calculate("multiply", a=[1, 2, 3], b=2), [2.0, 4.0, 6.0])
+        self.assertEqual(batch_calculate("sqrt", a=[4, 9]), [2.0, 3.0])
+
+    def test_bad_elements_are_null(self):
+        self.assertEqual(batch_calculate("power", a=[-8, 8], b=1 / 3), [None, 2.0])
+        self.assertEqual(batch_calculate("divide", a=[1, 1], b=[0, 2]), [None, 0.5])
+        self.assertEqual(batch_calculate("x * 1e308", a=[10, 1]), [None, 1e308])
+
+    def test_bad_ranges(self):
+        inf, nan = float("inf"), float("nan")
+        for start, stop, step in ((0, inf, 1), (-inf, 0, 1), (nan, 1, 1), (0, 1, nan), (0, 1, inf), (0, 1, 0),
+                                  (-1e308, 1e308, 1), (0, 1, 1e-320), (0, 1e6, 1)):
+            with self.assertRaises(ValueError, msg=(start, stop, step)):
+                batch_calculate("x", start=start, stop=stop, step=step)
+        self.assertEqual(batch_calculate("x", start=1, stop=0), [])
+
+    def test_binary_operation_needs_b(self):
+        for operation in ("add", "subtract", "multiply", "divide", "power", "x + y"):
+            with self.assertRaises(ValueError):
+                batch_calculate(operation, a=[1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
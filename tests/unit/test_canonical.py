@@ -0,0 +1,76 @@
+"""
+Unit tests for mcp_tool_chest/canonical.py.
+
+Run from the repository root:
+    python -m unittest discover -s tests/unit
+"""
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+
+from canonical import canonicalize
+
+
+class SameQuestionTest(unittest.TestCase):
+    """Phrasings of one question share a key."""
+
+    def assertSameKey(self, *queries):
+        keys = {canonicalize(query) for query in queries}
+        self.assertEqual(len(keys), 1, keys)
+
+    def test_integral(self):
+        self.assertSameKey("Integrate sin(x) from 0 to pi", "integrate sin x from 0 to pi", "∫ sin(x) dx, 0..π",
+                           "What is the integral of sin(x) from 0 to π?")
+
+    def test_derivative_of_one_variable(self):
+        self.assertSameKey("d/dx x^3+5*x", "derivative of x³ + 5x", "What is the derivative of x**3 + 5 x?")
+
+    def test_solve_for_the_only_variable(self):
+        self.assertSameKey("solve for x: x**2 + 5*x + 6 = 0", "Solve x² + 5x + 6 = 0")
+
+    def test_articles_before_words(self):
+        self.assertSameKey("What is the definition of the Gamma function?", "define gamma function")
+
+
+class DistinctQuestionTest(unittest.TestCase):
+    """Questions with different answers keep different keys."""
+
+    def assertDistinctKeys(self, *queries):
+        keys = [canonicalize(query) for query in queries]
+        self.assertEqual(len(set(keys)), len(keys), keys)
+
+    def test_differentiation_variable(self):
+        self.assertDistinctKeys("d/dx x^2 y", "d/dy x^2 y")
+        self.assertEqual(canonicalize("d/dy x^2 y"), canonicalize("derivative of x^2 y with respect to y"))
+
+    def test_solve_variable(self):
+        self.assertDistinctKeys("solve for x: x + y = 1", "solve for y: x + y = 1")
+
+    def test_integration_variable(self):
+        self.assertDistinctKeys("integrate x*y dx", "integrate x*y dy")
+
+    def test_variable_a_is_not_an_article(self):
+        self.assertDistinctKeys("solve a x + b = 0", "solve x + b = 0")
+        self.assertDistinctKeys("what is a + 1", "what is +1")
+        self.assertIn("a", canonicalize("what is a + 1"))
+
+    def test_factorial_is_not_punctuation(self):
+        self.assertDistinctKeys("what is 5!", "what is 5")
+        self.assertDistinctKeys("10!", "10")
+        self.assertDistinctKeys("5!!", "5!")
+        self.assertEqual(canonicalize("What is 5!?"), "5!")
+        self.assertEqual(canonicalize("(2n)!"), "(2n)!")
+        self.assertEqual(canonicalize("n!"), "n!")
+        self.assertEqual(canonicalize("Define the gamma function!"), canonicalize("define gamma function"))
+
+    def test_function_of_a_power_is_not_rewritten(self):
+        self.assertEqual(canonicalize("sin x^2"), "sin x^2")
+        self.assertDistinctKeys("sin x^2", "sin(x)^2", "sin(x^2)")
+        self.assertEqual(canonicalize("sin x"), "sin(x)")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""
+Unit tests for the request deadline (mcp_tool_chest/deadline.py).
+
+Run from the repository root:
+    python -m unittest discover -s tests/unit
+"""
+import math
+import os
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+
+import deadline
+
+
+class ScopeTest(unittest.TestCase):
+    """scope() is one request: it starts a deadline once and always ends it."""
+
+    def tearDown(self):
+        deadline.clear()
+
+    def test_starts_and_ends(self):
+        with deadline.scope(30):
+            self.assertLessEqual(deadline.remaining(), 30)
+        self.assertEqual(deadline.remaining(), math.inf)
+
+    def test_ends_on_error(self):
+        with self.assertRaises(RuntimeError):
+            with deadline.scope(30):
+                raise RuntimeError
+        self.assertEqual(deadline.remaining(), math.inf)
+
+    def test_nested_scope_keeps_the_deadline(self):
+        with deadline.scope(30):
+            with deadline.narrowed(10):
+                with deadline.scope(30):
+                    self.assertLessEqual(deadline.remaining(), 20)
+            self.assertGreater(deadline.remaining(), 20)
+        self.assertEqual(deadline.remaining(), math.inf)
+
+    def test_no_budget(self):
+        with deadline.scope(0):
+            self.assertEqual(deadline.remaining(), math.inf)
+
+
+if __name__ == "__main__":
+    unittest.main()
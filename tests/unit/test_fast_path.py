@@ -0,0 +1,87 @@
+"""
+Unit tests for the arithmetic fast path (tutor_agent/fast_path.py) and the
+safe evaluator behind it (mcp_tool_chest/safe_eval.py).
+
+Run from the repository root:
+    python -m unittest discover -s tests/unit
+"""
+import os
+import sys
+import time
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+sys.path.insert(0, os.path.join(ROOT, "tutor_agent"))
+
+from fast_path import extract_expression, try_fast_path
+from safe_eval import MAX_RESULT_DIGITS, ExpressionError, evaluate
+
+
+class ExtractExpressionTest(unittest.TestCase):
+    """Only numeric-only questions yield an expression."""
+
+    def test_arithmetic_questions(self):
+        self.assertEqual(extract_expression("What is 22 * 100?"), "22 * 100")
+        self.assertEqual(extract_expression("calculate 22 x 100"), "22 * 100")
+        self.assertEqual(extract_expression("Please compute sqrt(2) * pi."), "sqrt(2) * pi")
+        self.assertEqual(extract_expression("What is 2^10?"), "2^10")
+
+    def test_other_questions(self):
+        self.assertIsNone(extract_expression(""))
+        self.assertIsNone(extract_expression("What is 42?"))
+        self.assertIsNone(extract_expression("Solve x^2 + 5x + 6 = 0"))
+        self.assertIsNone(extract_expression("What is the derivative of x * 2?"))
+        self.assertIsNone(extract_expression("What is __import__('os')?"))
+
+
+class EvaluateTest(unittest.TestCase):
+    """evaluate() returns real, finite, printable values or raises ExpressionError."""
+
+    def test_values(self):
+        self.assertEqual(evaluate("(3+4)*5^2/7"), 25)
+        self.assertEqual(evaluate("2^10"), 1024)
+        self.assertAlmostEqual(evaluate("sqrt(2) * sin(pi/4)"), 1.0)
+
+    def test_complex_result(self):
+        with self.assertRaises(ExpressionError):
+            evaluate("(-8)^(1/3)")
+
+    def test_non_finite_result(self):
+        with self.assertRaises(ExpressionError):
+            evaluate("1e308 * 10")
+
+    def test_too_many_digits(self):
+        with self.assertRaises(ExpressionError):
+            evaluate("10^5000")
+        self.assertEqual(len(str(evaluate(f"10^{MAX_RESULT_DIGITS - 1}"))), MAX_RESULT_DIGITS)
+
+    def test_huge_intermediates_fail_fast(self):
+        for expression in ("(10^10000)^1000", "(10^10000)^10000", "(2^1000)^1000^1",
+                           "factorial(1000)*factorial(1000)*factorial(1000)", "factorial(1000)^2"):
+            start = time.perf_counter()
+            with self.assertRaises(ExpressionError, msg=expression):
+                evaluate(expression)
+            self.assertLess(time.perf_counter() - start, 0.1, expression)
+
+    def test_undefined(self):
+        for expression in ("1/0", "sqrt(-1)", "factorial(-1)"):
+            with self.assertRaises(ExpressionError):
+                evaluate(expression)
+
+
+class TryFastPathTest(unittest.TestCase):
+    """try_fast_path() answers or falls through (None), and never raises."""
+
+    def test_answers(self):
+        self.assertEqual(try_fast_path("What is 22 * 100?"), "22 * 100 = 2200")
+        self.assertEqual(try_fast_path("What is 7 / 2?"), "7 / 2 = 3.5")
+
+    def test_falls_through(self):
+        for question in ("What is 10^5000?", "What is (10^10000)^1000?", "What is (-8)^(1/3)?", "What is 1/0?", "What is 1e308 * 10?",
+                         "Integrate sin(x) from 0 to pi"):
+            self.assertIsNone(try_fast_path(question), question)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+"""
+Unit tests for the partial-match lookups of mcp_tool_chest/mardi_index.py.
+
+Run from the repository root:
+    python -m unittest discover -s tests/unit
+"""
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+
+from mardi_index import MaRDIIndex, token_overlap
+
+CONCEPTS = ["gamma function", "beta function", "riemann zeta function", "bessel function"]
+
+
+def formula(label):
+    return {"id": label, "tex": "", "description": f"{label} definition", "link": "https://portal.mardi4nfdi.de/wiki/Item:Q1"}
+
+
+class LookupTest(unittest.TestCase):
+    """Only queries that name most of an indexed concept are served from the index."""
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.index = MaRDIIndex(os.path.join(directory.name, "index.sqlite3"))
+        self.addCleanup(self.index._conn.close)
+        for concept in CONCEPTS:
+            self.index.store(concept, [formula(concept)])
+
+    def served(self, query):
+        result = self.index.lookup(query)
+        return result[0]["id"] if result else None
+
+    def test_exact_and_plural(self):
+        self.assertEqual(self.served("Gamma function"), "gamma function")
+        self.assertEqual(self.served("Bessel functions"), "bessel function")
+
+    def test_most_words_of_a_concept(self):
+        self.assertEqual(self.served("zeta function"), "riemann zeta function")
+        self.assertEqual(self.served("riemann zeta"), "riemann zeta function")
+
+    def test_generic_queries_go_live(self):
+        for query in ("function", "functions", "gamma", "zeta", "polynomial"):
+            self.assertIsNone(self.served(query), query)
+        self.assertEqual(self.index.misses, 5)
+
+
+class TokenOverlapTest(unittest.TestCase):
+
+    def test_overlap(self):
+        self.assertEqual(token_overlap("Gamma functions", "gamma function"), 1.0)
+        self.assertEqual(token_overlap("function", "gamma function"), 0.5)
+        self.assertEqual(token_overlap("gamma polynomial", "gamma function"), 0.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
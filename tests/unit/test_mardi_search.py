@@ -0,0 +1,68 @@
+"""
+Unit tests for the lookup-mode fallback of mcp_tool_chest/mardi_search.py.
+
+Run from the repository root:
+    python -m unittest discover -s tests/unit
+"""
+import asyncio
+import os
+import sys
+import unittest
+
+import httpx
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.join(ROOT, "mcp_tool_chest"))
+
+from mardi_search import MaRDIClient
+
+BINDING = {"formulaLabel": {"value": "Gamma function"}, "mathExpression": {"value": ""}}
+
+
+def status_error(status_code, text=""):
+    request = httpx.Request("GET", "https://query.example/sparql")
+    response = httpx.Response(status_code, text=text, request=request)
+    return httpx.HTTPStatusError(f"{status_code}", request=request, response=response)
+
+
+def client_failing_with(error):
+    """An auto-mode client whose single query raises `error` and whose two-step lookup answers."""
+    client = MaRDIClient(lookup_mode="auto")
+    client.single_calls = 0
+
+    async def single(concept_term, limit):
+        client.single_calls += 1
+        raise error
+
+    async def two_step(concept_term, limit):
+        return [BINDING]
+
+    client._fetch_bindings_single = single
+    client._fetch_bindings_two_step = two_step
+    return client
+
+
+class LookupModeFallbackTest(unittest.TestCase):
+    """Auto mode switches to two_step only when the endpoint rejects the query."""
+
+    def lookup(self, client):
+        return asyncio.run(client._fetch_raw_formulas("Gamma function"))
+
+    def test_rejected_query_switches_for_good(self):
+        for error in (status_error(400), status_error(500, "MalformedQueryException: Encountered \"SERVICE\"")):
+            client = client_failing_with(error)
+            self.assertEqual(len(self.lookup(client)), 1)
+            self.assertEqual(client.lookup_mode, "two_step")
+
+    def test_transient_error_keeps_single_mode(self):
+        for error in (status_error(503), status_error(429), httpx.ReadTimeout("timed out"),
+                      httpx.ConnectError("refused")):
+            client = client_failing_with(error)
+            self.assertEqual(self.lookup(client), [])
+            self.assertEqual(client.lookup_mode, "auto")
+            self.lookup(client)
+            self.assertEqual(client.single_calls, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""
+Unit tests for the SQLite session service (tutor_agent/sessions.py).
+
+Run from the repository root:
+    python -m unittest discover -s tests/unit
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from google.adk.events.event import Event
+from google.adk.events.event_actions import EventActions
+from google.genai import types
+
+from tutor_agent.sessions import SQLiteSessionService
+
+
+def event(author, text, state_delta=None):
+    role = "user" if author == "user" else "model"
+    return Event(author=author, content=types.Content(role=role, parts=[types.Part.from_text(text=text)]),
+                 actions=EventActions(state_delta=state_delta or {}))
+
+
+class WithoutHotTierTest(unittest.TestCase):
+    """With max_cached=0 (several workers) appends never reload the history."""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.service = SQLiteSessionService(os.path.join(self.tmp.name, "sessions.sqlite3"), max_cached=0,
+                                            batch_size=1)
+        self.history_loads = 0
+        load_session = self.service._load_session
+
+        def counting_load(key, events=True):
+            self.history_loads += events
+            return load_session(key, events)
+
+        self.service._load_session = counting_load
+
+    def tearDown(self):
+        asyncio.run(self.service.close())
+        self.tmp.cleanup()
+
+    def test_append_keeps_history_and_state(self):
+        async def run():
+            session = await self.service.create_session(app_name="app", user_id="u", state={"n": 0})
+            for i in range(1, 11):
+                await self.service.append_event(session, event("user", f"question {i}"))
+                await self.service.append_event(session, event("root_agent", f"answer {i}", {"n": i}))
+            return session, await self.service.get_session(app_name="app", user_id="u", session_id=session.id)
+
+        session, stored = asyncio.run(run())
+        self.assertEqual(len(stored.events), 20)
+        self.assertEqual(stored.events[-1].content.parts[0].text, "answer 10")
+        self.assertEqual(stored.state["n"], 10)
+        # create_session's existence check and the final get_session, not one per event
+        self.assertEqual(self.history_loads, 2)
+
+    def test_append_to_missing_session(self):
+        async def run():
+            session = await self.service.create_session(app_name="app", user_id="u")
+            await self.service.delete_session(app_name="app", user_id="u", session_id=session.id)
+            await self.service.append_event(session, event("user", "question"))
+            return await self.service.get_session(app_name="app", user_id="u", session_id=session.id)
+
+        self.assertIsNone(asyncio.run(run()))
+
+
+if __name__ == "__main__":
+    unittest.main()
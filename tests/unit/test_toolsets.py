@@ -0,0 +1,76 @@
+"""
+Unit tests for the tool-server environment of tutor_agent/toolsets.py.
+
+Run from the repository root:
+    python -m unittest discover -s tests/unit
+"""
+import asyncio
+import os
+import sys
+import unittest
+from unittest import mock
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, ROOT)
+
+from tutor_agent import toolsets
+
+PASSED = {
+    "PATH": "/usr/bin",
+    "HOME": "/home/tutor",
+    "WOLFRAM_API_KEY": "wolfram",
+    "MARDI_LOOKUP_MODE": "auto",
+    "TOOL_HTTP_TIMEOUT": "5",
+    "WEB_SEARCH_URL": "https://search.example",
+    "ERIK_TRACING": "1",
+    "OTEL_EXPORTER_OTLP_ENDPOINT": "http://collector:4318",
+    "MCP_LOG_LEVEL": "WARNING",
+    "HTTPS_PROXY": "http://proxy:3128",
+    "no_proxy": "localhost",
+    "SSL_CERT_FILE": "/etc/ssl/ca.pem",
+    "REQUESTS_CA_BUNDLE": "/etc/ssl/ca.pem",
+}
+SECRETS = {
+    "GOOGLE_API_KEY": "secret",
+    "GOOGLE_GENAI_USE_VERTEXAI": "0",
+    "AWS_SECRET_ACCESS_KEY": "secret",
+}
+ENVIRON = {**PASSED, **SECRETS}
+
+
+class ServerEnvTest(unittest.TestCase):
+    """stdio tool servers get their configuration, tracing, proxy and CA settings, and no secrets."""
+
+    def test_only_tool_server_variables(self):
+        with mock.patch.dict(os.environ, ENVIRON, clear=True):
+            env = toolsets.server_env()
+        self.assertEqual(env, PASSED)
+        self.assertFalse(set(SECRETS) & set(env))
+
+    def test_stdio_toolset_uses_it(self):
+        with mock.patch.dict(os.environ, ENVIRON, clear=True), mock.patch.object(toolsets, "MCP_TRANSPORT", "stdio"):
+            toolset = toolsets._mcp_toolset(toolsets.TOOL_CHEST_SERVER)
+        self.assertNotIn("GOOGLE_API_KEY", toolset._connection_params.server_params.env)
+
+
+class DeclarationTest(unittest.TestCase):
+    """In-process tools are declared from their JSON schema, with or without ADK's conversion."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tool = asyncio.run(toolsets.InProcessToolset(["add"]).get_tools())[0]
+
+    def test_converted_schema(self):
+        declaration = self.tool._get_declaration()
+        self.assertEqual(declaration.name, "add")
+        self.assertEqual(set(declaration.parameters.properties), set(self.tool._input_schema["properties"]))
+
+    def test_json_schema_without_conversion(self):
+        with mock.patch.object(toolsets, "_to_gemini_schema", None):
+            declaration = self.tool._get_declaration()
+        self.assertIsNone(declaration.parameters)
+        self.assertEqual(declaration.parameters_json_schema, self.tool._input_schema)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1 +1,13 @@
-from . import agent
+import os
+import sys
+
+# The MCP tool servers import their siblings directly (e.g. `from mardi_search import ...`),
+# so the tool chest directory has to be importable for in-process reuse as well.
+TOOL_CHEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_tool_chest")
+if TOOL_CHEST_DIR not in sys.path:
+    sys.path.insert(0, TOOL_CHEST_DIR)
+
+# The agent graph is built by importing tutor_agent.agent (adk web and
+# `python -m tutor_agent.agent` do), not by importing the package, so the
+# shared modules (budget, fast_path, sessions, ...) can be reused without it,
+# e.g. by the A2A server in a2a_flow/a2a_tutor_serv.
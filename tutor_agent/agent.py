@@ -1,26 +1,34 @@
-import uuid
-from google.genai import types
+import asyncio
+import functools
+import os
+
+from .startup import log_report, timed
 
-from google.adk.agents import LlmAgent
-from google.adk.models.google_llm import Gemini
-from google.adk.runners import Runner
-from google.adk.sessions import InMemorySessionService
+# Import and construction costs are recorded per component (python -m tutor_agent.startup)
+with timed("google.adk", "import"):
+    from google.genai import types
+    from google.adk.agents import LlmAgent
 
 # from google.adk.tools import google_search
-from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
-from google.adk.tools.tool_context import ToolContext
-from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
-from mcp import StdioServerParameters
+#from agent_dev_kit.mcp.toolset import ToolboxHttpConnectionParams
 
-from google.adk.apps.app import App, ResumabilityConfig
-from google.adk.tools.function_tool import FunctionTool
+with timed("dotenv", "import"):
+    from dotenv import load_dotenv
 
-#from agent_dev_kit.mcp.toolset import ToolboxHttpConnectionParams
+with timed("fast path + toolsets", "import"):
+    from .answer_cache import answer_cache_lookup, answer_cache_store
+    from .budget import BudgetedAgent, BudgetedAgentTool, BudgetedGemini, budget_exceeded, retry_config
+    from .compaction import compaction_callback
+    from .fast_path import fast_path_callback
+    from .toolsets import agent_toolset
 
-from dotenv import load_dotenv
-import os
+# Per-hop spans (model calls, transfers, tool calls, HTTP) to a JSONL file / OTLP with ERIK_TRACING=1
+with timed("tracing", "init"):
+    from telemetry import setup_tracing
+    tracing_enabled = setup_tracing("erik-tutor")
 
-load_dotenv(dotenv_path="./.env")
+with timed(".env", "init"):
+    load_dotenv(dotenv_path="./.env")
 
 #------------------------------------------------------------------
 # Agentic Workflow description
@@ -52,149 +60,108 @@ It uses a root agent to coordinate the subagents.
 
 
 #------------------------------------------------------------------
-# Retry function
-#------------------------------------------------------------------
-retry_config = types.HttpRetryOptions(
-    attempts=5,  # Maximum retry attempts
-    exp_base=7,  # Delay multiplier
-    initial_delay=1,
-    http_status_codes=[429, 500, 503, 504],  # Retry on these HTTP errors
-)
-
-
-#------------------------------------------------------------------
-# MCP Toolset
-#------------------------------------------------------------------
-# Get the project root directory (parent of tutor_agent)
-PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-
-WOLFRAM_MCP_SERVER = os.path.join(PROJECT_ROOT, "mcp_tool_chest", "wolfram_tools.py")
-MARDI_MCP_SERVER = os.path.join(PROJECT_ROOT, "mcp_tool_chest", "mardi_tools.py")
-CALCULATOR_MCP_SERVER = os.path.join(PROJECT_ROOT, "mcp_tool_chest", "calculator.py")
-DUCKDUCKGO_MCP_SERVER = os.path.join(PROJECT_ROOT, "mcp_tool_chest", "duckduckgo_tools.py")
-#------------------------------------------------------------------
-# Wolfram MCP toolset wrapper
-#------------------------------------------------------------------
-mcp_wolfram = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="python",  # Run MCP server via python
-            args=[
-                "-u",
-                WOLFRAM_MCP_SERVER,
-            ],
-            tool_filter=["wolfram_query"],
-        ),
-        timeout=60,
-    )
-)
-#------------------------------------------------------------------
-# MaRDI MCP toolset wrapper
-#------------------------------------------------------------------
-mcp_mardi = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="python",
-            args=[
-                "-u",
-                MARDI_MCP_SERVER,
-            ],
-            tool_filter=["mardi_query"],
-        ),
-        timeout=60,
-    )
-)
-#------------------------------------------------------------------
-# Calculator MCP toolset wrapper
-#------------------------------------------------------------------
-mcp_calculator = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="python",
-            args=[
-                "-u",
-                CALCULATOR_MCP_SERVER,
-            ],
-            tool_filter=["add", "subtract", "multiply", "divide", "power", "sqrt"],
-        ),
-        timeout=60,
-    )
-)
-#------------------------------------------------------------------
-# DuckDuckGo MCP toolset wrapper
+# MCP Toolsets
+# One consolidated tool-chest server; each agent sees only its own tools
+# (see toolsets.py, ERIK_TOOL_SERVERS=separate for one server per toolset)
 #------------------------------------------------------------------
-mcp_duckduckgo = McpToolset(
-    connection_params=StdioConnectionParams(
-        server_params=StdioServerParameters(
-            command="python",
-            args=[
-                "-u",
-                DUCKDUCKGO_MCP_SERVER,
-            ],
-            tool_filter=["web_search"],
-        ),
-        timeout=60,
-    )
-)
+# Connections are opened (and servers started) on first use
+with timed("toolsets", "init"):
+    mcp_wolfram = agent_toolset("wolfram_agent")
+    mcp_mardi = agent_toolset("mardi_agent")
+    mcp_calculator = agent_toolset("calculator_agent")
+    mcp_duckduckgo = agent_toolset("web_search_agent")
 #-----------------------------------------------------------------
 # Read Prompts
 # Hard coding fixed
+# Read on first use by the agent, not at import
 #-----------------------------------------------------------------
 # Get the prompts directory relative to this file
 PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
 
-with open(os.path.join(PROMPTS_DIR, "wolfram_prompt.md"), "r") as f:
-    wolfram_prompt = f.read()
 
-with open(os.path.join(PROMPTS_DIR, "mardi_prompt.md"), "r") as f:
-    mardi_prompt = f.read()
+@functools.lru_cache(maxsize=None)
+def read_prompt(filename: str) -> str:
+    with timed(f"prompt {filename}", "first use"):
+        with open(os.path.join(PROMPTS_DIR, filename), "r") as f:
+            return f.read()
+
+
+def prompt_instruction(*filenames: str):
+    """Instruction provider that reads the prompt files the first time the agent runs."""
+    def instruction(context) -> str:
+        prompt = "\n\n".join(read_prompt(filename) for filename in filenames)
+        return f"""
+    {prompt}
+    """
+    return instruction
 
-with open(os.path.join(PROMPTS_DIR, "orchastrator_prompt.md"), "r") as f:
-    root_prompt = f.read()
+#-----------------------------------------------------------------
+# Model
+# One Gemini instance shared by all agents: one API client and connection
+# pool, created on the first request
+# Retries are capped, jittered and stay within the question's time budget
+# (budget.py: ERIK_REQUEST_BUDGET, ERIK_RETRY_*, ERIK_HEDGE_AFTER)
+#-----------------------------------------------------------------
+with timed("gemini model", "init"):
+    if tracing_enabled:
+        from .tracing import TracedGemini
+    model_class = TracedGemini if tracing_enabled else BudgetedGemini
+    model = model_class(model="gemini-2.5-flash", retry_options=retry_config)#flash-lite doesn't support function calling
 
 #-----------------------------------------------------------------
 # Wolfram Agent : Solver/ Analyst
 #-----------------------------------------------------------------
-wolfram_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
+wolfram_agent = BudgetedAgent(
+    model=model,
     name="wolfram_agent",
-    instruction=f"""
-    {wolfram_prompt}
-    """,
+    description="Solves equations, calculus and symbolic math, and looks up scientific data with Wolfram|Alpha.",
+    instruction=prompt_instruction("wolfram_prompt.md"),
     tools=[mcp_wolfram], #mcp_wolfram_server,
+    before_model_callback=compaction_callback,
+    on_tool_error_callback=budget_exceeded,
 )
 
 #-----------------------------------------------------------------
 # MaRDI Agent : The Archivist 
 #-----------------------------------------------------------------
-mardi_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),
+mardi_agent = BudgetedAgent(
+    model=model,
     name="mardi_agent",
-    instruction=f"""
-    {mardi_prompt}
-    """,
+    description="Finds definitions, formulas and identities in the MaRDI mathematical knowledge graph.",
+    instruction=prompt_instruction("mardi_prompt.md"),
     tools=[mcp_mardi],
+    before_model_callback=compaction_callback,
+    on_tool_error_callback=budget_exceeded,
 )
 
 #-----------------------------------------------------------------
 # Calculator Agent : The Trivial Calculator
 #-----------------------------------------------------------------
-calculator_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),
+calculator_agent = BudgetedAgent(
+    model=model,
     name="calculator_agent",
+    description="Evaluates arithmetic with numbers only: + - * / ^ sqrt, whole expressions and tables of values.",
     instruction="""
     You are a calculator agent.
     Use the provided tools to perform basic arithmetic operations.
+    For anything with more than one operation, e.g. (3+4)*5^2/7,
+    call `evaluate_expression` once with the whole expression
+    instead of chaining the single-operation tools.
+    For tables of values (e.g. squares of 1..100, converting a list of units),
+    call `batch_calculate` once for the whole table instead of once per value.
     """,
     tools=[mcp_calculator],
+    before_model_callback=compaction_callback,
+    on_tool_error_callback=budget_exceeded,
 )
 
 #------------------------------------------------------------------
 # Web Search Agent : The Web Searcher
 #------------------------------------------------------------------
-web_search_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
+web_search_agent = BudgetedAgent(
+    model=model,
     name="web_search_agent",
+    description="Looks up current information on the web: time and date, weather, news and recent events.",
     instruction=f"""
     You are a web search agent.
     Your primary role is to find **current information** such as:
@@ -206,20 +173,54 @@ web_search_agent = LlmAgent(
     Use the search tool to look up this information.
     """,
     tools=[mcp_duckduckgo],
+    before_model_callback=compaction_callback,
+    on_tool_error_callback=budget_exceeded,
 )
 
 #-----------------------------------------------------------------
 # Root Agent (Orchestrator/ Manager: User facing agent)
 #-----------------------------------------------------------------
-root_agent = LlmAgent(
-    model=Gemini(model="gemini-2.5-flash", retry_options=retry_config),#flash-lite doesn't support function calling
+# ERIK_SPECIALIST_MODE selects how the root agent reaches the specialists:
+#   transfer - the specialists are sub-agents and the root agent transfers to one
+#              at a time, which then answers the user itself (and gets the
+#              follow-ups, so every agent is a BudgetedAgent that can start the
+#              question's deadline) (default, the routing in orchastrator_prompt.md
+#              and tests/routing_eval_set.json)
+#   tools    - each specialist is an AgentTool; the model can call several in one
+#              turn and ADK runs those calls concurrently, so a question that needs
+#              several specialists waits for the slowest one, not for all in turn
+SPECIALIST_MODES = ("tools", "transfer")
+SPECIALIST_MODE = os.getenv("ERIK_SPECIALIST_MODE", "transfer")
+if SPECIALIST_MODE not in SPECIALIST_MODES:
+    raise ValueError(f"ERIK_SPECIALIST_MODE must be one of {SPECIALIST_MODES}, got {SPECIALIST_MODE!r}")
+
+specialists = [wolfram_agent, web_search_agent, mardi_agent, calculator_agent]
+
+if SPECIALIST_MODE == "tools":
+    root_prompts = ("orchastrator_prompt.md", "fanout_prompt.md")
+    root_tools, root_sub_agents = [BudgetedAgentTool(agent=specialist) for specialist in specialists], []
+else:
+    root_prompts = ("orchastrator_prompt.md",)
+    root_tools, root_sub_agents = [], specialists
+
+root_agent = BudgetedAgent(
+    model=model,
     name="root_agent",
-    instruction=f"""
-    {root_prompt}
-    """,
-    sub_agents=[wolfram_agent, web_search_agent, mardi_agent, calculator_agent],
+    instruction=prompt_instruction(*root_prompts),
+    tools=root_tools,
+    sub_agents=root_sub_agents,
+    # Pure arithmetic is answered locally without a model round-trip, repeated
+    # questions from the answer cache (ERIK_ANSWER_CACHE=1); everything else
+    # within the time budget (budget.py), a specialist out of time is answered around
+    before_agent_callback=[fast_path_callback, answer_cache_lookup],
+    after_agent_callback=answer_cache_store,
+    on_tool_error_callback=budget_exceeded,
+    # Long sessions: old tool results and turns are compacted to a token budget
+    before_model_callback=compaction_callback,
 )
 
+log_report()
+
 #------------------------------------------------------------------
 # Main Execution Loop
 #------------------------------------------------------------------
@@ -228,22 +229,37 @@ if __name__ == "__main__":
     print("Type 'exit' or 'quit' to stop.")
     print("-" * 50)
     
-    # Initialize the runner with the root agent
-    runner = Runner(agent=root_agent)
-    
-    while True:
-        try:
-            user_input = input("\nUser: ")
-            if user_input.lower() in ["exit", "quit"]:
-                print("Goodbye! 👋")
+    from google.adk.runners import Runner
+    from .sessions import session_service
+    from .streaming import print_events, run_config
+
+    # Sessions persist in SQLite (ERIK_SESSION_DB), so a conversation survives restarts
+    runner = Runner(app_name="tutor_agent", agent=root_agent, session_service=session_service())
+
+    async def repl():
+        # One event loop for the whole conversation: tool-server connections and
+        # the session write queue live in it
+        session = await runner.session_service.create_session(app_name="tutor_agent", user_id="user")
+        while True:
+            try:
+                user_input = await asyncio.to_thread(input, "\nUser: ")
+                if user_input.lower() in ["exit", "quit"]:
+                    print("Goodbye! 👋")
+                    break
+
+                # Run the agent; the answer is printed as it streams in (ERIK_STREAMING)
+                message = types.Content(role="user", parts=[types.Part.from_text(text=user_input)])
+                print("\nErik:")
+                await print_events(runner.run_async(user_id="user", session_id=session.id, new_message=message,
+                                                    run_config=run_config()))
+
+            except (KeyboardInterrupt, EOFError):
+                print("\nGoodbye! 👋")
                 break
-            
-            # Run the agent
-            result = runner.run(user_input)
-            print(f"\nErik: {result.output.text}")
-            
-        except KeyboardInterrupt:
-            print("\nGoodbye! 👋")
-            break
-        except Exception as e:
-            print(f"\n❌ Error: {e}")
+            except Exception as e:
+                print(f"\n❌ Error: {e}")
+
+    try:
+        asyncio.run(repl())
+    except KeyboardInterrupt:
+        print("\nGoodbye! 👋")
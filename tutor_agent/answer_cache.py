@@ -0,0 +1,216 @@
+"""
+Answer cache in front of the orchestrator.
+
+Students ask the same questions over and over (the README's examples, the
+A2A client's example list), and every repeat runs the whole root_agent ->
+specialist -> tool chain with several model calls. With ERIK_ANSWER_CACHE=1
+the final answer is stored, keyed on the question with whitespace and case
+normalized (response_cache.normalize_key) and the version of the prompts and
+agent graph, and root_agent's before_agent_callback answers a repeat from
+the cache without any model call.
+
+- Version: a hash of every file in tutor_agent/prompts/ and of the agent
+  graph (names, models, descriptions, static instructions, tools and
+  sub-agents). Editing a prompt or the graph changes every key, so answers
+  of the old version are never served; they age out by TTL and LRU.
+- Only self-contained questions are cached: the first question of a
+  session. A follow-up ("and its derivative?") depends on the turns before it.
+- Time-sensitive answers are not stored: a run that called (or transferred
+  to) web_search_agent is left out, as is a run that ended in an error or
+  answered without a specialist that ran out of time (budget.py).
+- Storage is ResponseCache (SQLite, TTL, LRU eviction), shared by all
+  processes on the host. Hits and misses are logged with the hit rate and
+  counted in stats().
+
+The route taken is recorded under fast_path.ROUTE_STATE_KEY on a hit.
+"""
+import functools
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Optional
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.tools.agent_tool import AgentTool
+from google.genai import types
+
+from response_cache import DEFAULT_CACHE_DIR, ResponseCache, normalize_key
+
+from .budget import DEADLINE_EXCEEDED_KEY
+from .fast_path import ROUTE_STATE_KEY
+
+logger = logging.getLogger(__name__)
+
+ANSWER_CACHE_ENABLED = os.getenv("ERIK_ANSWER_CACHE", "0").lower() not in ("0", "false", "no")
+CACHE_PATH = os.getenv("ERIK_ANSWER_CACHE_PATH", os.path.join(DEFAULT_CACHE_DIR, "answer_cache.sqlite3"))
+CACHE_TTL_SECONDS = float(os.getenv("ERIK_ANSWER_CACHE_TTL", 7 * 24 * 3600))
+CACHE_MAX_ENTRIES = int(os.getenv("ERIK_ANSWER_CACHE_MAX_ENTRIES", 5_000))
+
+PROMPTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "prompts")
+
+# Agents whose answers go stale within minutes (time, weather, news)
+TIME_SENSITIVE_AGENTS = frozenset({"web_search_agent"})
+
+ANSWER_CACHE_ROUTE = "answer_cache"
+
+
+@functools.lru_cache(maxsize=None)
+def _cache() -> ResponseCache:
+    # Opened on first use, like the rest of the agent's resources
+    return ResponseCache(CACHE_PATH, CACHE_TTL_SECONDS, CACHE_MAX_ENTRIES)
+
+
+def stats() -> dict:
+    """Hits, misses, hit rate and size of the answer cache (ResponseCache.stats())."""
+    return _cache().stats()
+
+#------------------------------------------------------------------
+# Version of the prompts and the agent graph
+#------------------------------------------------------------------
+def _describe(agent: BaseAgent) -> dict:
+    model = getattr(agent, "model", None)
+    instruction = getattr(agent, "instruction", None)
+    tools = []
+    for tool in getattr(agent, "tools", []):
+        if isinstance(tool, AgentTool):
+            tools.append(_describe(tool.agent))
+        elif isinstance(getattr(tool, "tool_filter", None), (list, tuple)):
+            # A toolset: the tools it exposes, whatever the transport
+            tools.append(sorted(tool.tool_filter))
+        else:
+            tools.append(getattr(tool, "name", None) or getattr(tool, "__name__", type(tool).__name__))
+    return {
+        "name": agent.name,
+        "description": agent.description,
+        "model": model if isinstance(model, str) else getattr(model, "model", None),
+        # Instruction providers read prompts/, which is hashed as files
+        "instruction": instruction if isinstance(instruction, str) else None,
+        "tools": tools,
+        "sub_agents": [_describe(sub_agent) for sub_agent in agent.sub_agents],
+    }
+
+
+def graph_version(agent: BaseAgent) -> str:
+    """
+    Hash of the prompt files and of the agent graph below `agent`.
+
+    Args:
+        agent: The root agent.
+
+    Returns:
+        A short hex digest that changes whenever a prompt file or the graph does.
+    """
+    digest = hashlib.sha256()
+    for filename in sorted(os.listdir(PROMPTS_DIR)):
+        path = os.path.join(PROMPTS_DIR, filename)
+        if os.path.isfile(path):
+            digest.update(filename.encode() + b"\0")
+            with open(path, "rb") as f:
+                digest.update(f.read() + b"\0")
+    digest.update(json.dumps(_describe(agent), sort_keys=True).encode())
+    return digest.hexdigest()[:16]
+
+
+# Computed once per process: prompts are read once per process too (agent.read_prompt)
+_versions: dict[str, str] = {}
+
+
+def _version(agent: BaseAgent) -> str:
+    if agent.name not in _versions:
+        _versions[agent.name] = graph_version(agent)
+    return _versions[agent.name]
+
+#------------------------------------------------------------------
+# ADK callbacks
+#------------------------------------------------------------------
+def _text(content: Optional[types.Content]) -> str:
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text for part in content.parts if part.text and not part.thought)
+
+
+def _key(callback_context: CallbackContext) -> Optional[str]:
+    """Cache key of the question, or None if it is not a self-contained first question."""
+    question = _text(callback_context.user_content).strip()
+    if not question:
+        return None
+    if any(event.invocation_id != callback_context.invocation_id for event in callback_context.session.events):
+        return None
+    # ReadonlyContext does not expose the agent; it is the root agent these callbacks are on
+    agent = callback_context._invocation_context.agent
+    # Not canonical.canonicalize(): a whole answer is only served for the same
+    # question, and the canonical form is meant for tool lookups, where an
+    # over-eager merge costs less
+    return f"{_version(agent)}:{normalize_key(question)}"
+
+
+def _time_sensitive(event) -> bool:
+    if event.author in TIME_SENSITIVE_AGENTS:
+        return True
+    for call in event.get_function_calls():
+        if call.name in TIME_SENSITIVE_AGENTS:
+            return True
+        if call.name == "transfer_to_agent" and (call.args or {}).get("agent_name") in TIME_SENSITIVE_AGENTS:
+            return True
+    return False
+
+
+def _out_of_time(event) -> bool:
+    return any(isinstance(response.response, dict) and response.response.get(DEADLINE_EXCEEDED_KEY)
+               for response in event.get_function_responses())
+
+
+def answer_cache_lookup(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    before_agent_callback for root_agent.
+
+    Returns the cached answer as model content on a hit (which makes ADK skip
+    the agent run), otherwise None so the orchestrator runs as usual.
+    """
+    if not ANSWER_CACHE_ENABLED:
+        return None
+    key = _key(callback_context)
+    if key is None:
+        return None
+
+    start = time.perf_counter()
+    cache = _cache()
+    answer = cache.get(key)
+    logger.info("answer_cache=%s lookup_ms=%.2f hit_rate=%.2f", "hit" if answer is not None else "miss",
+                (time.perf_counter() - start) * 1000, cache.hits / (cache.hits + cache.misses))
+    if answer is None:
+        return None
+    callback_context.state[ROUTE_STATE_KEY] = ANSWER_CACHE_ROUTE
+    return types.Content(role="model", parts=[types.Part(text=answer)])
+
+
+def answer_cache_store(callback_context: CallbackContext) -> None:
+    """
+    after_agent_callback for root_agent.
+
+    Stores the run's final answer, unless the question was a follow-up, the
+    answer is time-sensitive or the run failed or ran out of time. Never
+    changes the answer.
+    """
+    if not ANSWER_CACHE_ENABLED:
+        return None
+    key = _key(callback_context)
+    if key is None:
+        return None
+
+    events = [event for event in callback_context.session.events
+              if event.invocation_id == callback_context.invocation_id]
+    if any(event.error_code or _out_of_time(event) for event in events):
+        return None
+    if any(_time_sensitive(event) for event in events):
+        logger.info("answer_cache=bypass (time-sensitive)")
+        return None
+    answer = next((_text(event.content) for event in reversed(events)
+                   if event.author != "user" and not event.partial and event.is_final_response()
+                   and _text(event.content)), "")
+    if answer:
+        _cache().set(key, answer)
+    return None
@@ -0,0 +1,288 @@
+"""
+Time budget of a question: deadline-aware retries, optional hedging and
+bounded specialist hops and tool calls.
+
+Every model call used to retry on its own with exp_base=7 (waits of about
+1, 7, 49 and 60 s), and every hop of root_agent -> specialist -> tool waited
+as long as its own timeout, so one overloaded endpoint could hold an answer
+for minutes. Now every question runs under one deadline (mcp_tool_chest/deadline.py,
+ERIK_REQUEST_BUDGET seconds) and everything below it spends from it:
+
+    BudgetedAgent        an LlmAgent whose run is one request: the agent a run
+                         starts with (root_agent, or the specialist a follow-up
+                         goes to in transfer mode) starts the deadline and ends
+                         it however the run ends; transfers and hops keep it.
+                         Fast-path and cached answers (before_agent_callback)
+                         never start one
+    BudgetedGemini       retries 429/500/503/504 itself, with capped, fully
+                         jittered backoff, and only while the wait fits in the
+                         time left; each attempt ends at the deadline.
+                         With ERIK_HEDGE_AFTER=s, a call with no answer after s
+                         seconds is sent a second time and the first answer wins
+    BudgetedAgentTool    a specialist hop ends ERIK_SYNTHESIS_RESERVE seconds
+                         before the deadline, so the root agent can still answer
+                         with what the other hops returned
+    BudgetedToolset      each tool call (MCP or in-process) gets the time left
+    budget_exceeded      on_tool_error_callback: a hop or tool that ran out of
+                         time becomes an error result the model answers around
+
+In-process tools also shorten their HTTP timeouts to the deadline
+(mcp_tool_chest/http_client.py). Retries, hedges and expired budgets are
+counted in BUDGET_STATS.
+"""
+import asyncio
+import logging
+from collections import Counter
+from typing import Any, AsyncGenerator, List, Optional
+
+import httpx
+
+from google.adk.agents.invocation_context import InvocationContext
+from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.events.event import Event
+from google.adk.models.google_llm import Gemini
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.tools.agent_tool import AgentTool
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.tool_context import ToolContext
+from google.adk.utils.context_utils import Aclosing
+from google.genai import errors, types
+
+import deadline
+
+logger = logging.getLogger(__name__)
+
+RETRY_STATUS_CODES = [429, 500, 503, 504]
+
+# Used by the model calls that do not go through BudgetedLlm (and read by it)
+retry_config = types.HttpRetryOptions(
+    attempts=deadline.RETRY_ATTEMPTS,
+    initial_delay=deadline.RETRY_INITIAL_DELAY_SECONDS,
+    max_delay=deadline.RETRY_MAX_DELAY_SECONDS,
+    exp_base=deadline.RETRY_EXP_BASE,
+    http_status_codes=RETRY_STATUS_CODES,
+)
+
+# Key of the error result of a hop or tool that ran out of time
+DEADLINE_EXCEEDED_KEY = "deadline_exceeded"
+
+# "retries", "hedged", "hedge_won" and "deadline_exceeded"
+BUDGET_STATS = Counter()
+
+_DONE = object()
+
+#------------------------------------------------------------------
+# ADK callbacks
+#------------------------------------------------------------------
+def budget_exceeded(tool: BaseTool, args: dict[str, Any], tool_context: ToolContext,
+                    error: Exception) -> Optional[dict]:
+    """
+    on_tool_error_callback: answers a call that ran out of time with an error result.
+
+    Other errors are left to ADK (None).
+    """
+    if not isinstance(error, TimeoutError):
+        return None
+    BUDGET_STATS["deadline_exceeded"] += 1
+    logger.warning("%s ran out of time: %s", tool.name, error)
+    return {"error": f"{tool.name} did not answer in time; answer without it.", DEADLINE_EXCEEDED_KEY: True}
+
+#------------------------------------------------------------------
+# Agents
+#------------------------------------------------------------------
+class BudgetedAgent(LlmAgent):
+    """
+    LlmAgent whose run spends from one request deadline.
+
+    The deadline is started around the agent's own work (after its
+    before_agent_callbacks, so a fast-path or cached answer costs nothing) and
+    ended when that work ends, also on errors. An agent that runs inside a
+    deadline, as a transfer target or a specialist hop, keeps it.
+    """
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        with deadline.scope():
+            async with Aclosing(super()._run_async_impl(ctx)) as events:
+                async for event in events:
+                    yield event
+
+#------------------------------------------------------------------
+# Models
+#------------------------------------------------------------------
+class BudgetedLlm:
+    """
+    Mixin for a model class: deadline-aware retries and optional hedging.
+
+    Retries use the model's retry_options (default retry_config): attempts,
+    initial_delay, max_delay, exp_base and the status codes. A call is only
+    retried before its first response has been passed on, and never with a
+    backoff that would end past the deadline.
+    """
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        options = getattr(self, "retry_options", None) or retry_config
+        attempts = options.attempts or 1
+        codes = options.http_status_codes or RETRY_STATUS_CODES
+        for attempt in range(attempts):
+            deadline.check(f"{self.model} call")
+            self._bound_request(llm_request)
+            answered = False
+            try:
+                hedge = 0 < deadline.HEDGE_AFTER_SECONDS < deadline.remaining()
+                responses = self._hedged(llm_request, stream) if hedge else super().generate_content_async(
+                    llm_request, stream)
+                async with Aclosing(responses) as responses:
+                    while True:
+                        # Also bounds a stalled stream, which the per-read HTTP timeout does not
+                        left = deadline.remaining()
+                        try:
+                            response = await asyncio.wait_for(anext(responses), None if left == float("inf") else left)
+                        except StopAsyncIteration:
+                            return
+                        answered = True
+                        yield response
+            except errors.APIError as e:
+                if answered or e.code not in codes or attempt == attempts - 1:
+                    raise
+                delay = deadline.backoff(attempt, options.initial_delay, options.max_delay, options.exp_base)
+                if delay >= deadline.remaining():
+                    raise deadline.DeadlineExceeded(f"No time left to retry the {self.model} call") from e
+                BUDGET_STATS["retries"] += 1
+                logger.info("%s call failed with %s, retrying in %.2f s", self.model, e.code, delay)
+                await asyncio.sleep(delay)
+            except (TimeoutError, httpx.TimeoutException) as e:
+                # The attempt ran into the deadline (its own wait or its HTTP timeout)
+                if deadline.remaining() == float("inf") or isinstance(e, deadline.DeadlineExceeded):
+                    raise
+                raise deadline.DeadlineExceeded(f"The {self.model} call did not finish in time") from e
+
+    @staticmethod
+    def _bound_request(llm_request: LlmRequest) -> None:
+        config = llm_request.config
+        if config.http_options is None:
+            config.http_options = types.HttpOptions()
+        # The retries are ours; the API client must not add its own
+        config.http_options.retry_options = types.HttpRetryOptions(attempts=1)
+        left = deadline.remaining()
+        config.http_options.timeout = None if left == float("inf") else max(1, int(left * 1000))
+
+    async def _pump(self, index: int, llm_request: LlmRequest, stream: bool, queue: asyncio.Queue) -> None:
+        # One contender of a hedged call: its responses (or error) go to the shared queue
+        try:
+            async with Aclosing(super().generate_content_async(llm_request, stream)) as responses:
+                async for response in responses:
+                    await queue.put((index, response))
+        except Exception as e:
+            await queue.put((index, e))
+        else:
+            await queue.put((index, _DONE))
+
+    async def _hedged(self, llm_request: LlmRequest, stream: bool) -> AsyncGenerator[LlmResponse, None]:
+        queue = asyncio.Queue()
+        contenders = [asyncio.create_task(self._pump(0, llm_request, stream, queue))]
+        try:
+            try:
+                index, item = await asyncio.wait_for(queue.get(), deadline.HEDGE_AFTER_SECONDS)
+            except TimeoutError:
+                BUDGET_STATS["hedged"] += 1
+                # A copy: the request is completed in place by each call
+                contenders.append(asyncio.create_task(self._pump(1, llm_request.model_copy(deep=True), stream, queue)))
+                index, item = await queue.get()
+            failed = set()
+            while isinstance(item, Exception):
+                failed.add(index)
+                if len(failed) == len(contenders):
+                    raise item
+                index, item = await queue.get()
+            winner = index
+            if winner:
+                BUDGET_STATS["hedge_won"] += 1
+            for i, contender in enumerate(contenders):
+                if i != winner:
+                    contender.cancel()
+            while item is not _DONE:
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+                index, item = await queue.get()
+                while index != winner:
+                    index, item = await queue.get()
+        finally:
+            for contender in contenders:
+                contender.cancel()
+            await asyncio.gather(*contenders, return_exceptions=True)
+
+
+class BudgetedGemini(BudgetedLlm, Gemini):
+    """Gemini whose calls spend from the request's time budget (see BudgetedLlm)."""
+
+#------------------------------------------------------------------
+# Specialist hops and tool calls
+#------------------------------------------------------------------
+async def _within_deadline(call, what: str):
+    try:
+        left = deadline.check(what)
+    except deadline.DeadlineExceeded:
+        call.close()
+        raise
+    if left == float("inf"):
+        return await call
+    try:
+        return await asyncio.wait_for(call, left)
+    except deadline.DeadlineExceeded:
+        raise
+    except TimeoutError as e:
+        raise deadline.DeadlineExceeded(f"The {what} did not finish in time") from e
+
+
+class BudgetedAgentTool(AgentTool):
+    """AgentTool whose run ends deadline.SYNTHESIS_RESERVE_SECONDS before the request's deadline."""
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        with deadline.narrowed(deadline.SYNTHESIS_RESERVE_SECONDS):
+            return await _within_deadline(super().run_async(args=args, tool_context=tool_context),
+                                          f"{self.name} call")
+
+
+class BudgetedTool(BaseTool):
+    """
+    A tool whose calls end at the request's deadline.
+
+    Args:
+        tool: The tool to call (declaration and behaviour are its own).
+    """
+
+    def __init__(self, tool: BaseTool):
+        super().__init__(name=tool.name, description=tool.description, is_long_running=tool.is_long_running)
+        self.tool = tool
+
+    def _get_declaration(self) -> Optional[types.FunctionDeclaration]:
+        return self.tool._get_declaration()
+
+    async def run_async(self, *, args: dict[str, Any], tool_context: ToolContext) -> Any:
+        return await _within_deadline(self.tool.run_async(args=args, tool_context=tool_context),
+                                      f"{self.name} call")
+
+
+class BudgetedToolset(BaseToolset):
+    """
+    A toolset whose tool calls end at the request's deadline.
+
+    Args:
+        toolset: The toolset to wrap; its tool_filter is kept.
+    """
+
+    def __init__(self, toolset: BaseToolset):
+        super().__init__(tool_filter=toolset.tool_filter)
+        self.toolset = toolset
+
+    async def get_tools(self, readonly_context: Optional[ReadonlyContext] = None) -> List[BaseTool]:
+        return [BudgetedTool(tool) for tool in await self.toolset.get_tools(readonly_context)]
+
+    async def close(self) -> None:
+        await self.toolset.close()
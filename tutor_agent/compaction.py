@@ -0,0 +1,199 @@
+"""
+History compaction in front of every model call.
+
+Each turn re-sends the whole conversation, including bulky tool results
+(MaRDI formula JSON, full Wolfram pods), so prompt tokens and model latency
+grow with the length of a session. This before_model_callback caps the
+history sent to the model at a token budget:
+
+1. Tool results older than the most recent turns that are longer than
+   ERIK_COMPACT_RESULT_CHARS are replaced by a short reference; the answer
+   the agent gave from them stays in the history.
+2. If the history is still over ERIK_HISTORY_TOKEN_BUDGET, the oldest turns
+   are dropped and replaced by a short note listing the questions they
+   asked.
+
+The most recent ERIK_KEEP_RECENT_TURNS turns are never touched, and a turn
+is always dropped whole, so function calls stay paired with their
+responses. Only the request to the model changes; the session keeps the
+full history. Token counts are estimates (about 4 characters per token),
+totalled in COMPACTION_STATS as the tokens-saved report.
+"""
+import json
+import logging
+import os
+from collections import Counter
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+
+logger = logging.getLogger(__name__)
+
+COMPACTION_ENABLED = os.getenv("ERIK_COMPACTION", "1").lower() not in ("0", "false", "no")
+HISTORY_TOKEN_BUDGET = int(os.getenv("ERIK_HISTORY_TOKEN_BUDGET", 8000))
+KEEP_RECENT_TURNS = int(os.getenv("ERIK_KEEP_RECENT_TURNS", 2))
+COMPACT_RESULT_CHARS = int(os.getenv("ERIK_COMPACT_RESULT_CHARS", 1000))
+
+CHARS_PER_TOKEN = 4
+# Questions of dropped turns quoted in the summary, and their length
+SUMMARY_QUESTIONS = 10
+SUMMARY_QUESTION_CHARS = 200
+
+# requests, compacted, tokens_in (history as built), tokens_sent (after compaction),
+# results_referenced, turns_dropped
+COMPACTION_STATS = Counter()
+
+#------------------------------------------------------------------
+# Token estimates
+#------------------------------------------------------------------
+def _part_chars(part: types.Part) -> int:
+    if part.text:
+        return len(part.text)
+    if part.function_call:
+        return len(part.function_call.name or "") + len(json.dumps(part.function_call.args or {}, default=str))
+    if part.function_response:
+        return len(part.function_response.name or "") + len(json.dumps(part.function_response.response or {},
+                                                                        default=str))
+    return 0
+
+
+def estimate_tokens(contents: list[types.Content]) -> int:
+    """Rough token count of a list of contents (characters / 4)."""
+    chars = sum(_part_chars(part) for content in contents for part in content.parts or [])
+    return chars // CHARS_PER_TOKEN
+
+#------------------------------------------------------------------
+# Compaction
+#------------------------------------------------------------------
+def _user_question(content: types.Content) -> Optional[str]:
+    """The text of a user message, or None for tool results and model turns."""
+    if content.role != "user" or not content.parts:
+        return None
+    if any(part.function_response for part in content.parts):
+        return None
+    text = "".join(part.text or "" for part in content.parts).strip()
+    return text or None
+
+
+def _reference(part: types.Part) -> types.Part:
+    response = part.function_response
+    size = len(json.dumps(response.response or {}, default=str))
+    return types.Part(function_response=types.FunctionResponse(
+        id=response.id,
+        name=response.name,
+        response={"result": f"[{size} characters of {response.name} output from an earlier turn omitted; "
+                            "the answer given from it follows]"},
+    ))
+
+
+def _reference_old_results(contents: list[types.Content], max_chars: int) -> tuple[list[types.Content], int]:
+    compacted, referenced = [], 0
+    for content in contents:
+        parts = []
+        for part in content.parts or []:
+            if part.function_response and _part_chars(part) > max_chars:
+                part = _reference(part)
+                referenced += 1
+            parts.append(part)
+        compacted.append(types.Content(role=content.role, parts=parts))
+    return compacted, referenced
+
+
+def _summary(questions: list[str]) -> types.Content:
+    quoted = [q if len(q) <= SUMMARY_QUESTION_CHARS else q[:SUMMARY_QUESTION_CHARS] + "..."
+              for q in questions[-SUMMARY_QUESTIONS:]]
+    skipped = len(questions) - len(quoted)
+    lines = [f"[{len(questions)} earlier turns of this conversation were omitted to save space."]
+    if skipped:
+        lines.append(f"The {len(quoted)} most recent of the omitted questions were:")
+    else:
+        lines.append("In them the user asked:")
+    lines += [f"- {q}" for q in quoted]
+    lines.append("Ask the user if you need details from them.]")
+    return types.Content(role="user", parts=[types.Part(text="\n".join(lines))])
+
+
+def compact_history(
+    contents: list[types.Content],
+    budget: int = HISTORY_TOKEN_BUDGET,
+    keep_recent_turns: int = KEEP_RECENT_TURNS,
+    max_result_chars: int = COMPACT_RESULT_CHARS,
+) -> tuple[list[types.Content], dict]:
+    """
+    Fits a conversation into a token budget.
+
+    Args:
+        contents: The conversation as sent to the model, oldest first.
+        budget: Estimated tokens the history may use.
+        keep_recent_turns: Most recent turns (a user message and everything
+            after it) that are always kept as they are.
+        max_result_chars: Older tool results longer than this are replaced
+            by a reference.
+
+    Returns:
+        The contents to send, and counts: tokens_in, tokens_sent,
+        results_referenced, turns_dropped.
+    """
+    tokens_in = estimate_tokens(contents)
+    report = {"tokens_in": tokens_in, "tokens_sent": tokens_in, "results_referenced": 0, "turns_dropped": 0}
+    turn_starts = [i for i, content in enumerate(contents) if _user_question(content) is not None]
+    # The current turn is always kept
+    keep_recent_turns = max(keep_recent_turns, 1)
+    if tokens_in <= budget or len(turn_starts) <= keep_recent_turns:
+        return contents, report
+
+    recent = turn_starts[-keep_recent_turns]
+    old, referenced = _reference_old_results(contents[:recent], max_result_chars)
+    compacted = old + contents[recent:]
+    report["results_referenced"] = referenced
+
+    # Drop whole turns, oldest first, until the rest fits (the note adds at most a few hundred tokens)
+    old_turns = [i for i in turn_starts if i < recent]
+    sizes = [estimate_tokens([content]) for content in compacted]
+    remaining = sum(sizes)
+    dropped_until, dropped = 0, 0
+    for end in old_turns[1:] + [recent]:
+        if remaining <= budget:
+            break
+        remaining -= sum(sizes[dropped_until:end])
+        dropped_until, dropped = end, dropped + 1
+    if dropped:
+        questions = [_user_question(compacted[i]) for i in old_turns[:dropped]]
+        compacted = [_summary(questions)] + compacted[dropped_until:]
+    report["turns_dropped"] = dropped
+    report["tokens_sent"] = estimate_tokens(compacted)
+    return compacted, report
+
+
+def tokens_saved() -> int:
+    """Estimated prompt tokens not sent since startup."""
+    return COMPACTION_STATS["tokens_in"] - COMPACTION_STATS["tokens_sent"]
+
+#------------------------------------------------------------------
+# ADK callback
+#------------------------------------------------------------------
+def compaction_callback(callback_context: CallbackContext, llm_request: LlmRequest) -> Optional[LlmResponse]:
+    """
+    before_model_callback for the tutor's agents.
+
+    Replaces llm_request.contents with the compacted history and returns
+    None, so the model call goes ahead.
+    """
+    if not COMPACTION_ENABLED:
+        return None
+
+    llm_request.contents, report = compact_history(llm_request.contents)
+    COMPACTION_STATS["requests"] += 1
+    COMPACTION_STATS["tokens_in"] += report["tokens_in"]
+    COMPACTION_STATS["tokens_sent"] += report["tokens_sent"]
+    if report["tokens_sent"] < report["tokens_in"]:
+        COMPACTION_STATS["compacted"] += 1
+        COMPACTION_STATS["results_referenced"] += report["results_referenced"]
+        COMPACTION_STATS["turns_dropped"] += report["turns_dropped"]
+        logger.info("agent=%s history %d -> %d tokens (results_referenced=%d turns_dropped=%d) tokens_saved=%d",
+                    callback_context.agent_name, report["tokens_in"], report["tokens_sent"],
+                    report["results_referenced"], report["turns_dropped"], tokens_saved())
+    return None
@@ -0,0 +1,128 @@
+"""
+Deterministic fast path in front of the orchestrator.
+
+Questions like "What is 22 * 100?" are pure arithmetic: routing them through
+root_agent -> calculator_agent -> MCP costs two model round-trips for a
+sub-microsecond computation. This before_agent_callback recognizes
+numeric-only expressions, evaluates them locally with the calculator's
+safe evaluator and answers directly. Everything else falls through to the
+agent tree untouched.
+
+The path taken is recorded in session state under ROUTE_STATE_KEY and
+counted in ROUTE_STATS so the hit rate can be measured.
+"""
+import logging
+import os
+import re
+from collections import Counter
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
+from google.genai import types
+
+from safe_eval import CONSTANTS, FUNCTIONS, ExpressionError, evaluate, format_number, normalize_expression
+
+logger = logging.getLogger(__name__)
+
+FAST_PATH_ENABLED = os.getenv("ERIK_FAST_PATH", "1").lower() not in ("0", "false", "no")
+
+ROUTE_STATE_KEY = "temp:route"
+FAST_PATH = "fast_path"
+AGENT_PATH = "agent"
+
+ROUTE_STATS = Counter()
+
+#------------------------------------------------------------------
+# Question recognition
+#------------------------------------------------------------------
+_LEADING_PHRASE = re.compile(
+    r"^\s*(?:please\s+)?(?:what\s+is|what's|whats|calculate|compute|evaluate|how\s+much\s+is)\s+",
+    re.IGNORECASE,
+)
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.=]+$")
+# "22 x 100" -> "22 * 100" (only between numbers, so variables never match)
+_TIMES_X = re.compile(r"(?<=[\d)])\s*[xX]\s*(?=[\d(])")
+_ARITHMETIC_ONLY = re.compile(r"^[\w\s.,+\-*/()]+$")
+_WORD = re.compile(r"[A-Za-z_]\w*")
+_HAS_OPERATOR = re.compile(r"[\w)]\s*(?:\*\*|[+\-*/])\s*[\w(.\-]|\w\(")
+_KNOWN_WORDS = set(FUNCTIONS) | set(CONSTANTS)
+
+
+def extract_expression(question: str) -> Optional[str]:
+    """
+    Pulls a pure arithmetic expression out of a question.
+
+    Args:
+        question: The user's message, e.g. "What is 22 * 100?".
+
+    Returns:
+        The bare expression ("22 * 100"), or None if the question contains
+        anything other than numbers, arithmetic operators and the
+        calculator's functions and constants.
+    """
+    if not question:
+        return None
+    text = _LEADING_PHRASE.sub("", question)
+    text = _TRAILING_PUNCTUATION.sub("", text)
+    text = _TIMES_X.sub(" * ", text)
+    expression = normalize_expression(text)
+    if not _ARITHMETIC_ONLY.match(expression) or not _HAS_OPERATOR.search(expression):
+        return None
+    if any(word not in _KNOWN_WORDS for word in _WORD.findall(expression)):
+        return None
+    return " ".join(text.split())
+
+
+def try_fast_path(question: str) -> Optional[str]:
+    """
+    Answers a pure arithmetic question locally.
+
+    Args:
+        question: The user's message.
+
+    Returns:
+        The answer text, or None if the question must go to the agents.
+    """
+    expression = extract_expression(question)
+    if expression is None:
+        return None
+    try:
+        return f"{expression} = {format_number(evaluate(expression))}"
+    except (ExpressionError, ArithmeticError, TypeError, ValueError):
+        # e.g. division by zero or a result too large to print: let the tutor explain instead
+        return None
+
+
+def hit_rate() -> float:
+    """Fraction of questions answered by the fast path since startup."""
+    total = sum(ROUTE_STATS.values())
+    return ROUTE_STATS[FAST_PATH] / total if total else 0.0
+
+#------------------------------------------------------------------
+# ADK callback
+#------------------------------------------------------------------
+def _user_text(content: Optional[types.Content]) -> str:
+    if not content or not content.parts:
+        return ""
+    return "".join(part.text or "" for part in content.parts)
+
+
+def fast_path_callback(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    before_agent_callback for root_agent.
+
+    Returns the answer as model content for pure arithmetic (which makes ADK
+    skip the agent run), otherwise None so the orchestrator runs as usual.
+    """
+    if not FAST_PATH_ENABLED:
+        return None
+
+    answer = try_fast_path(_user_text(callback_context.user_content))
+    route = FAST_PATH if answer is not None else AGENT_PATH
+    ROUTE_STATS[route] += 1
+    callback_context.state[ROUTE_STATE_KEY] = route
+    logger.info("route=%s hit_rate=%.2f", route, hit_rate())
+
+    if answer is None:
+        return None
+    return types.Content(role="model", parts=[types.Part(text=answer)])
@@ -0,0 +1,457 @@
+"""
+Persistent, memory-bounded session service for the tutor and the A2A server.
+
+ADK's InMemorySessionService keeps every session of every user for the life
+of the process and forgets them all on restart. SQLiteSessionService keeps
+sessions in a SQLite file (WAL mode) and only the recently used ones in
+memory:
+
+    hot tier  - an LRU of at most ERIK_SESSION_CACHE_SIZE sessions; sessions
+                idle for longer than ERIK_SESSION_IDLE_SECONDS are dropped
+                from it (not from the database)
+    writes    - appended events and state changes are queued and written in
+                one transaction per ERIK_SESSION_BATCH_SIZE events, or after
+                ERIK_SESSION_FLUSH_SECONDS, whichever comes first
+
+A session that is not in the hot tier is loaded from the database on its
+next request, so memory stays flat however many sessions the server has
+seen. Reads always see queued writes: a miss on a session with queued
+changes flushes the queue first.
+
+    runner = Runner(app_name="tutor_agent", agent=root_agent, session_service=session_service())
+"""
+import atexit
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Optional
+
+from google.adk.errors.already_exists_error import AlreadyExistsError
+from google.adk.events.event import Event
+from google.adk.sessions.base_session_service import BaseSessionService, GetSessionConfig, ListSessionsResponse
+from google.adk.sessions.session import Session
+from google.adk.sessions.state import State
+
+logger = logging.getLogger(__name__)
+
+#------------------------------------------------------------------
+# Configuration
+#------------------------------------------------------------------
+DEFAULT_SESSION_DIR = os.getenv("ERIK_CACHE_DIR", os.path.join(os.path.expanduser("~"), ".cache", "erik"))
+SESSION_DB_PATH = os.getenv("ERIK_SESSION_DB", os.path.join(DEFAULT_SESSION_DIR, "sessions.sqlite3"))
+SESSION_CACHE_SIZE = int(os.getenv("ERIK_SESSION_CACHE_SIZE", 256))
+SESSION_IDLE_SECONDS = float(os.getenv("ERIK_SESSION_IDLE_SECONDS", 30 * 60))
+SESSION_BATCH_SIZE = int(os.getenv("ERIK_SESSION_BATCH_SIZE", 32))
+SESSION_FLUSH_SECONDS = float(os.getenv("ERIK_SESSION_FLUSH_SECONDS", 1.0))
+
+SessionKey = tuple[str, str, str]  # (app_name, user_id, session_id)
+
+
+def _split_state(state: Optional[dict[str, Any]]) -> tuple[dict, dict, dict]:
+    """Splits a state dict into app, user and session state (temp: keys are dropped)."""
+    app, user, session = {}, {}, {}
+    for key, value in (state or {}).items():
+        if key.startswith(State.APP_PREFIX):
+            app[key.removeprefix(State.APP_PREFIX)] = value
+        elif key.startswith(State.USER_PREFIX):
+            user[key.removeprefix(State.USER_PREFIX)] = value
+        elif not key.startswith(State.TEMP_PREFIX):
+            session[key] = value
+    return app, user, session
+
+#------------------------------------------------------------------
+# Hot tier
+#------------------------------------------------------------------
+class LRUCache:
+    """
+    Size-capped LRU map that also drops entries idle for too long.
+
+    Args:
+        max_entries: Size cap; least recently used entries beyond it are dropped.
+        idle_seconds: Entries not used for this long are dropped.
+    """
+
+    def __init__(self, max_entries: int, idle_seconds: float):
+        self.max_entries = max_entries
+        self.idle_seconds = idle_seconds
+        self.evictions = 0
+        self._entries: OrderedDict = OrderedDict()  # key -> (last_used, value), oldest first
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries[key] = (time.monotonic(), entry[1])
+        self._entries.move_to_end(key)
+        return entry[1]
+
+    def put(self, key, value) -> None:
+        self._entries[key] = (time.monotonic(), value)
+        self._entries.move_to_end(key)
+        self.evict()
+
+    def pop(self, key) -> None:
+        self._entries.pop(key, None)
+
+    def evict(self) -> None:
+        """Drops idle entries and entries beyond the cap, oldest first."""
+        idle_before = time.monotonic() - self.idle_seconds
+        while self._entries:
+            key, (last_used, _) = next(iter(self._entries.items()))
+            if len(self._entries) <= self.max_entries and last_used >= idle_before:
+                break
+            del self._entries[key]
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+#------------------------------------------------------------------
+# Session service
+#------------------------------------------------------------------
+class SQLiteSessionService(BaseSessionService):
+    """
+    ADK session service backed by SQLite, with an LRU hot tier and batched writes.
+
+    Args:
+        path: Location of the SQLite file (created if missing).
+        max_cached: Most sessions kept in memory.
+        idle_seconds: Sessions unused for this long are dropped from memory.
+        batch_size: Queued events that trigger a write.
+        flush_seconds: Longest time a queued event waits to be written.
+    """
+
+    def __init__(
+        self,
+        path: str = SESSION_DB_PATH,
+        max_cached: int = SESSION_CACHE_SIZE,
+        idle_seconds: float = SESSION_IDLE_SECONDS,
+        batch_size: int = SESSION_BATCH_SIZE,
+        flush_seconds: float = SESSION_FLUSH_SECONDS,
+    ):
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.hits = 0
+        self.misses = 0
+        self.flushes = 0
+
+        self._sessions = LRUCache(max_cached, idle_seconds)
+        self._user_states = LRUCache(max_cached, idle_seconds)
+        self._app_states: dict[str, dict] = {}
+
+        # Queued writes, coalesced per row; events in order
+        self._pending_events: list[tuple] = []
+        self._pending_sessions: dict[SessionKey, tuple[str, float]] = {}
+        self._pending_user_states: dict[tuple[str, str], str] = {}
+        self._pending_app_states: dict[str, str] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        if path != ":memory:":
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript("""
+            CREATE TABLE IF NOT EXISTS sessions (
+                app_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                last_update_time REAL NOT NULL,
+                PRIMARY KEY (app_name, user_id, session_id)
+            );
+            CREATE TABLE IF NOT EXISTS events (
+                app_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                session_id TEXT NOT NULL,
+                timestamp REAL NOT NULL,
+                event TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS events_session ON events(app_name, user_id, session_id);
+            CREATE TABLE IF NOT EXISTS user_states (
+                app_name TEXT NOT NULL,
+                user_id TEXT NOT NULL,
+                state TEXT NOT NULL,
+                PRIMARY KEY (app_name, user_id)
+            );
+            CREATE TABLE IF NOT EXISTS app_states (
+                app_name TEXT PRIMARY KEY,
+                state TEXT NOT NULL
+            );
+        """)
+        self._conn.commit()
+        # Queued writes must not be lost when the process exits between flushes
+        atexit.register(self.flush)
+
+    #--------------------------------------------------------------
+    # Database access
+    #--------------------------------------------------------------
+    def flush(self) -> None:
+        """Writes every queued event and state change in one transaction."""
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not (self._pending_events or self._pending_sessions or self._pending_user_states
+                or self._pending_app_states):
+            return
+        events, self._pending_events = self._pending_events, []
+        sessions, self._pending_sessions = self._pending_sessions, {}
+        user_states, self._pending_user_states = self._pending_user_states, {}
+        app_states, self._pending_app_states = self._pending_app_states, {}
+        with self._lock, self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO sessions (app_name, user_id, session_id, state, last_update_time) "
+                "VALUES (?, ?, ?, ?, ?)",
+                [(*key, state, updated) for key, (state, updated) in sessions.items()],
+            )
+            self._conn.executemany(
+                "INSERT INTO events (app_name, user_id, session_id, timestamp, event) VALUES (?, ?, ?, ?, ?)",
+                events,
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO user_states (app_name, user_id, state) VALUES (?, ?, ?)",
+                [(*key, state) for key, state in user_states.items()],
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO app_states (app_name, state) VALUES (?, ?)",
+                list(app_states.items()),
+            )
+        self.flushes += 1
+
+    def _schedule_flush(self) -> None:
+        if len(self._pending_events) >= self.batch_size:
+            self.flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.flush_seconds, self.flush)
+
+    def _load_session(self, key: SessionKey, events: bool = True) -> Optional[Session]:
+        """Reads a session from the database; with events=False only its state, not its history."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT state, last_update_time FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?",
+                key,
+            ).fetchone()
+            if row is None:
+                return None
+            rows = self._conn.execute(
+                "SELECT event FROM events WHERE app_name = ? AND user_id = ? AND session_id = ? ORDER BY rowid",
+                key,
+            ).fetchall() if events else []
+        return Session(
+            app_name=key[0], user_id=key[1], id=key[2],
+            state=json.loads(row[0]),
+            events=[Event.model_validate_json(event) for (event,) in rows],
+            last_update_time=row[1],
+        )
+
+    def _stored_session(self, key: SessionKey) -> Optional[Session]:
+        """The hot-tier copy of a session, loaded from the database on a miss."""
+        self._sessions.evict()
+        session = self._sessions.get(key)
+        if session is not None:
+            self.hits += 1
+            return session
+        self.misses += 1
+        if key in self._pending_sessions:
+            self.flush()
+        session = self._load_session(key)
+        if session is not None:
+            self._sessions.put(key, session)
+        return session
+
+    def _session_for_append(self, key: SessionKey) -> Optional[Session]:
+        """
+        The stored session an event is appended to.
+
+        Without a hot tier (ERIK_SESSION_CACHE_SIZE=0, several workers) a miss
+        would reload the whole history for every event; appending only needs
+        the state, so only the session row is read.
+        """
+        if self._sessions.max_entries > 0:
+            return self._stored_session(key)
+        if key in self._pending_sessions:
+            self.flush()
+        return self._load_session(key, events=False)
+
+    def _app_state(self, app_name: str) -> dict:
+        state = self._app_states.get(app_name)
+        if state is None:
+            with self._lock:
+                row = self._conn.execute("SELECT state FROM app_states WHERE app_name = ?", (app_name,)).fetchone()
+            state = self._app_states[app_name] = json.loads(row[0]) if row else {}
+        return state
+
+    def _user_state(self, app_name: str, user_id: str) -> dict:
+        state = self._user_states.get((app_name, user_id))
+        if state is None:
+            if (app_name, user_id) in self._pending_user_states:
+                self.flush()
+            with self._lock:
+                row = self._conn.execute(
+                    "SELECT state FROM user_states WHERE app_name = ? AND user_id = ?", (app_name, user_id)
+                ).fetchone()
+            state = json.loads(row[0]) if row else {}
+            self._user_states.put((app_name, user_id), state)
+        return state
+
+    def _update_shared_state(self, app_name: str, user_id: str, app_delta: dict, user_delta: dict) -> None:
+        if app_delta:
+            state = self._app_state(app_name)
+            state.update(app_delta)
+            self._pending_app_states[app_name] = json.dumps(state)
+        if user_delta:
+            state = self._user_state(app_name, user_id)
+            state.update(user_delta)
+            self._pending_user_states[(app_name, user_id)] = json.dumps(state)
+
+    def _queue_session(self, key: SessionKey, session: Session) -> None:
+        self._pending_sessions[key] = (json.dumps(session.state), session.last_update_time)
+
+    def _view(self, session: Session, events: bool = True) -> Session:
+        """
+        A copy of a stored session for the caller, with app and user state merged in.
+
+        Events are immutable once appended, so the copy shares them instead of
+        deep-copying the whole history on every request.
+        """
+        state = dict(session.state)
+        for key, value in self._app_state(session.app_name).items():
+            state[State.APP_PREFIX + key] = value
+        for key, value in self._user_state(session.app_name, session.user_id).items():
+            state[State.USER_PREFIX + key] = value
+        return Session(
+            app_name=session.app_name, user_id=session.user_id, id=session.id,
+            state=state, events=list(session.events) if events else [],
+            last_update_time=session.last_update_time,
+        )
+
+    #--------------------------------------------------------------
+    # BaseSessionService
+    #--------------------------------------------------------------
+    async def create_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        state: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+    ) -> Session:
+        session_id = session_id.strip() if session_id and session_id.strip() else str(uuid.uuid4())
+        key = (app_name, user_id, session_id)
+        if self._stored_session(key) is not None:
+            raise AlreadyExistsError(f"Session with id {session_id} already exists.")
+        app_delta, user_delta, session_state = _split_state(state)
+        self._update_shared_state(app_name, user_id, app_delta, user_delta)
+        session = Session(app_name=app_name, user_id=user_id, id=session_id, state=session_state,
+                          last_update_time=time.time())
+        self._sessions.put(key, session)
+        self._queue_session(key, session)
+        self._schedule_flush()
+        return self._view(session)
+
+    async def get_session(
+        self,
+        *,
+        app_name: str,
+        user_id: str,
+        session_id: str,
+        config: Optional[GetSessionConfig] = None,
+    ) -> Optional[Session]:
+        stored = self._stored_session((app_name, user_id, session_id))
+        if stored is None:
+            return None
+        session = self._view(stored)
+        if config:
+            if config.num_recent_events:
+                session.events = session.events[-config.num_recent_events:]
+            if config.after_timestamp:
+                session.events = [e for e in session.events if e.timestamp >= config.after_timestamp]
+        return session
+
+    async def list_sessions(self, *, app_name: str, user_id: Optional[str] = None) -> ListSessionsResponse:
+        self.flush()
+        query = "SELECT user_id, session_id, state, last_update_time FROM sessions WHERE app_name = ?"
+        params = [app_name]
+        if user_id is not None:
+            query += " AND user_id = ?"
+            params.append(user_id)
+        with self._lock:
+            rows = self._conn.execute(query, params).fetchall()
+        sessions = [
+            self._view(Session(app_name=app_name, user_id=user, id=session_id, state=json.loads(state),
+                               last_update_time=updated), events=False)
+            for user, session_id, state, updated in rows
+        ]
+        return ListSessionsResponse(sessions=sessions)
+
+    async def delete_session(self, *, app_name: str, user_id: str, session_id: str) -> None:
+        key = (app_name, user_id, session_id)
+        self.flush()
+        self._sessions.pop(key)
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM events WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+            self._conn.execute("DELETE FROM sessions WHERE app_name = ? AND user_id = ? AND session_id = ?", key)
+
+    async def append_event(self, session: Session, event: Event) -> Event:
+        if event.partial:
+            return event
+        key = (session.app_name, session.user_id, session.id)
+        stored = self._session_for_append(key)
+        if stored is None:
+            logger.warning("Failed to append event to session %s: session not found", session.id)
+            return event
+
+        # Updates the caller's copy (and drops temp: state from the event)
+        await super().append_event(session=session, event=event)
+        session.last_update_time = event.timestamp
+
+        stored.events.append(event)
+        stored.last_update_time = event.timestamp
+        if event.actions and event.actions.state_delta:
+            app_delta, user_delta, session_delta = _split_state(event.actions.state_delta)
+            self._update_shared_state(session.app_name, session.user_id, app_delta, user_delta)
+            stored.state.update(session_delta)
+        self._pending_events.append((*key, event.timestamp, event.model_dump_json(exclude_none=True)))
+        self._queue_session(key, stored)
+        self._schedule_flush()
+        return event
+
+    async def close(self) -> None:
+        """Writes queued changes and closes the database."""
+        self.flush()
+        atexit.unregister(self.flush)
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> dict:
+        """Hot-tier hit/miss counters, evictions and the number of sessions in memory."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "cached_sessions": len(self._sessions),
+            "max_cached": self._sessions.max_entries,
+            "evictions": self._sessions.evictions,
+            "flushes": self.flushes,
+            "pending_events": len(self._pending_events),
+        }
+
+
+_session_service: Optional[SQLiteSessionService] = None
+
+
+def session_service() -> SQLiteSessionService:
+    """Returns the process-wide session service (created once)."""
+    global _session_service
+    if _session_service is None:
+        _session_service = SQLiteSessionService()
+    return _session_service
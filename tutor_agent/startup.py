@@ -0,0 +1,62 @@
+"""
+Startup-time accounting for the tutor agent.
+
+agent.py and toolsets.py wrap their imports and the construction of each
+component in `timed(...)`. Components built lazily are recorded when they
+are first used. The report shows where a cold start spends its time:
+
+    python -m tutor_agent.startup                       # import the agent, print the report
+    ERIK_STARTUP_REPORT=1 adk web ...                   # log the report after import
+    python tests/benchmarks/bench_startup.py            # fresh-process report + tool-server handshakes
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+
+logger = logging.getLogger(__name__)
+
+STARTUP_REPORT = os.getenv("ERIK_STARTUP_REPORT", "0").lower() in ("1", "true", "yes")
+
+# (component, phase, seconds) in the order they happened
+TIMINGS: list[tuple[str, str, float]] = []
+
+
+@contextmanager
+def timed(component: str, phase: str = "init"):
+    """
+    Records how long the body takes as one startup component.
+
+    Args:
+        component: What is being imported or built, e.g. "google.adk".
+        phase: "import", "init" or "first use".
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        TIMINGS.append((component, phase, time.perf_counter() - start))
+
+
+def report() -> str:
+    """Formats the recorded timings as a table, slowest component first."""
+    lines = [f"{'component':<40}{'phase':<12}{'ms':>10}"]
+    for component, phase, seconds in sorted(TIMINGS, key=lambda t: -t[2]):
+        lines.append(f"{component:<40}{phase:<12}{seconds * 1000:>10.1f}")
+    lines.append(f"{'total':<52}{sum(t[2] for t in TIMINGS) * 1000:>10.1f}")
+    return "\n".join(lines)
+
+
+def log_report() -> None:
+    """Logs the report if ERIK_STARTUP_REPORT is set."""
+    if STARTUP_REPORT:
+        logger.info("Startup time by component:\n%s", report())
+
+
+if __name__ == "__main__":
+    # Run as a script this module is __main__; agent.py records its timings in
+    # tutor_agent.startup
+    import tutor_agent.agent
+    from tutor_agent.startup import report as agent_report
+
+    print(agent_report())
@@ -0,0 +1,212 @@
+"""
+Streaming of partial model output, for the REPL, the A2A server and its clients.
+
+With ERIK_STREAMING=1 (the default) the agents run in SSE streaming mode:
+the model's answer arrives as partial events of a few words each, followed
+by the complete answer, so the first words show up after the model's
+time-to-first-token instead of after the whole answer. Tool calls (the
+specialists, in tools mode) and their results are events of their own and
+show up as progress lines while the specialists work.
+
+    run_config()          RunConfig for Runner.run_async
+    to_streaming_a2a()    to_a2a() whose agent runs in streaming mode and whose
+                          agent card advertises streaming, so A2A clients can
+                          use message/stream (server-sent events); status
+                          updates carrying partial text are marked with
+                          PARTIAL_METADATA_KEY; the agent card is served with
+                          an ETag and Last-Modified, so clients can revalidate
+                          a cached copy (304 Not Modified)
+    print_events()        prints a run's events as they arrive
+
+Partial events are never stored in the session; the complete answer is.
+"""
+import hashlib
+import json
+import os
+import sys
+import time
+from email.utils import formatdate, parsedate_to_datetime
+from typing import AsyncIterator, Optional, TextIO
+
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
+from google.adk.events.event import Event
+from google.adk.runners import Runner
+
+
+STREAMING_ENABLED = os.getenv("ERIK_STREAMING", "1").lower() not in ("0", "false", "no")
+
+# A2A status-update metadata flag on chunks of partial text (ADK's "adk_" metadata prefix)
+PARTIAL_METADATA_KEY = "adk_partial"
+
+# Longest tool-call arguments shown in a progress line
+PROGRESS_ARGS_CHARS = 80
+
+
+def run_config() -> RunConfig:
+    """RunConfig that streams partial model output if ERIK_STREAMING is on."""
+    return RunConfig(streaming_mode=StreamingMode.SSE if STREAMING_ENABLED else StreamingMode.NONE)
+
+#------------------------------------------------------------------
+# A2A server
+# (a2a-sdk is imported with the server only; local runs do not need it)
+#------------------------------------------------------------------
+def streaming_request_converter(request, part_converter):
+    """A2A request converter that runs the agent with run_config()'s streaming mode."""
+    from google.adk.a2a.converters.request_converter import convert_a2a_request_to_agent_run_request
+
+    run_request = convert_a2a_request_to_agent_run_request(request, part_converter)
+    run_request.run_config.streaming_mode = run_config().streaming_mode
+    return run_request
+
+
+def partial_event_converter(event: Event, invocation_context, task_id=None, context_id=None, *args, **kwargs):
+    """
+    ADK-to-A2A event converter that marks status updates carrying partial text.
+
+    Lets clients tell a chunk of the answer from the complete answer that
+    follows it (both are "working" status updates).
+    """
+    from a2a.types import TaskStatusUpdateEvent
+    from google.adk.a2a.converters.event_converter import convert_event_to_a2a_events
+
+    a2a_events = convert_event_to_a2a_events(event, invocation_context, task_id, context_id, *args, **kwargs)
+    if event.partial:
+        for a2a_event in a2a_events:
+            if isinstance(a2a_event, TaskStatusUpdateEvent):
+                a2a_event.metadata = {**(a2a_event.metadata or {}), PARTIAL_METADATA_KEY: True}
+    return a2a_events
+
+
+def _card_endpoint(agent_card):
+    """GET handler for the agent card that answers conditional requests with 304 Not Modified."""
+    from starlette.responses import Response
+
+    body = json.dumps(agent_card.model_dump(exclude_none=True, by_alias=True)).encode()
+    modified = int(time.time())
+    headers = {
+        # Same card, same ETag: workers started at different times agree on it
+        "ETag": f'"{hashlib.sha256(body).hexdigest()[:32]}"',
+        "Last-Modified": formatdate(modified, usegmt=True),
+        # Clients may cache the card but revalidate it before use
+        "Cache-Control": "no-cache",
+    }
+
+    def not_modified(request) -> bool:
+        if "if-none-match" in request.headers:
+            tags = [tag.strip().removeprefix("W/") for tag in request.headers["if-none-match"].split(",")]
+            return headers["ETag"] in tags or "*" in tags
+        try:
+            return parsedate_to_datetime(request.headers["if-modified-since"]).timestamp() >= modified
+        except (KeyError, TypeError, ValueError):
+            return False
+
+    async def get_agent_card(request):
+        if not_modified(request):
+            return Response(status_code=304, headers=headers)
+        return Response(body, media_type="application/json", headers=headers)
+
+    return get_agent_card
+
+
+def to_streaming_a2a(agent: BaseAgent, *, runner: Runner, host: str = "localhost", port: int = 8000,
+                     protocol: str = "http"):
+    """
+    Like google.adk's to_a2a(), with the agent running in streaming mode.
+
+    Args:
+        agent: The root agent to serve.
+        runner: The runner (session, memory, ... services) the requests run in.
+        host: Host of the RPC URL in the agent card.
+        port: Port of the RPC URL in the agent card.
+        protocol: Protocol of the RPC URL in the agent card.
+
+    Returns:
+        A Starlette application to run with uvicorn.
+    """
+    from a2a.server.apps import A2AStarletteApplication
+    from a2a.server.request_handlers import DefaultRequestHandler
+    from a2a.server.tasks import InMemoryTaskStore
+    from a2a.types import AgentCapabilities
+    from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+    from google.adk.a2a.executor.a2a_agent_executor import A2aAgentExecutor, A2aAgentExecutorConfig
+    from google.adk.a2a.utils.agent_card_builder import AgentCardBuilder
+    from starlette.applications import Starlette
+
+    executor = A2aAgentExecutor(runner=runner, config=A2aAgentExecutorConfig(
+        request_converter=streaming_request_converter,
+        event_converter=partial_event_converter,
+    ))
+    request_handler = DefaultRequestHandler(agent_executor=executor, task_store=InMemoryTaskStore())
+    # The card builder reads the instruction as text; an instruction provider
+    # (prompt_instruction) is only resolved per request, so such an agent is
+    # described by its description alone
+    card_agent = agent
+    if callable(getattr(agent, "instruction", None)):
+        card_agent = agent.model_copy(update={"instruction": ""})
+    card_builder = AgentCardBuilder(
+        agent=card_agent,
+        rpc_url=f"{protocol}://{host}:{port}/",
+        capabilities=AgentCapabilities(streaming=STREAMING_ENABLED),
+    )
+    app = Starlette()
+
+    # The agent card is built (and the A2A routes added) when the server starts
+    async def setup_a2a():
+        agent_card = await card_builder.build()
+        # Added first, so it takes precedence over the A2A application's card route
+        app.add_route(AGENT_CARD_WELL_KNOWN_PATH, _card_endpoint(agent_card), methods=["GET"])
+        A2AStarletteApplication(agent_card=agent_card, http_handler=request_handler).add_routes_to_app(app)
+
+    app.add_event_handler("startup", setup_a2a)
+    return app
+
+#------------------------------------------------------------------
+# Console output
+#------------------------------------------------------------------
+def _text(event: Event) -> str:
+    if not event.content or not event.content.parts:
+        return ""
+    return "".join(part.text for part in event.content.parts if part.text and not part.thought)
+
+
+def _short(args: Optional[dict]) -> str:
+    text = ", ".join(f"{key}={value!r}" for key, value in (args or {}).items())
+    return text if len(text) <= PROGRESS_ARGS_CHARS else text[:PROGRESS_ARGS_CHARS] + "..."
+
+
+async def print_events(events: AsyncIterator[Event], out: TextIO = sys.stdout) -> str:
+    """
+    Prints a run's events as they arrive: partial text as it streams in, and
+    a progress line for each tool call and result.
+
+    Args:
+        events: The events of Runner.run_async.
+        out: Where to print.
+
+    Returns:
+        The final answer.
+    """
+    answer = ""
+    streamed = False
+    async for event in events:
+        text = _text(event)
+        if event.partial and text:
+            out.write(text)
+            out.flush()
+            streamed = True
+        if not event.partial and streamed:
+            # The complete version of the text just streamed
+            out.write("\n")
+        for call in event.get_function_calls():
+            out.write(f"  -> {call.name}({_short(call.args)})\n")
+        for response in event.get_function_responses():
+            out.write(f"  <- {response.name}\n")
+        if not event.partial:
+            if event.is_final_response() and text:
+                answer = text
+                if not streamed:
+                    out.write(text + "\n")
+            streamed = False
+        out.flush()
+    return answer
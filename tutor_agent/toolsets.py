@@ -0,0 +1,251 @@
+"""
+MCP toolsets for the tutor's sub-agents.
+
+By default every tool is served by the consolidated tool-chest server
+(mcp_tool_chest/tool_chest.py): one MCP connection and one server process
+per agent process, shared by all sub-agents, each of which only sees the
+tools in its filter. Set ERIK_TOOL_SERVERS=separate to go back to one
+server process per tool server.
+
+ERIK_MCP_TRANSPORT selects how the servers are reached:
+    stdio     - each agent process starts its own server subprocess (default)
+    http      - connect to long-lived streamable-HTTP servers (see
+                mcp_tool_chest/transport.py) shared by all agent workers, at
+                ERIK_MCP_URL, or ERIK_MCP_URL_<SERVER> (e.g. ERIK_MCP_URL_WOLFRAM_TOOLS)
+                per server with ERIK_TOOL_SERVERS=separate
+    inprocess - no MCP hop at all: the tool functions are imported and called
+                directly as FunctionTools with the same names and schemas
+                (single-node deployments such as the Cloud Run container)
+"""
+import os
+import sys
+from typing import List, Optional
+
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.base_toolset import BaseToolset
+from google.adk.tools.function_tool import FunctionTool
+from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams, StreamableHTTPConnectionParams
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+from google.genai import types
+from mcp import StdioServerParameters
+from mcp.client.stdio import get_default_environment
+
+from telemetry import TRACING_ENABLED
+
+from .budget import BudgetedToolset
+from .startup import timed
+
+# ADK's own JSON-schema conversion (private, as of google-adk 1.18) declares the
+# in-process tools exactly like McpTool does; without it, the JSON schema is
+# passed to the model as is (parameters_json_schema)
+try:
+    from google.adk.tools._gemini_schema_util import _to_gemini_schema
+except ImportError:
+    _to_gemini_schema = None
+
+#------------------------------------------------------------------
+# Configuration
+#------------------------------------------------------------------
+TOOL_SERVER_MODES = ("chest", "separate")
+TOOL_SERVER_MODE = os.getenv("ERIK_TOOL_SERVERS", "chest")
+
+MCP_TRANSPORTS = ("stdio", "http", "inprocess")
+MCP_TRANSPORT = os.getenv("ERIK_MCP_TRANSPORT", "stdio")
+MCP_URL = os.getenv("ERIK_MCP_URL", "http://127.0.0.1:8765/mcp")
+
+TOOL_CHEST_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "mcp_tool_chest")
+TOOL_CHEST_SERVER = "tool_chest.py"
+
+# Tools each sub-agent may call, and the tool server that provides them
+AGENT_TOOLS = {
+    "wolfram_agent": ("wolfram_tools.py", ["wolfram_query"]),
+    "mardi_agent": ("mardi_tools.py", ["mardi_query"]),
+    "calculator_agent": ("calculator.py", ["add", "subtract", "multiply", "divide", "power", "sqrt",
+                                           "evaluate_expression", "batch_calculate"]),
+    "web_search_agent": ("duckduckgo_tools.py", ["web_search"]),
+}
+
+MCP_TIMEOUT_SECONDS = float(os.getenv("ERIK_MCP_TIMEOUT", 60))
+
+# Variables passed on to stdio tool servers besides the MCP client's defaults
+# (HOME, PATH, ...): their configuration, their trace export (OTEL_*, see
+# telemetry.py), their log lines and what their outbound HTTP needs behind a
+# proxy or a private CA. Anything else (GOOGLE_API_KEY, ...) stays in the
+# agent process
+SERVER_ENV_PREFIXES = ("WOLFRAM_", "MARDI_", "TOOL_HTTP_", "ERIK_", "OTEL_")
+SERVER_ENV_NAMES = (
+    "WEB_SEARCH_URL", "MCP_LOG_LEVEL",
+    "HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "NO_PROXY", "http_proxy", "https_proxy", "all_proxy", "no_proxy",
+    "SSL_CERT_FILE", "SSL_CERT_DIR", "REQUESTS_CA_BUNDLE",
+)
+
+
+def server_env() -> dict:
+    """The environment of a stdio tool server: the agent's tool-server variables only."""
+    env = get_default_environment()
+    env.update((name, value) for name, value in os.environ.items()
+               if name in SERVER_ENV_NAMES or name.startswith(SERVER_ENV_PREFIXES))
+    return env
+
+
+def _server_url(server_script: str) -> str:
+    if server_script == TOOL_CHEST_SERVER:
+        return MCP_URL
+    name = os.path.splitext(server_script)[0].upper()
+    url = os.getenv(f"ERIK_MCP_URL_{name}")
+    if not url:
+        raise ValueError(f"ERIK_MCP_URL_{name} must be set for ERIK_MCP_TRANSPORT=http with separate servers")
+    return url
+
+
+def _mcp_toolset(server_script: str, tool_filter: Optional[List[str]] = None) -> McpToolset:
+    if MCP_TRANSPORT not in MCP_TRANSPORTS:
+        raise ValueError(f"ERIK_MCP_TRANSPORT must be one of {MCP_TRANSPORTS}, got {MCP_TRANSPORT!r}")
+    if MCP_TRANSPORT == "http":
+        connection_params = StreamableHTTPConnectionParams(
+            url=_server_url(server_script),
+            timeout=MCP_TIMEOUT_SECONDS,
+        )
+    else:
+        connection_params = StdioConnectionParams(
+            server_params=StdioServerParameters(
+                command="python",
+                args=["-u", os.path.join(TOOL_CHEST_DIR, server_script)],
+                # Added to the few variables the MCP client passes by default (HOME, PATH, ...)
+                env=server_env(),
+            ),
+            timeout=MCP_TIMEOUT_SECONDS,
+        )
+    # With tracing on, the tool servers' spans join the agent's trace (tracing.py)
+    if TRACING_ENABLED:
+        from .tracing import TracedMcpToolset
+    toolset_class = TracedMcpToolset if TRACING_ENABLED else McpToolset
+    return toolset_class(connection_params=connection_params, tool_filter=tool_filter)
+
+#------------------------------------------------------------------
+# In-process tools (no MCP)
+#------------------------------------------------------------------
+class ToolChestFunctionTool(FunctionTool):
+    """
+    Calls a tool-chest function directly, declared exactly like its MCP tool.
+
+    The declaration is built from the same JSON schema the MCP server
+    advertises, so the model sees the same name, description and parameters
+    in every transport mode.
+
+    Args:
+        tool: The FastMCP tool registered on the tool chest.
+    """
+
+    def __init__(self, tool):
+        # The tool chest already runs blocking tools in worker threads
+        super().__init__(tool.fn)
+        self.name = tool.name
+        self.description = tool.description
+        self._input_schema = tool.parameters
+
+    def _get_declaration(self) -> types.FunctionDeclaration:
+        if _to_gemini_schema is None:
+            return types.FunctionDeclaration(
+                name=self.name,
+                description=self.description,
+                parameters_json_schema=self._input_schema,
+            )
+        return types.FunctionDeclaration(
+            name=self.name,
+            description=self.description,
+            parameters=_to_gemini_schema(self._input_schema),
+        )
+
+
+class InProcessToolset(BaseToolset):
+    """
+    Tool-chest functions as FunctionTools, without an MCP server.
+
+    Args:
+        tool_filter: Names of the tools to expose.
+    """
+
+    def __init__(self, tool_filter: List[str]):
+        super().__init__(tool_filter=tool_filter)
+        self._tools = None
+
+    async def get_tools(self, readonly_context: Optional[ReadonlyContext] = None) -> List[BaseTool]:
+        if self._tools is None:
+            if TOOL_CHEST_DIR not in sys.path:
+                sys.path.insert(0, TOOL_CHEST_DIR)
+            with timed("tool chest (in-process)", "first use"):
+                import tool_chest
+
+            self._tools = [ToolChestFunctionTool(tool) for tool in tool_chest.mcp._tool_manager.list_tools()]
+        return [tool for tool in self._tools if self._is_tool_selected(tool, readonly_context)]
+
+#------------------------------------------------------------------
+# Shared tool-chest connection with per-agent views
+#------------------------------------------------------------------
+class FilteredToolset(BaseToolset):
+    """
+    A per-agent view of a shared toolset.
+
+    All views of one toolset use its single MCP session; each view only
+    returns the tools in its filter.
+
+    Args:
+        toolset: The shared toolset.
+        tool_filter: Names of the tools this view exposes.
+    """
+
+    def __init__(self, toolset: BaseToolset, tool_filter: List[str]):
+        super().__init__(tool_filter=tool_filter)
+        self.toolset = toolset
+
+    async def get_tools(self, readonly_context: Optional[ReadonlyContext] = None) -> List[BaseTool]:
+        if id(self.toolset) in _connected:
+            tools = await self.toolset.get_tools(readonly_context)
+        else:
+            # The first call starts (or connects to) the tool chest
+            with timed(f"tool chest connect ({MCP_TRANSPORT})", "first use"):
+                tools = await self.toolset.get_tools(readonly_context)
+            _connected.add(id(self.toolset))
+        return [tool for tool in tools if self._is_tool_selected(tool, readonly_context)]
+
+    async def close(self) -> None:
+        # Closing the shared toolset is idempotent, so every view may do it
+        await self.toolset.close()
+
+
+_tool_chest: Optional[McpToolset] = None
+# Shared toolsets whose first connection has been timed
+_connected: set[int] = set()
+
+
+def tool_chest() -> McpToolset:
+    """Returns the toolset connected to the consolidated tool-chest server (created once)."""
+    global _tool_chest
+    if _tool_chest is None:
+        _tool_chest = _mcp_toolset(TOOL_CHEST_SERVER)
+    return _tool_chest
+
+
+def agent_toolset(agent_name: str) -> BaseToolset:
+    """
+    Returns the toolset for one of the tutor's sub-agents.
+
+    Args:
+        agent_name: A key of AGENT_TOOLS, e.g. "wolfram_agent".
+
+    Returns:
+        A filtered view of the shared tool chest, a toolset with its own
+        server connection when ERIK_TOOL_SERVERS=separate, or the tool
+        functions themselves when ERIK_MCP_TRANSPORT=inprocess; in every
+        case each call ends at the request's deadline at the latest (budget.py).
+    """
+    if TOOL_SERVER_MODE not in TOOL_SERVER_MODES:
+        raise ValueError(f"ERIK_TOOL_SERVERS must be one of {TOOL_SERVER_MODES}, got {TOOL_SERVER_MODE!r}")
+    server_script, tool_filter = AGENT_TOOLS[agent_name]
+    if MCP_TRANSPORT == "inprocess":
+        return BudgetedToolset(InProcessToolset(tool_filter))
+    if TOOL_SERVER_MODE == "separate":
+        return BudgetedToolset(_mcp_toolset(server_script, tool_filter))
+    return BudgetedToolset(FilteredToolset(tool_chest(), tool_filter))
@@ -0,0 +1,66 @@
+"""
+Tracing for the tutor agent (see mcp_tool_chest/telemetry.py).
+
+ADK already opens spans for agent runs, model calls (with token usage) and
+tool calls. TracedGemini adds one span per HTTP attempt of a model call, so
+the time spent in the Gemini request itself, and the retries made within
+the time budget (budget.py), show up under each call_llm span.
+TracedMcpToolset sends the trace context with every MCP tool call, so the
+tool server's mcp_tool span joins the agent's trace instead of starting one
+of its own.
+"""
+from functools import cached_property
+from typing import Any, Dict, List, Optional
+
+import httpx
+from google.adk.agents.readonly_context import ReadonlyContext
+from google.adk.auth.auth_credential import AuthCredential
+from google.adk.tools.base_tool import BaseTool
+from google.adk.tools.mcp_tool.mcp_session_manager import retry_on_closed_resource
+from google.adk.tools.mcp_tool.mcp_tool import McpTool
+from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+from google.adk.tools.tool_context import ToolContext
+from google.genai import Client, types
+
+from telemetry import TracedAsyncTransport, trace_meta
+
+from .budget import BudgetedGemini
+
+
+class TracedGemini(BudgetedGemini):
+    """Gemini whose API client sends its requests through a traced httpx transport."""
+
+    @cached_property
+    def api_client(self) -> Client:
+        return Client(
+            http_options=types.HttpOptions(
+                headers=self._tracking_headers,
+                retry_options=self.retry_options,
+                # A custom transport also keeps the client on httpx instead of aiohttp
+                async_client_args={"transport": TracedAsyncTransport(httpx.AsyncHTTPTransport())},
+            )
+        )
+
+
+class TracedMcpTool(McpTool):
+    """
+    McpTool that sends the current trace context in the request's `_meta`.
+
+    For the tutor's toolsets, which use neither authentication nor header
+    providers.
+    """
+
+    @retry_on_closed_resource
+    async def _run_async_impl(self, *, args, tool_context: ToolContext,
+                              credential: Optional[AuthCredential]) -> Dict[str, Any]:
+        session = await self._mcp_session_manager.create_session()
+        response = await session.call_tool(self.name, arguments=args, meta=trace_meta())
+        return response.model_dump(exclude_none=True, mode="json")
+
+
+class TracedMcpToolset(McpToolset):
+    """McpToolset whose tools are TracedMcpTools."""
+
+    async def get_tools(self, readonly_context: Optional[ReadonlyContext] = None) -> List[BaseTool]:
+        return [TracedMcpTool(mcp_tool=tool._mcp_tool, mcp_session_manager=tool._mcp_session_manager)
+                for tool in await super().get_tools(readonly_context)]